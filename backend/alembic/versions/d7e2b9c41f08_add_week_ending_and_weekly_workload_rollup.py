@@ -0,0 +1,66 @@
+"""Add week_ending to time_entries and weekly_workload_rollup table
+
+Revision ID: d7e2b9c41f08
+Revises: c3f1d2e4a5b6
+Create Date: 2026-10-19 10:02:51.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e2b9c41f08'
+down_revision: Union[str, None] = 'c3f1d2e4a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ### START OF EDITED SECTION ###
+
+    # Step 1: Add week_ending as nullable and backfill it with the Thursday closing
+    # the Sunday-Thursday week (Postgres DOW: Sunday=0), matching etl.py
+    op.add_column('time_entries', sa.Column('week_ending', sa.Date(), nullable=True))
+    op.execute(
+        "UPDATE time_entries "
+        "SET week_ending = CAST(date_of_work AS DATE) - CAST(EXTRACT(DOW FROM date_of_work) AS INTEGER) + 4"
+    )
+    op.alter_column('time_entries', 'week_ending', nullable=False)
+    op.create_index('ix_time_entries_member_week', 'time_entries', ['team_member_id', 'week_ending'], unique=False)
+
+    # Step 2: The rollup table; fill it with `python rollup.py --rebuild`
+    op.create_table('weekly_workload_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('week_ending', sa.Date(), nullable=False),
+    sa.Column('team_member_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=True),
+    sa.Column('portfolio_id', sa.Integer(), nullable=True),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('group_activity_id', sa.Integer(), nullable=True),
+    sa.Column('function_activity_id', sa.Integer(), nullable=True),
+    sa.Column('type', sa.String(), nullable=True),
+    sa.Column('hours', sa.Float(), nullable=False),
+    sa.Column('sun', sa.Float(), nullable=False),
+    sa.Column('mon', sa.Float(), nullable=False),
+    sa.Column('tue', sa.Float(), nullable=False),
+    sa.Column('wed', sa.Float(), nullable=False),
+    sa.Column('thu', sa.Float(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_weekly_workload_rollup_member_week', 'weekly_workload_rollup', ['team_member_id', 'week_ending'], unique=False)
+    op.create_index('ix_weekly_workload_rollup_week_team', 'weekly_workload_rollup', ['week_ending', 'team_id'], unique=False)
+    # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index('ix_weekly_workload_rollup_week_team', table_name='weekly_workload_rollup')
+    op.drop_index('ix_weekly_workload_rollup_member_week', table_name='weekly_workload_rollup')
+    op.drop_table('weekly_workload_rollup')
+    op.drop_index('ix_time_entries_member_week', table_name='time_entries')
+    op.drop_column('time_entries', 'week_ending')
+    # ### end Alembic commands ###
@@ -0,0 +1,95 @@
+# backend/analytics_services.py
+
+from datetime import date
+from typing import List, Dict, Any, Optional
+from sqlalchemy import select, func, literal, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from database import WeeklyWorkloadRollup, TeamMember, TeamMemberClosure, Team, Portfolio, Project, GroupActivity, FunctionActivity
+from schemas import WorkloadDimension
+
+Rollup = WeeklyWorkloadRollup
+
+# Rollup column and lookup table (id, display name) for each breakdown
+DIMENSIONS = {
+    WorkloadDimension.PORTFOLIO: (Rollup.portfolio_id, Portfolio.id, Portfolio.name),
+    WorkloadDimension.PROJECT: (Rollup.project_id, Project.id, Project.project_name),
+    WorkloadDimension.GROUP_ACTIVITY: (Rollup.group_activity_id, GroupActivity.id, GroupActivity.name),
+    WorkloadDimension.FUNCTION_ACTIVITY: (Rollup.function_activity_id, FunctionActivity.id, FunctionActivity.name),
+}
+
+UNASSIGNED = "Unassigned"
+
+
+async def get_hours_breakdown(
+    db: AsyncSession,
+    dimension: WorkloadDimension,
+    start_week: date,
+    end_week: date,
+    team_id: Optional[int] = None,
+    manager_id: Optional[int] = None,
+    by_week: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Submitted/approved hours per `dimension` for the weeks ending between
+    `start_week` and `end_week` (inclusive), optionally per week.
+    Reads only the weekly workload rollup; the lookup table is joined after
+    aggregation just to attach display names.
+    """
+    rollup_column, lookup_id, lookup_name = DIMENSIONS[dimension]
+
+    group_columns = [rollup_column] + ([Rollup.week_ending] if by_week else [])
+    totals = (
+        select(
+            *group_columns,
+            func.sum(Rollup.hours).label("hours"),
+            func.count(func.distinct(Rollup.team_member_id)).label("member_count"),
+        )
+        .where(Rollup.week_ending >= start_week, Rollup.week_ending <= end_week)
+        .group_by(*group_columns)
+    )
+    if team_id is not None:
+        totals = totals.where(Rollup.team_id == team_id)
+    if manager_id is not None:
+        # Everyone under the manager, at any depth, via the hierarchy closure
+        totals = totals.join(
+            TeamMemberClosure,
+            and_(
+                TeamMemberClosure.descendant_id == Rollup.team_member_id,
+                TeamMemberClosure.ancestor_id == manager_id,
+                TeamMemberClosure.depth > 0,
+            )
+        )
+    totals = totals.subquery()
+
+    week_column = totals.c.week_ending if by_week else literal(None).label("week_ending")
+    query = (
+        select(
+            totals.c[rollup_column.key].label("id"),
+            func.coalesce(lookup_name, UNASSIGNED).label("name"),
+            week_column,
+            totals.c.hours,
+            totals.c.member_count,
+        )
+        .outerjoin(lookup_id.table, lookup_id == totals.c[rollup_column.key])
+        .order_by(*([totals.c.week_ending] if by_week else []), totals.c.hours.desc())
+    )
+
+    result = await db.execute(query)
+    return [dict(row._mapping) for row in result]
+
+
+async def get_analytics_filters(db: AsyncSession) -> Dict[str, List[Dict[str, Any]]]:
+    """Teams, and members who manage at least one person, for the analytics filters."""
+    teams = await db.execute(select(Team.id, Team.name).order_by(Team.name))
+
+    reports = aliased(TeamMember)
+    managers = await db.execute(
+        select(TeamMember.id, func.coalesce(TeamMember.full_name, TeamMember.email).label("name"))
+        .where(select(reports.id).where(reports.manager_id == TeamMember.id).exists())
+        .order_by("name")
+    )
+    return {
+        "teams": [dict(row._mapping) for row in teams],
+        "managers": [dict(row._mapping) for row in managers],
+    }
@@ -1,8 +1,12 @@
 # backend/api/admin_router.py
 
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 import schemas, dashboard_services, database
+import jobs
+import etl_jobs  # Registers the "etl" and table rebuild job types
 
 router = APIRouter(
     prefix="/admin",
@@ -43,4 +47,49 @@ async def update_group_activity(activity_id: int, activity: schemas.GroupActivit
 
 @router.delete("/group_activities/{activity_id}", response_model=schemas.GroupActivity)
 async def delete_group_activity(activity_id: int, db: AsyncSession = Depends(database.get_session)):
-    return await dashboard_services.delete_group_activity(db=db, activity_id=activity_id)
\ No newline at end of file
+    return await dashboard_services.delete_group_activity(db=db, activity_id=activity_id)
+
+# --- Data Sync (ETL) ---
+
+@router.post("/etl", response_model=schemas.Job, status_code=202)
+def start_etl(request: schemas.EtlRunRequest):
+    """
+    Starts a full data sync from the Excel workbooks as a background job.
+    Poll GET /jobs/{job_id} for per-stage progress. Only one sync runs at a time.
+    """
+    active = [
+        job for status in (schemas.JobStatus.QUEUED, schemas.JobStatus.RUNNING)
+        for job in jobs.runner.list_jobs(job_type="etl", status=status, limit=1)
+    ]
+    if active:
+        raise HTTPException(status_code=409, detail=f"A data sync is already {active[0].status} (job {active[0].id}).")
+    return jobs.runner.submit("etl", request.model_dump())
+
+@router.get("/etl/runs", response_model=List[schemas.Job])
+def list_etl_runs(limit: int = Query(10, ge=1, le=100)):
+    """The most recent data sync jobs, newest first."""
+    return jobs.runner.list_jobs(job_type="etl", limit=limit)
+
+# --- Slow queries ---
+
+@router.get("/slow-queries", response_model=List[schemas.SlowQuery])
+async def list_slow_queries(
+    route: Optional[str] = None,
+    with_plan: bool = False,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(database.get_session)
+):
+    """Recently captured slow queries, newest first; `with_plan` keeps only those with an EXPLAIN plan."""
+    query = select(database.SlowQuery).order_by(database.SlowQuery.captured_at.desc()).limit(limit)
+    if route:
+        query = query.where(database.SlowQuery.route == route)
+    if with_plan:
+        query = query.where(database.SlowQuery.plan.is_not(None))
+    return (await db.scalars(query)).all()
+
+@router.get("/slow-queries/{slow_query_id}", response_model=schemas.SlowQuery)
+async def get_slow_query(slow_query_id: int, db: AsyncSession = Depends(database.get_session)):
+    slow_query = await db.get(database.SlowQuery, slow_query_id)
+    if slow_query is None:
+        raise HTTPException(status_code=404, detail=f"Slow query {slow_query_id} not found.")
+    return slow_query
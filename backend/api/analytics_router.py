@@ -0,0 +1,42 @@
+# backend/api/analytics_router.py
+
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import schemas
+import analytics_services
+from database import get_session
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"]
+)
+
+@router.get("/filters", response_model=schemas.AnalyticsFilters)
+async def get_filters(session: AsyncSession = Depends(get_session)):
+    """Teams and managers available as analytics filters."""
+    return await analytics_services.get_analytics_filters(session)
+
+@router.get("/hours/{dimension}", response_model=List[schemas.WorkloadBreakdownRow])
+async def get_hours_breakdown(
+    dimension: schemas.WorkloadDimension,
+    start_week: date,
+    end_week: date,
+    team_id: Optional[int] = None,
+    manager_id: Optional[int] = None,
+    by_week: bool = Query(False, description="Return one row per week instead of totals over the range."),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Hours by portfolio, project, group activity or function activity for the
+    weeks ending between `start_week` and `end_week`, optionally limited to a
+    team or to everyone under a manager.
+    """
+    if end_week < start_week:
+        raise HTTPException(status_code=400, detail="end_week must not be before start_week.")
+    return await analytics_services.get_hours_breakdown(
+        session, dimension, start_week, end_week,
+        team_id=team_id, manager_id=manager_id, by_week=by_week
+    )
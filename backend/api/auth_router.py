@@ -1,4 +1,5 @@
 # backend/api/auth_router.py
+import logging
 import os
 from httpx_oauth.clients.google import GoogleOAuth2
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,6 +17,8 @@ from sqlalchemy.orm import selectinload
 # Load environment variables from the .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # --- Configuration ---
 CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
 CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
@@ -81,7 +84,7 @@ async def google_callback(code: str, session: AsyncSession = Depends(database.ge
             # If the user doesn't exist, redirect with an error
             return RedirectResponse(url=f"{frontend_url}?error=UserNotFound")
 
-        print(f"User found: {user.email}, ID: {user.id}, Team ID: {user.team_id}", user)
+        logger.debug("Login of member %s (team %s)", user.id, user.team_id)
         # Create your application's own JWT access token
         app_token = create_app_access_token(user)
         
@@ -90,7 +93,7 @@ async def google_callback(code: str, session: AsyncSession = Depends(database.ge
         return RedirectResponse(url=f"{frontend_url}?token={app_token}")
 
     except Exception as e:
-        print(f"Error during Google OAuth callback: {e}")
+        logger.exception("Error during Google OAuth callback")
         # On any other error, redirect back to the frontend with a generic error
         return RedirectResponse(url=f"{frontend_url}?error=LoginFailed")
     
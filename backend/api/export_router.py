@@ -0,0 +1,92 @@
+# backend/api/export_router.py
+
+import os
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, FileResponse
+from starlette.background import BackgroundTask
+
+import schemas
+import export_services
+import report_services
+import jobs
+
+COLUMNAR_MEDIA_TYPES = {
+    schemas.ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    schemas.ExportFormat.ARROW: "application/vnd.apache.arrow.file",
+}
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+@router.get("/time_entries")
+async def export_time_entries(
+    start_date: date,
+    end_date: date,
+    team_id: Optional[int] = None,
+    status: Optional[List[schemas.TimeEntryStatus]] = Query(None),
+    format: schemas.ExportFormat = schemas.ExportFormat.NDJSON,
+):
+    """
+    Exports the raw time entries worked between `start_date` and `end_date`,
+    one flat row per entry. NDJSON and CSV are streamed; Parquet and Arrow
+    IPC files are built in batches with dictionary-encoded name columns and
+    then downloaded.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date.")
+
+    query = export_services.time_entry_export_select(
+        start_date, end_date, team_id=team_id, statuses=[s.value for s in status] if status else None
+    )
+    filename = f"time_entries_{start_date}_{end_date}.{format.value}"
+    if format in COLUMNAR_MEDIA_TYPES:
+        path = await run_in_threadpool(export_services.export_columnar_file, query, format.value)
+        return FileResponse(
+            path,
+            media_type=COLUMNAR_MEDIA_TYPES[format],
+            filename=filename,
+            background=BackgroundTask(os.remove, path)
+        )
+    if format == schemas.ExportFormat.CSV:
+        body, media_type = export_services.stream_csv(query), "text/csv"
+    else:
+        body, media_type = export_services.stream_ndjson(query), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/reports/workload", response_model=schemas.Job, status_code=202)
+def start_workload_report(report_request: schemas.WorkloadReportRequest):
+    """
+    Queues a workload_report job building the workbook for the weeks ending
+    `start_week` to `end_week` (optionally one team or portfolio). Poll
+    GET /jobs/{job_id} until it has succeeded, then download the workbook
+    from the `download_url` of its result.
+    """
+    if report_request.end_week < report_request.start_week:
+        raise HTTPException(status_code=400, detail="end_week must not be before start_week.")
+    return jobs.runner.submit("workload_report", report_request.model_dump())
+
+@router.get("/reports/{job_id}/download")
+def download_workload_report(job_id: str):
+    """Downloads the workbook of a succeeded workload_report job."""
+    try:
+        job = jobs.runner.get(job_id)
+    except jobs.JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if job.job_type != "workload_report":
+        raise HTTPException(status_code=404, detail="Not a workload report job.")
+    if job.status != schemas.JobStatus.SUCCEEDED.value:
+        raise HTTPException(status_code=409, detail=f"Report job is {job.status}.")
+    path = report_services.report_path(job_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="The report has expired; start a new one.")
+    return FileResponse(path, media_type=XLSX_MEDIA_TYPE, filename=job.result["filename"])
@@ -0,0 +1,55 @@
+# backend/api/jobs_router.py
+
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import ValidationError
+
+import schemas
+import jobs
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"]
+)
+
+# The job runner works on a sync engine, so these endpoints are plain functions
+# that FastAPI runs in its thread pool.
+
+@router.get("/types", response_model=List[schemas.JobTypeInfo])
+def list_job_types():
+    """The job types that can be started, with their concurrency limits."""
+    return [{"job_type": job_type.name, "max_concurrent": job_type.max_concurrent} for job_type in jobs.job_types()]
+
+@router.post("", response_model=schemas.Job, status_code=202)
+def start_job(request: schemas.JobCreate):
+    """Queues a job and returns it right away; poll GET /jobs/{job_id} for progress and the result."""
+    try:
+        return jobs.runner.submit(request.job_type, request.params)
+    except jobs.UnknownJobTypeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+@router.get("", response_model=List[schemas.Job])
+def list_jobs(
+    job_type: Optional[str] = None,
+    status: Optional[schemas.JobStatus] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """The most recent jobs, newest first."""
+    return jobs.runner.list_jobs(job_type=job_type, status=status, limit=limit)
+
+@router.get("/{job_id}", response_model=schemas.Job)
+def get_job(job_id: str):
+    try:
+        return jobs.runner.get(job_id)
+    except jobs.JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.post("/{job_id}/cancel", response_model=schemas.Job)
+def cancel_job(job_id: str):
+    """Cancels a queued job, or asks a running one to stop at its next checkpoint."""
+    try:
+        return jobs.runner.cancel(job_id)
+    except jobs.JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
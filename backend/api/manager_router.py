@@ -0,0 +1,43 @@
+# backend/api/manager_router.py
+
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import schemas
+import manager_services
+from database import get_session
+
+router = APIRouter(
+    prefix="/manager",
+    tags=["Manager"]
+)
+
+@router.get("/team-status", response_model=schemas.TeamStatusGrid)
+async def get_team_status(
+    manager_email: str,
+    week_ending: date,
+    direct_only: bool = Query(False, description="Only list direct reports instead of the whole reporting line."),
+    session: AsyncSession = Depends(get_session)
+):
+    """Who under a manager has submitted, only saved a draft or not started, for one week."""
+    try:
+        return await manager_services.get_team_status(manager_email, week_ending, session, direct_only=direct_only)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.post("/approvals", response_model=schemas.ApprovalResponse)
+async def approve_timesheets(request: schemas.ApprovalRequest, session: AsyncSession = Depends(get_session)):
+    """
+    Moves submitted entries to approved, either for the listed member-weeks or
+    for a whole week of the manager's reports (`week_ending`, optionally `team_id`).
+    Returns an outcome per member-week.
+    """
+    if bool(request.member_weeks) == (request.week_ending is not None):
+        raise HTTPException(status_code=400, detail="Send exactly one of member_weeks or week_ending.")
+    try:
+        if request.member_weeks:
+            return await manager_services.approve_member_weeks(request.manager_email, request.member_weeks, session)
+        return await manager_services.approve_team_week(request.manager_email, request.week_ending, session, team_id=request.team_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,15 @@
+# backend/api/metrics_router.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import metrics
+
+router = APIRouter(
+    tags=["Metrics"]
+)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Request, latency and database metrics in the Prometheus text format, for scraping."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,6 +1,8 @@
 # backend/src/api/submission_router.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import schemas
@@ -8,6 +10,11 @@ import services
 from database import get_session
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on one /load-range/ call, to keep the payload bounded
+MAX_RANGE_WEEKS = 53
+
 router = APIRouter(
     prefix="/submissions",
     tags=["Submissions"]
@@ -25,10 +32,20 @@ async def submit_new_timesheet(submission: schemas.SubmissionRequest, session: A
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        # Generic error for other potential issues
-        print(f"Error processing submission: {e}")
+        # Generic error for other potential issues; logged with its traceback and the request id
+        logger.exception("Error processing submission")
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
    
+@router.post("/clone-week", status_code=201)
+async def clone_week(request: schemas.CloneWeekRequest, session: AsyncSession = Depends(get_session)):
+    """Starts a week from a previous one: copies its entries into the target week as a draft, on the server."""
+    try:
+        return await services.clone_week(request, session)
+    except services.WeekNotEmptyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/load-draft/{user_email}") # The email is now part of the path
 async def load_draft_data(user_email: str, session: AsyncSession = Depends(get_session)):
     """Endpoint to load a previous week's DRAFT submission data."""
@@ -38,6 +55,27 @@ async def load_draft_data(user_email: str, session: AsyncSession = Depends(get_s
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+@router.get("/load-range/")
+async def load_range_data(
+    user_email: str,
+    start_week: date,
+    end_week: date,
+    statuses: List[schemas.TimeEntryStatus] = Query([schemas.TimeEntryStatus.SUBMITTED, schemas.TimeEntryStatus.APPROVED]),
+    session: AsyncSession = Depends(get_session)
+):
+    """Endpoint to load several consecutive weeks at once, keyed by week_ending."""
+    if end_week < start_week:
+        raise HTTPException(status_code=400, detail="end_week must not be before start_week.")
+    if (end_week - start_week).days > MAX_RANGE_WEEKS * 7:
+        raise HTTPException(status_code=400, detail=f"A range may cover at most {MAX_RANGE_WEEKS} weeks.")
+    try:
+        weeks = await services.get_submissions_for_range(
+            user_email, start_week, end_week, [s.value for s in statuses], session
+        )
+        return {"weeks": {week.isoformat(): data for week, data in weeks.items()}}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
 @router.get("/load-week/")
 async def load_week_data(
     user_email: str,
@@ -51,3 +89,32 @@ async def load_week_data(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+
+
+@router.get("/history", response_model=schemas.SubmissionHistoryPage)
+async def get_submission_history(
+    user_email: str,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page."),
+    compact: bool = Query(False, description="Only return the totals of each submission, without its tasks and meetings."),
+    session: AsyncSession = Depends(get_session)
+):
+    """A user's past submissions with their status and totals, newest week first, one page at a time."""
+    try:
+        return await services.get_submission_history(user_email, session, limit=limit, cursor=cursor, compact=compact)
+    except services.InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/status", response_model=schemas.SubmissionWeekStatus)
+async def get_submission_status(
+    user_email: str,
+    week_date: date,
+    session: AsyncSession = Depends(get_session)
+):
+    """Whether a user's week is approved, submitted, draft-only or missing, with its submission headers."""
+    try:
+        return await services.get_submission_status(user_email, week_date, session)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -1,7 +1,8 @@
 # src/database.py
 
 import os
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Boolean, UniqueConstraint, Index, Text, JSON
+from sqlalchemy import event, inspect, select, or_, true
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 from sqlalchemy.ext.asyncio import AsyncSession
 import os
@@ -102,6 +103,7 @@ class TimeEntry(Base):
     hours = Column(Float, nullable=False)
     notes = Column(String, nullable=True)
     date_of_work = Column(DateTime, nullable=False)
+    week_ending = Column(Date, nullable=False) # Thursday closing the Sunday-Thursday week of date_of_work
     submission_id = Column(String(36), index=True, nullable=False) # Groups entries from one submission
     timestamp = Column(DateTime, nullable=False)
     status = Column(String, nullable=True)
@@ -121,20 +123,201 @@ class TimeEntry(Base):
     task = relationship("Task", back_populates="time_entries")
     team_member = relationship("TeamMember")
 
+    __table_args__ = (Index('ix_time_entries_member_week', 'team_member_id', 'week_ending'),)
 
 
+class Submission(Base):
+    """
+    Header of one timesheet submission, with totals precomputed from its time entries.
+    Written with the entries by submit_timesheet and the ETL; `python submission_headers.py --rebuild`
+    recomputes every header.
+    """
+    __tablename__ = 'submissions'
+    id = Column(Integer, primary_key=True)
+    submission_id = Column(String(36), unique=True, nullable=False)
+    team_member_id = Column(Integer, ForeignKey('team_members.id'), nullable=False)
+    week_ending = Column(Date, nullable=False)
+    status = Column(String, nullable=False)
+    total_hours = Column(Float, nullable=False, default=0.0)
+    meeting_hours = Column(Float, nullable=False, default=0.0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    team_member = relationship("TeamMember")
+
+    __table_args__ = (Index('ix_submissions_member_week', 'team_member_id', 'week_ending'),)
+
+
+class EtlCheckpoint(Base):
+    """One row per (email, week) group of the form responses whose time entries were committed by the ETL."""
+    __tablename__ = 'etl_checkpoints'
+    id = Column(Integer, primary_key=True)
+    email = Column(String, nullable=False)
+    week_ending = Column(Date, nullable=False)
+    submission_id = Column(String(36), nullable=False)
+    completed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (UniqueConstraint('email', 'week_ending', name='uq_etl_checkpoints_email_week'),)
+
+
+class Job(Base):
+    """
+    One background job run by the in-process job runner (jobs.py): its type and
+    parameters, progress, cancellation flag and stored result.
+    """
+    __tablename__ = 'jobs'
+    id = Column(String(36), primary_key=True)
+    job_type = Column(String, nullable=False)
+    status = Column(String, nullable=False) # queued, running, succeeded, failed or cancelled
+    params = Column(JSON, nullable=False, default=dict)
+    progress = Column(Float) # 0..1, when the job knows its total
+    progress_message = Column(String)
+    progress_detail = Column(JSON) # Job-specific progress, e.g. per-stage ETL counts
+    result = Column(JSON)
+    error = Column(Text)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    owner = Column(String) # hostname:pid of the process whose runner queued the job
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime) # Heartbeat of the owner while the job is queued or running
+
+    __table_args__ = (Index('ix_jobs_type_created', 'job_type', 'created_at'),)
+
+
+class SlowQuery(Base):
+    """
+    A statement that took longer than SLOW_QUERY_THRESHOLD_MS during a request,
+    with its EXPLAIN (ANALYZE, BUFFERS) plan when it was sampled for one
+    (written by slow_query_log.py).
+    """
+    __tablename__ = 'slow_queries'
+    id = Column(Integer, primary_key=True)
+    captured_at = Column(DateTime, nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    route = Column(String)
+    statement = Column(Text, nullable=False)
+    parameters = Column(Text)
+    plan = Column(Text) # EXPLAIN output; NULL when not sampled
+    explain_error = Column(Text)
+
+    __table_args__ = (Index('ix_slow_queries_captured_at', 'captured_at'),)
+
+
+class WeeklyWorkloadRollup(Base):
+    """
+    Submitted/approved hours pre-aggregated per week, member and activity.
+    Derived from time_entries: refreshed per member-week on submission and
+    rebuilt from scratch by `python rollup.py --rebuild`.
+    """
+    __tablename__ = 'weekly_workload_rollup'
+    id = Column(Integer, primary_key=True)
+    week_ending = Column(Date, nullable=False)
+    team_member_id = Column(Integer, nullable=False)
+    team_id = Column(Integer)
+    portfolio_id = Column(Integer)
+    project_id = Column(Integer)
+    group_activity_id = Column(Integer)
+    function_activity_id = Column(Integer)
+    type = Column(String)
+
+    hours = Column(Float, nullable=False, default=0.0)
+    sun = Column(Float, nullable=False, default=0.0)
+    mon = Column(Float, nullable=False, default=0.0)
+    tue = Column(Float, nullable=False, default=0.0)
+    wed = Column(Float, nullable=False, default=0.0)
+    thu = Column(Float, nullable=False, default=0.0)
+    entry_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_weekly_workload_rollup_member_week', 'team_member_id', 'week_ending'),
+        Index('ix_weekly_workload_rollup_week_team', 'week_ending', 'team_id'),
+    )
+
+
+class TeamMemberClosure(Base):
+    """
+    Transitive closure of the manager hierarchy: one row per (ancestor, descendant)
+    pair, including every member paired with itself at depth 0.
+    Kept in sync by the TeamMember mapper events below; bulk writes that bypass
+    them rebuild it with `hierarchy.rebuild_team_member_closure`.
+    """
+    __tablename__ = 'team_member_closure'
+    ancestor_id = Column(Integer, ForeignKey('team_members.id', ondelete='CASCADE'), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey('team_members.id', ondelete='CASCADE'), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (Index('ix_team_member_closure_descendant', 'descendant_id', 'depth'),)
+
+
+_closure = TeamMemberClosure.__table__
+
+def _attach_subtree(connection, member_id, manager_id):
+    """Links `member_id` and everything below it to `manager_id` and all of its ancestors."""
+    above, below = _closure.alias('above'), _closure.alias('below')
+    connection.execute(
+        _closure.insert().from_select(
+            ['ancestor_id', 'descendant_id', 'depth'],
+            select(above.c.ancestor_id, below.c.descendant_id, above.c.depth + below.c.depth + 1)
+            .select_from(above.join(below, true()))
+            .where(above.c.descendant_id == manager_id, below.c.ancestor_id == member_id)
+        )
+    )
+
+@event.listens_for(TeamMember, "after_insert")
+def _closure_after_insert(mapper, connection, target):
+    connection.execute(_closure.insert().values(ancestor_id=target.id, descendant_id=target.id, depth=0))
+    if target.manager_id is not None:
+        _attach_subtree(connection, target.id, target.manager_id)
+
+@event.listens_for(TeamMember, "after_update")
+def _closure_after_update(mapper, connection, target):
+    if not inspect(target).attrs.manager_id.history.has_changes():
+        return
+    subtree = select(_closure.c.descendant_id).where(_closure.c.ancestor_id == target.id)
+    if target.manager_id is not None and connection.execute(
+        subtree.where(_closure.c.descendant_id == target.manager_id)
+    ).first():
+        raise ValueError(f"Team member {target.manager_id} reports to {target.id} and cannot be its manager.")
+
+    # Detach the subtree from its old ancestors, then hang it under the new manager
+    connection.execute(
+        _closure.delete().where(
+            _closure.c.descendant_id.in_(subtree),
+            _closure.c.ancestor_id.not_in(subtree)
+        )
+    )
+    if target.manager_id is not None:
+        _attach_subtree(connection, target.id, target.manager_id)
+
+@event.listens_for(TeamMember, "after_delete")
+def _closure_after_delete(mapper, connection, target):
+    connection.execute(
+        _closure.delete().where(or_(_closure.c.ancestor_id == target.id, _closure.c.descendant_id == target.id))
+    )
+
+
+
+_engine = None
+_session_factory = None
+
 # Replace with this new function
 def get_engine():
     """
-    Returns a new SQLAlchemy engine for our PostgreSQL database,
-    using the URL from the environment variables.
+    Returns the SQLAlchemy engine for our PostgreSQL database, using the URL
+    from the environment variables. The engine (and its connection pool) is
+    created on first use and shared by every request of the process.
     """
-    db_url = os.environ.get("DATABASE_URL")
-    if db_url is None:
-        raise ValueError("DATABASE_URL environment variable is not set.")
+    global _engine
+    if _engine is None:
+        db_url = os.environ.get("DATABASE_URL")
+        if db_url is None:
+            raise ValueError("DATABASE_URL environment variable is not set.")
 
-    # For async connection with psycopg2/asyncpg
-    return create_async_engine(db_url)
+        # For async connection with psycopg2/asyncpg
+        _engine = create_async_engine(db_url)
+    return _engine
 
 def create_database_and_tables():
     """Creates all defined tables in the PostgreSQL database if they don't exist."""
@@ -145,9 +328,10 @@ def create_database_and_tables():
 # Replace with this new async generator function
 async def get_session():
     """Async session generator for FastAPI dependencies."""
-    engine = get_engine()
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(
+            get_engine(), class_=AsyncSession, expire_on_commit=False
+        )
+    async with _session_factory() as session:
         yield session
\ No newline at end of file
@@ -1,194 +1,331 @@
 # backend/etl.py
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from functools import partial
 import pandas as pd
+from sqlalchemy import select, insert, update, delete, func, and_
 from sqlalchemy.orm import joinedload
 from datetime import datetime
 import uuid
 import etl_config as config
-from database import Project, TeamMember, TimeEntry, Portfolio, Team, GroupActivity, FunctionActivity, Task
+from database import Project, TeamMember, TimeEntry, Portfolio, Team, GroupActivity, FunctionActivity, Task, EtlCheckpoint, TeamMemberClosure
 from dotenv import load_dotenv
-from etl_database_utils import get_session, create_database_and_tables
+from etl_database_utils import get_session, create_database_and_tables, advisory_lock
+from etl_scheduler import Stage, EXTRACT, TRANSFORM, LOAD, run_stages, print_stage_report, critical_path
+import etl_metrics
+from etl_metrics import RunReport
+from rollup import rebuild_weekly_rollup
+from hierarchy import rebuild_team_member_closure
+from submission_headers import insert_headers
 
 load_dotenv()
 
-def populate_portfolios_and_projects(session):
+PORTFOLIO_COLUMN = 'Portfolio (Only used in visuallization)'
+PROJECT_COLUMN = 'Project (Only used in visuallization)'
+
+# Form response columns that identify a task: owner, type, where it was logged and its status
+TASK_KEY_COLUMNS = ['email', 'Task', 'Project', 'Group Activity', 'Team', 'Function Activity', 'Current Status']
+# The same key once resolved to ids, matching the Task columns
+TASK_ID_COLUMNS = ['owner_id', 'type', 'group_activity_id', 'function_activity_id', 'status']
+
+
+# ----------------------
+# Extract
+# ----------------------
+# These run in worker processes, so they only touch the Excel files, never the database.
+
+def extract_project_list():
+    """Reads the project list sheet (used for projects and function activities)."""
+    print(f"--> Reading from: {config.PROJECTS_EXCEL_FILE_PATH}")
+    df = pd.read_excel(config.PROJECTS_EXCEL_FILE_PATH, sheet_name=config.PROJECTS_SHEET_NAME)
+    etl_metrics.record(rows_read=len(df))
+    return df
+
+def extract_team_members():
+    """Reads the team members sheet from the main workbook."""
+    print(f"--> Reading from: {config.MAIN_EXCEL_FILE_PATH}")
+    df = pd.read_excel(config.MAIN_EXCEL_FILE_PATH, sheet_name=config.MEMBERS_SHEET_NAME)
+    etl_metrics.record(rows_read=len(df))
+    return df
+
+def extract_form_responses():
+    """Reads the raw timesheet form responses from the main workbook."""
+    print(f"--> Reading time entries from: {config.MAIN_EXCEL_FILE_PATH}")
+    df = pd.read_excel(config.MAIN_EXCEL_FILE_PATH, sheet_name=config.FORM_RESPONSES_SHEET_NAME)
+    etl_metrics.record(rows_read=len(df))
+    return df
+
+
+# ----------------------
+# Transform
+# ----------------------
+# Pure DataFrame -> plain data functions, also executed in worker processes.
+
+def transform_projects(df):
+    """
+    Extracts the unique portfolios, projects and group activities from the project list.
+    Returns a dict of plain lists so the result is cheap to send back from a worker.
+    """
+    etl_metrics.record(rows_read=len(df))
+    portfolios = list(df[PORTFOLIO_COLUMN].dropna().unique())
+
+    projects = {}
+    group_activities = {}
+    for _, row in df.iterrows():
+        project_name = str(row[PROJECT_COLUMN]).strip()
+        if not project_name or project_name.lower() == 'nan':
+            continue
+        # The first row that mentions a project decides its portfolio
+        projects.setdefault(project_name, row.get(PORTFOLIO_COLUMN))
+
+        group_activity_name = str(row.get('Group Activity')).strip()
+        if not group_activity_name or group_activity_name.lower() == 'nan':
+            continue
+        group_activities.setdefault((project_name, group_activity_name), None)
+
+    return {
+        "portfolios": portfolios,
+        "projects": list(projects.items()),
+        "group_activities": list(group_activities),
+    }
+
+def transform_function_activities(df):
+    """Returns the unique (team_name, activity_name) pairs from the team columns of the project list."""
+    etl_metrics.record(rows_read=len(df))
+    main_cols = ['Group Activity', PROJECT_COLUMN, PORTFOLIO_COLUMN]
+    team_cols = [col for col in df.columns if col not in main_cols and 'Unnamed' not in col]
+
+    activities = {}
+    for team_name in team_cols:
+        for activity_name in df[team_name].dropna().unique():
+            activities.setdefault((team_name.strip(), str(activity_name).strip()), None)
+    return list(activities)
+
+def transform_members(df):
+    """
+    Extracts teams, members and manager links from the team members sheet.
+    Only the first row for a given email is kept, as the loader always did.
+    """
+    etl_metrics.record(rows_read=len(df))
+    manager_emails = set(df['Manager Email'].dropna().unique())
+
+    members = {}
+    managers = {}
+    for _, row in df.iterrows():
+        email = str(row['Email']).strip()
+        if email not in members:
+            members[email] = {
+                "email": email,
+                "full_name": str(row.get('Name')).strip(),
+                "team_name": row.get('Team'),
+                "role": 'manager' if email in manager_emails else 'user',
+            }
+
+        manager_email = row.get('Manager Email')
+        if pd.notna(manager_email):
+            managers.setdefault(email, manager_email.strip())
+
+    return {
+        "teams": list(df['Team'].dropna().unique()),
+        "members": list(members.values()),
+        "managers": list(managers.items()),
+    }
+
+def transform_form_responses(df):
+    """Cleans the form responses and tags every row with its Sunday-Thursday week."""
+    # Clean column names and preprocess dates
+    df.columns = df.columns.str.strip()
+    df.rename(columns={'Email Address': 'email'}, inplace=True)
+
+    rows_read = len(df)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    df.dropna(subset=['Date'], inplace=True)
+    etl_metrics.record(rows_read=rows_read, rows_skipped=rows_read - len(df))
+
+    # Calculate the Thursday of the current week (Sunday-Thursday week) for grouping
+    # pandas dayofweek: Monday=0, Sunday=6.
+    # To find the most recent Sunday: subtract (dayofweek + 1) % 7 days
+    # Then add 4 days to get Thursday
+    df['week_ending_thursday'] = (
+        df['Date'] - pd.to_timedelta((df['Date'].dt.dayofweek + 1) % 7, unit='D')
+    ) + pd.to_timedelta(4, unit='D')
+
+    # Normalise the text columns once, then number every distinct task so the
+    # loader resolves and creates each Task a single time instead of once per row.
+    # Missing emails stay NaN so the per-week grouping keeps dropping those rows.
+    df['email'] = df['email'].astype(str).str.strip().where(df['email'].notna())
+    for col in ['Task', 'Project', 'Group Activity', 'Team', 'Function Activity']:
+        df[col] = df[col].astype(str).str.strip()
+    df['Current Status'] = df['Current Status'].fillna('Done')
+    df['task_key'] = df.groupby(TASK_KEY_COLUMNS, sort=False, dropna=False).ngroup()
+    return df
+
+
+# ----------------------
+# Load
+# ----------------------
+
+def populate_portfolios_and_projects(session, data=None):
     """
     Populates Portfolios, Projects, and GroupActivities from the project Excel file.
-    This function is now designed to handle the new relational structure.
+    `data` is the output of `transform_projects`; it is read from disk when omitted.
     """
     print("\n--- Populating Portfolios, Projects, and Group Activities ---")
     try:
-        print(f"--> Reading from: {config.PROJECTS_EXCEL_FILE_PATH}")
-        df = pd.read_excel(config.PROJECTS_EXCEL_FILE_PATH, sheet_name=config.PROJECTS_SHEET_NAME)
-
-        # In-memory maps to avoid duplicate entries and redundant DB queries
-        portfolios_map = {}
-        projects_map = {}
+        if data is None:
+            data = transform_projects(extract_project_list())
 
         # 1. Populate Portfolios
-        unique_portfolios = df['Portfolio (Only used in visuallization)'].dropna().unique()
-        for name in unique_portfolios:
-            if not session.query(Portfolio).filter_by(name=name).first():
-                new_portfolio = Portfolio(name=name)
-                session.add(new_portfolio)
+        existing_portfolios = {p.name for p in session.query(Portfolio).all()}
+        new_portfolios = [Portfolio(name=name) for name in data["portfolios"] if name not in existing_portfolios]
+        session.add_all(new_portfolios)
         session.commit()
         # Load all portfolios into the map
-        for p in session.query(Portfolio).all():
-            portfolios_map[p.name] = p.id
+        portfolios_map = {p.name: p.id for p in session.query(Portfolio).all()}
         print(f"--> Synced {len(portfolios_map)} portfolios.")
 
         # 2. Populate Projects
-        for index, row in df.iterrows():
-            project_name = str(row['Project (Only used in visuallization)']).strip()
-            if not project_name or project_name.lower() == 'nan':
-                continue
-            
-            if not session.query(Project).filter_by(project_name=project_name).first():
-                portfolio_name = row.get('Portfolio (Only used in visuallization)')
-                portfolio_id = portfolios_map.get(portfolio_name)
-                
-                new_project = Project(
-                    project_name=project_name,
-                    status='Active',
-                    portfolio_id=portfolio_id
-                )
-                session.add(new_project)
+        existing_projects = {p.project_name for p in session.query(Project).all()}
+        new_projects = [
+            Project(
+                project_name=project_name,
+                status='Active',
+                portfolio_id=portfolios_map.get(portfolio_name)
+            )
+            for project_name, portfolio_name in data["projects"]
+            if project_name not in existing_projects
+        ]
+        session.add_all(new_projects)
         session.commit()
         # Load all projects into the map
-        for p in session.query(Project).all():
-            projects_map[p.project_name] = p.id
+        projects_map = {p.project_name: p.id for p in session.query(Project).all()}
         print(f"--> Synced {len(projects_map)} projects.")
 
         # 3. Populate Group Activities
+        existing_group_activities = {(ga.project_id, ga.name) for ga in session.query(GroupActivity).all()}
         group_activities_count = 0
-        for index, row in df.iterrows():
-            project_name = str(row['Project (Only used in visuallization)']).strip()
-            group_activity_name = str(row.get('Group Activity')).strip()
-            
-            if not all([project_name, group_activity_name]) or group_activity_name.lower() == 'nan':
-                continue
-
+        unknown_project_count = 0
+        for project_name, group_activity_name in data["group_activities"]:
             project_id = projects_map.get(project_name)
-            if project_id:
-                # Check if this group activity already exists for this project
-                exists = session.query(GroupActivity).filter_by(name=group_activity_name, project_id=project_id).first()
-                if not exists:
-                    new_group_activity = GroupActivity(
-                        name=group_activity_name,
-                        project_id=project_id
-                    )
-                    session.add(new_group_activity)
-                    group_activities_count += 1
+            if not project_id:
+                unknown_project_count += 1
+            elif (project_id, group_activity_name) not in existing_group_activities:
+                session.add(GroupActivity(name=group_activity_name, project_id=project_id))
+                group_activities_count += 1
         session.commit()
         print(f"--> Synced {group_activities_count} new group activities.")
 
+        etl_metrics.record(
+            rows_read=len(data["portfolios"]) + len(data["projects"]) + len(data["group_activities"]),
+            rows_inserted=len(new_portfolios) + len(new_projects) + group_activities_count,
+            rows_skipped=unknown_project_count
+        )
+
     except Exception as e:
         print(f"--> ERROR: An error occurred: {e}")
         session.rollback()
+        raise
 
-def populate_teams_and_members(session):
+def populate_teams_and_members(session, data=None):
     """
     Populates Teams and TeamMembers, correctly handling the manager relationship.
+    `data` is the output of `transform_members`; it is read from disk when omitted.
     """
     print("\n--- Populating Teams and Team Members ---")
     try:
-        print(f"--> Reading from: {config.MAIN_EXCEL_FILE_PATH}")
-        df = pd.read_excel(config.MAIN_EXCEL_FILE_PATH, sheet_name=config.MEMBERS_SHEET_NAME)
-
-        teams_map = {}
-        manager_emails = set(df['Manager Email'].dropna().unique()) # <-- ADDED
+        if data is None:
+            data = transform_members(extract_team_members())
 
         # 1. Populate Teams
-        unique_teams = df['Team'].dropna().unique()
-        for name in unique_teams:
-            if not session.query(Team).filter_by(name=name).first():
-                new_team = Team(name=name)
-                session.add(new_team)
+        existing_teams = {t.name for t in session.query(Team).all()}
+        new_teams = [Team(name=name) for name in data["teams"] if name not in existing_teams]
+        session.add_all(new_teams)
         session.commit()
-        for t in session.query(Team).all():
-            teams_map[t.name] = t.id
+        teams_map = {t.name: t.id for t in session.query(Team).all()}
         print(f"--> Synced {len(teams_map)} teams.")
 
         # 2. Populate Team Members (Pass 1: Create members)
+        existing_emails = {m.email for m in session.query(TeamMember).all()}
         new_members_count = 0
-        for index, row in df.iterrows():
-            email = str(row['Email']).strip()
-            if not session.query(TeamMember).filter_by(email=email).first():
-                team_name = row.get('Team')
-                team_id = teams_map.get(team_name)
-                
-                role = 'manager' if email in manager_emails else 'user' # <-- ADDED
-
-                member = TeamMember(
-                    email=email,
-                    full_name=str(row.get('Name')).strip(),
-                    status='Active',
-                    team_id=team_id,
-                    role=role # <-- ADDED
-                )
-                session.add(member)
-                new_members_count += 1
+        for member in data["members"]:
+            if member["email"] in existing_emails:
+                continue
+            session.add(TeamMember(
+                email=member["email"],
+                full_name=member["full_name"],
+                status='Active',
+                team_id=teams_map.get(member["team_name"]),
+                role=member["role"]
+            ))
+            new_members_count += 1
         session.commit()
         print(f"--> Added {new_members_count} new team members.")
-        
-        # 3. Update Managers (Pass 2: Set manager_id)
-        updated_managers_count = 0
-        all_members = session.query(TeamMember).all()
-        member_email_map = {m.email: m.id for m in all_members}
-        
-        for index, row in df.iterrows():
-            email = str(row['Email']).strip()
-            manager_email = row.get('Manager Email')
-            
-            if pd.notna(manager_email):
-                member_id = member_email_map.get(email)
-                manager_id = member_email_map.get(manager_email.strip())
-                
-                if member_id and manager_id:
-                    member_to_update = session.query(TeamMember).get(member_id)
-                    if member_to_update and not member_to_update.manager_id:
-                        member_to_update.manager_id = manager_id
-                        updated_managers_count += 1
+
+        # 3. Update Managers (Pass 2: Set manager_id in one bulk UPDATE, then rebuild the hierarchy closure)
+        members_by_email = {m.email: (m.id, m.manager_id) for m in session.query(TeamMember.email, TeamMember.id, TeamMember.manager_id)}
+        manager_updates = []
+        for email, manager_email in data["managers"]:
+            member = members_by_email.get(email)
+            manager = members_by_email.get(manager_email)
+            if member and manager and not member[1]:
+                manager_updates.append({"id": member[0], "manager_id": manager[0]})
+        if manager_updates:
+            session.execute(update(TeamMember), manager_updates)
         session.commit()
-        print(f"--> Updated manager relationships for {updated_managers_count} members.")
+        print(f"--> Updated manager relationships for {len(manager_updates)} members.")
+        rebuild_team_member_closure(session)
+
+        etl_metrics.record(
+            rows_read=len(data["members"]),
+            rows_inserted=len(new_teams) + new_members_count
+        )
 
     except Exception as e:
         print(f"--> ERROR: An error occurred: {e}")
         session.rollback()
+        raise
 
-def populate_function_activities(session):
-    """Populates the function_activities table from the project Excel file."""
+def populate_function_activities(session, data=None):
+    """
+    Populates the function_activities table from the project Excel file.
+    `data` is the output of `transform_function_activities`; it is read from disk when omitted.
+    """
     print("\n--- Populating Function Activities ---")
     try:
-        df = pd.read_excel(config.PROJECTS_EXCEL_FILE_PATH, sheet_name=config.PROJECTS_SHEET_NAME)
-        
+        if data is None:
+            data = transform_function_activities(extract_project_list())
+
         # Get team map from DB
         teams_map = {t.name: t.id for t in session.query(Team).all()}
-        
-        main_cols = ['Group Activity', 'Project (Only used in visuallization)', 'Portfolio (Only used in visuallization)']
-        team_cols = [col for col in df.columns if col not in main_cols and 'Unnamed' not in col]
-        
+        existing = {(fa.team_id, fa.name) for fa in session.query(FunctionActivity).all()}
+
         new_activities_count = 0
-        for team_name in team_cols:
-            team_id = teams_map.get(team_name.strip())
-            if not team_id: continue
-            
-            activities = df[team_name].dropna().unique()
-            for activity_name in activities:
-                # Check if this activity already exists for this team
-                exists = session.query(FunctionActivity).filter_by(name=str(activity_name).strip(), team_id=team_id).first()
-                if not exists:
-                    new_activity = FunctionActivity(
-                        name=str(activity_name).strip(),
-                        team_id=team_id # Use the team_id foreign key
-                    )
-                    session.add(new_activity)
-                    new_activities_count +=1
-        
+        unknown_team_count = 0
+        for team_name, activity_name in data:
+            team_id = teams_map.get(team_name)
+            if not team_id:
+                unknown_team_count += 1
+                continue
+            if (team_id, activity_name) in existing:
+                continue
+            session.add(FunctionActivity(
+                name=activity_name,
+                team_id=team_id # Use the team_id foreign key
+            ))
+            existing.add((team_id, activity_name))
+            new_activities_count += 1
+
         session.commit()
         print(f"--> Synced {new_activities_count} new function activities.")
+        etl_metrics.record(rows_read=len(data), rows_inserted=new_activities_count, rows_skipped=unknown_team_count)
     except Exception as e:
         print(f"--> ERROR: An error occurred: {e}")
         session.rollback()
+        raise
 
 def _load_reference_maps(session):
     print("--> Loading reference data into memory...")
@@ -200,178 +337,447 @@ def _load_reference_maps(session):
     return members_map, projects_map, group_activities_map, func_activities_map, teams_name_to_id_map
 
 
-# New helper function to process a single Excel row and create Task/TimeEntry objects
-def _process_single_timesheet_row(session, row, submission_id, maps):
-    members_map, projects_map, group_activities_map, func_activities_map, teams_name_to_id_map = maps
+def _load_task_map(session):
+    """
+    Maps the id-level natural key of every ETL-created task (those with an owner
+    and no description) to its id, so re-runs reuse tasks instead of duplicating them.
+    """
+    rows = session.query(
+        Task.owner_id, Task.type, Task.group_activity_id, Task.function_activity_id, Task.status, Task.id
+    ).filter(Task.owner_id.isnot(None), Task.description.is_(None)).all()
+    return {tuple(row[:-1]): row[-1] for row in rows}
 
-    # --- Find or Create Inactive TeamMember for orphaned records ---
-    email_from_row = str(row['email']).strip()
-    owner_id = members_map.get(email_from_row)
-    if not owner_id and email_from_row:
-        print(f"--> Found orphaned email: {email_from_row}. Creating inactive member.")
-        new_member = TeamMember(
-            email=email_from_row,
-            full_name=f"Orphaned User ({email_from_row})",
-            status='Inactive'
-        )
-        session.add(new_member)
-        session.flush() # Flush to get the ID and update map for subsequent lookups
-        owner_id = new_member.id
-        members_map[email_from_row] = owner_id # Update map for subsequent rows in the same ETL run
-
-    # --- Find or Create Inactive Project for orphaned records ---
-    project_name_from_row = str(row.get('Project')).strip()
-    if not project_name_from_row or project_name_from_row.lower() == 'nan':
-        return None, None # Skip this row if no valid project name
-    
-    project_id = projects_map.get(project_name_from_row)
-    if not project_id and project_name_from_row:
-        print(f"--> Found orphaned project: {project_name_from_row}. Creating inactive project.")
-        new_project = Project(
-            project_name=project_name_from_row,
-            status='Inactive',
-            portfolio_id=None # No way to know the portfolio, so leave it null
-        )
-        session.add(new_project)
-        session.flush() # Flush to get the ID and update map
-        project_id = new_project.id
-        projects_map[project_name_from_row] = project_id # Update map
+def _task_id_keys(frame):
+    """Row-wise TASK_ID_COLUMNS tuples with NA turned into None, comparable with `_load_task_map` keys."""
+    columns = [frame[col].astype(object).where(frame[col].notna(), None) for col in TASK_ID_COLUMNS]
+    return list(zip(*columns))
 
-    # If after all checks, we still don't have an owner, we must skip.
-    if not owner_id:
-        return None, None
+def _records(frame):
+    """DataFrame -> list of dicts with NaN/NA turned into None, ready for a bulk insert."""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
 
-    group_activity_id = group_activities_map.get((project_id, str(row.get('Group Activity')).strip()))
+def _create_orphans(session, tasks, members_map, projects_map):
+    """
+    Collects every unknown email and project name in one pass and bulk-creates
+    them as inactive records, updating the maps in place.
+    """
+    orphan_emails = sorted(set(tasks['email'].dropna()) - set(members_map) - {''})
+    if orphan_emails:
+        print(f"--> Found {len(orphan_emails)} orphaned emails. Creating inactive members.")
+        created = session.execute(
+            insert(TeamMember).returning(TeamMember.email, TeamMember.id),
+            [{"email": email, "full_name": f"Orphaned User ({email})", "status": 'Inactive'} for email in orphan_emails]
+        )
+        created_ids = dict(created.all())
+        members_map.update(created_ids)
+        # Core inserts skip the mapper events, so add each orphan's own closure row here
+        session.execute(
+            insert(TeamMemberClosure),
+            [{"ancestor_id": member_id, "descendant_id": member_id, "depth": 0} for member_id in created_ids.values()]
+        )
 
-    team_name_from_row = str(row.get('Team')).strip()
-    current_team_id = teams_name_to_id_map.get(team_name_from_row) 
+    orphan_projects = sorted(set(tasks['Project'].dropna()) - set(projects_map))
+    if orphan_projects:
+        print(f"--> Found {len(orphan_projects)} orphaned projects. Creating inactive projects.")
+        created = session.execute(
+            insert(Project).returning(Project.project_name, Project.id),
+            # No way to know the portfolio, so leave it null
+            [{"project_name": name, "status": 'Inactive', "portfolio_id": None} for name in orphan_projects]
+        )
+        projects_map.update(dict(created.all()))
 
-    function_activity_id = None
-    if current_team_id is not None: 
-        function_activity_id = func_activities_map.get((current_team_id, str(row.get('Function Activity')).strip())) 
-    else:
-        print(f"Warning: Team '{team_name_from_row}' not found for function activity lookup. Function Activity will be NULL for this task.")
-
-    status_val = row.get('Current Status')
-    if pd.isna(status_val):
-        status_val = 'Done' 
-
-    task = Task(
-        type=str(row.get('Task')).strip(),
-        description=None,
-        status=status_val, 
-        owner_id=owner_id,
-        group_activity_id=group_activity_id,
-        function_activity_id=function_activity_id 
-    )
-    
-    entry = TimeEntry(
-        hours=row.get('Hours'),
-        notes=row.get('Notes'),
-        date_of_work=row.get('Date'),
-        submission_id=submission_id,
-        team_member_id=owner_id,
-        task=task,
-        timestamp=row.get('Timestamp'),
+    etl_metrics.record(rows_orphaned=len(orphan_emails) + len(orphan_projects))
 
-    )
+def _map_task_ids(session, df, maps):
+    """
+    Resolves every distinct task of the form responses to a Task id with a few
+    columnar merges against the reference maps, bulk-inserting only the tasks
+    that do not exist yet. Returns {task_key: (task_id, owner_id)}.
+    """
+    members_map, projects_map, group_activities_map, func_activities_map, teams_name_to_id_map = maps
 
-    return task, entry
+    # One row per distinct task; everything below works on this small frame
+    tasks = df.drop_duplicates('task_key')[TASK_KEY_COLUMNS + ['task_key']].copy()
+    tasks['Project'] = tasks['Project'].where(~tasks['Project'].str.lower().isin(['', 'nan']))
+
+    _create_orphans(session, tasks, members_map, projects_map)
+
+    tasks['owner_id'] = tasks['email'].map(members_map).astype('Int64')
+    tasks['project_id'] = tasks['Project'].map(projects_map).astype('Int64')
+    tasks['team_id'] = tasks['Team'].map(teams_name_to_id_map).astype('Int64')
+
+    # Reference frames only hold resolvable rows, so NA keys on the left never match
+    group_activities = pd.DataFrame(
+        [(project_id, name, ga_id) for (project_id, name), ga_id in group_activities_map.items() if project_id is not None],
+        columns=['project_id', 'Group Activity', 'group_activity_id']
+    ).astype({'project_id': 'Int64', 'group_activity_id': 'Int64'})
+    function_activities = pd.DataFrame(
+        [(team_id, name, fa_id) for (team_id, name), fa_id in func_activities_map.items() if team_id is not None],
+        columns=['team_id', 'Function Activity', 'function_activity_id']
+    ).astype({'team_id': 'Int64', 'function_activity_id': 'Int64'})
+
+    tasks = tasks.merge(group_activities, on=['project_id', 'Group Activity'], how='left')
+    tasks = tasks.merge(function_activities, on=['team_id', 'Function Activity'], how='left')
+
+    unknown_teams = tasks.loc[tasks['team_id'].isna(), 'Team'].unique()
+    if len(unknown_teams):
+        print(f"Warning: Teams {list(unknown_teams)} not found for function activity lookup. Function Activity will be NULL for their tasks.")
+
+    # Rows without a valid project or owner are skipped
+    tasks = tasks[tasks['owner_id'].notna() & tasks['project_id'].notna()]
+    tasks = tasks.rename(columns={'Task': 'type', 'Current Status': 'status'})
+
+    # Different spellings can still resolve to the same ids (e.g. two unknown
+    # group activities), so the final dedupe happens on the id-level key.
+    id_keys = _task_id_keys(tasks)
+    task_ids = _load_task_map(session)
+    new_keys = list(dict.fromkeys(key for key in id_keys if key not in task_ids))
+
+    print(f"--> Inserting {len(new_keys)} new Task records ({len(set(id_keys)) - len(new_keys)} already in the database)...")
+    if new_keys:
+        new_ids = session.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [dict(zip(TASK_ID_COLUMNS, key), description=None) for key in new_keys]
+        ).scalars().all()
+        task_ids.update(zip(new_keys, new_ids))
+    etl_metrics.record(rows_inserted=len(new_keys))
+
+    return {
+        task_key: (task_ids[id_key], id_key[0])
+        for task_key, id_key in zip(tasks['task_key'], id_keys)
+    }
+
+def _load_checkpoints(session):
+    """Returns the (email, week_ending) groups already committed by a previous run."""
+    return {(c.email, c.week_ending) for c in session.query(EtlCheckpoint.email, EtlCheckpoint.week_ending).all()}
+
+def _reset_checkpoints(session):
+    """A fresh (non-resumed) run starts with an empty checkpoint table."""
+    session.query(EtlCheckpoint).delete()
+    session.commit()
 
 
 # Refactored sync_tasks_and_time_entries
-def sync_tasks_and_time_entries(session):
+def sync_tasks_and_time_entries(session, df=None, resume=False):
     """
     Reads the main form responses, creates central Task records, and then creates
     lean TimeEntry records linked to those tasks.
-    Refactored for better readability and maintainability.
+    Rows sharing a task natural key share one Task, reused across runs.
+
+    Time entries are committed in batches of (email, week) groups, and every
+    committed group is recorded in `etl_checkpoints`. With `resume=True` the
+    groups recorded by an interrupted run are skipped.
+    `df` is the output of `transform_form_responses`; it is read from disk when omitted.
     """
     print("\n--- Syncing Tasks and Time Entries ---")
     try:
-        print(f"--> Reading time entries from: {config.MAIN_EXCEL_FILE_PATH}")
-        df = pd.read_excel(config.MAIN_EXCEL_FILE_PATH, sheet_name=config.FORM_RESPONSES_SHEET_NAME)
-        
-        # Clean column names and preprocess dates
-        df.columns = df.columns.str.strip()
-        df.rename(columns={'Email Address': 'email'}, inplace=True)
-        
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df.dropna(subset=['Date'], inplace=True)
-        
-        # Calculate the Thursday of the current week (Sunday-Thursday week) for grouping
-        # pandas dayofweek: Monday=0, Sunday=6.
-        # To find the most recent Sunday: subtract (dayofweek + 1) % 7 days
-        # Then add 4 days to get Thursday
-        df['week_ending_thursday'] = (
-            df['Date'] - pd.to_timedelta((df['Date'].dt.dayofweek + 1) % 7, unit='D')
-        ) + pd.to_timedelta(4, unit='D')
+        if df is None:
+            df = transform_form_responses(extract_form_responses())
+
+        etl_metrics.record(rows_read=len(df))
+        # Rows without an email cannot be attributed to anyone
+        rows_read = len(df)
+        df = df[df['email'].notna()]
+        df = df.assign(week_ending=df['week_ending_thursday'].dt.date)
+
+        if resume:
+            completed_groups = _load_checkpoints(session)
+            print(f"--> Resuming: {len(completed_groups)} (email, week) groups already loaded.")
+            if completed_groups:
+                done = pd.MultiIndex.from_frame(df[['email', 'week_ending']]).isin(list(completed_groups))
+                df = df[~done]
+        else:
+            _reset_checkpoints(session)
+        etl_metrics.record(rows_skipped=rows_read - len(df))
+
+        if df.empty:
+            print("--> Success: Nothing left to load.")
+            return
+
+        # Group by email and the consistent week-ending Thursday date; each group is one submission
+        df = df.assign(group_no=df.groupby(['email', 'week_ending']).ngroup())
+        groups = df.drop_duplicates('group_no').sort_values('group_no')[['email', 'week_ending']]
+        submission_ids = [str(uuid.uuid4()) for _ in range(len(groups))]
 
         # Load all necessary reference data into memory maps
-        members_map, projects_map, group_activities_map, func_activities_map, teams_name_to_id_map = _load_reference_maps(session)
-        all_maps = (members_map, projects_map, group_activities_map, func_activities_map, teams_name_to_id_map)
+        all_maps = _load_reference_maps(session)
 
-        new_tasks = []
-        new_entries = []
-        
-        print(f"\n--> Preparing {len(df)} records for processing...")
-        
-        # Group by email and the consistent week-ending Thursday date
-        for _, group in df.groupby(['email', 'week_ending_thursday']):
-            submission_id = str(uuid.uuid4())
-            
-            for index, row in group.iterrows():
-                task, entry = _process_single_timesheet_row(session, row, submission_id, all_maps)
-                if task and entry:
-                    new_tasks.append(task)
-                    new_entries.append(entry)
-
-        if new_tasks:
-            print(f"--> Inserting {len(new_tasks)} new Task records...")
-            session.add_all(new_tasks)
-            session.commit()
-            
-            print(f"--> Inserting {len(new_entries)} new TimeEntry records...")
-            session.add_all(new_entries)
-            session.commit()
+        print(f"\n--> Preparing {len(df)} records ({df['task_key'].nunique()} distinct tasks) for processing...")
+        task_ids_by_key = _map_task_ids(session, df, all_maps)
+        session.commit()
+
+        # Columnar mapping of every row to its task, owner and submission
+        df = df.assign(
+            task_id=df['task_key'].map({key: ids[0] for key, ids in task_ids_by_key.items()}).astype('Int64'),
+            team_member_id=df['task_key'].map({key: ids[1] for key, ids in task_ids_by_key.items()}).astype('Int64'),
+            submission_id=df['group_no'].map(dict(enumerate(submission_ids))),
+        )
+        df = df.rename(columns={'Hours': 'hours', 'Notes': 'notes', 'Date': 'date_of_work', 'Timestamp': 'timestamp'})
+        entry_columns = ['hours', 'notes', 'date_of_work', 'week_ending', 'submission_id', 'team_member_id', 'task_id', 'timestamp']
+
+        batch_size = config.ETL_CHECKPOINT_BATCH_GROUPS
+        inserted_entries = 0
+        for batch_start in range(0, len(groups), batch_size):
+            batch_end = batch_start + batch_size
+            batch = df[(df['group_no'] >= batch_start) & (df['group_no'] < batch_end)]
+            entries = batch.loc[batch['task_id'].notna(), entry_columns]
+            batch_submission_ids = submission_ids[batch_start:batch_end]
+            checkpoints = groups.iloc[batch_start:batch_end].assign(
+                submission_id=batch_submission_ids,
+                completed_at=datetime.now()
+            )
+            try:
+                if len(entries):
+                    session.execute(insert(TimeEntry), _records(entries))
+                    session.execute(insert_headers(TimeEntry.submission_id.in_(batch_submission_ids)))
+                session.execute(insert(EtlCheckpoint), _records(checkpoints))
+                session.commit()
+            except Exception:
+                session.rollback()
+                print(f"--> {batch_start} of {len(groups)} groups were committed. Re-run with --resume to continue.")
+                raise
+            inserted_entries += len(entries)
+            etl_metrics.record(rows_inserted=len(entries), rows_skipped=len(batch) - len(entries))
+            print(f"--> Committed {min(batch_end, len(groups))}/{len(groups)} groups ({inserted_entries} time entries).")
+            etl_metrics.report_progress(min(batch_end, len(groups)), len(groups))
 
         print(f"--> Success: Database is now up to date.")
 
     except Exception as e:
         print(f"--> ERROR: An error occurred while syncing: {e}")
         session.rollback()
+        raise
 
 
+def compact_duplicate_tasks(session):
+    """
+    One-off clean-up for databases loaded before tasks were deduplicated.
+    Tasks sharing owner, type, description, group activity, function activity
+    and status are merged into the lowest id; their time entries are repointed
+    and the duplicates deleted, all in one transaction.
+    """
+    print("\n--- Compacting Duplicate Tasks ---")
+    key_columns = [Task.owner_id, Task.type, Task.description, Task.group_activity_id, Task.function_activity_id, Task.status]
+    try:
+        keepers = (
+            select(func.min(Task.id).label('keep_id'), *key_columns)
+            .group_by(*key_columns)
+            .having(func.count(Task.id) > 1)
+            .subquery()
+        )
+        duplicates = (
+            select(Task.id.label('duplicate_id'), keepers.c.keep_id)
+            .join(keepers, and_(*[col.is_not_distinct_from(keepers.c[col.key]) for col in key_columns]))
+            .where(Task.id != keepers.c.keep_id)
+            .subquery()
+        )
+
+        repointed = session.execute(
+            update(TimeEntry)
+            .where(TimeEntry.task_id == duplicates.c.duplicate_id)
+            .values(task_id=duplicates.c.keep_id)
+        ).rowcount
+        removed = session.execute(
+            delete(Task).where(Task.id.in_(select(duplicates.c.duplicate_id)))
+        ).rowcount
+        session.commit()
+        print(f"--> Repointed {repointed} time entries and removed {removed} duplicate tasks.")
+        return removed
+    except Exception as e:
+        print(f"--> ERROR: An error occurred while compacting tasks: {e}")
+        session.rollback()
+        raise
 
-def run_full_etl_pipeline():
+def refresh_weekly_rollup(session):
+    """Rebuilds the weekly workload rollup once the time entries are loaded."""
+    etl_metrics.record(rows_inserted=rebuild_weekly_rollup(session))
+
+
+def build_pipeline(resume=False):
+    """
+    Describes the ETL as a graph of extract -> transform -> load stages.
+    Extracts and transforms are independent of each other and of the database;
+    loads are chained in foreign-key order.
+    """
+    return [
+        Stage("extract_project_list", EXTRACT, extract_project_list),
+        Stage("extract_team_members", EXTRACT, extract_team_members),
+        Stage("extract_form_responses", EXTRACT, extract_form_responses),
+
+        Stage("transform_projects", TRANSFORM, transform_projects, inputs=["extract_project_list"]),
+        Stage("transform_function_activities", TRANSFORM, transform_function_activities, inputs=["extract_project_list"]),
+        Stage("transform_members", TRANSFORM, transform_members, inputs=["extract_team_members"]),
+        Stage("transform_form_responses", TRANSFORM, transform_form_responses, inputs=["extract_form_responses"]),
+
+        Stage("load_portfolios_and_projects", LOAD, populate_portfolios_and_projects,
+              inputs=["transform_projects"]),
+        Stage("load_teams_and_members", LOAD, populate_teams_and_members,
+              inputs=["transform_members"], after=["load_portfolios_and_projects"]),
+        Stage("load_function_activities", LOAD, populate_function_activities,
+              inputs=["transform_function_activities"], after=["load_teams_and_members"]),
+        # Finally, sync the main data which depends on all previous tables
+        Stage("load_tasks_and_time_entries", LOAD, partial(sync_tasks_and_time_entries, resume=resume),
+              inputs=["transform_form_responses"], after=["load_function_activities"]),
+        Stage("load_weekly_rollup", LOAD, refresh_weekly_rollup, after=["load_tasks_and_time_entries"]),
+    ]
+
+
+def _previous_stage_times():
+    """Stage wall times of the most recent successful run report, or {} if there is none."""
+    for path in sorted(glob.glob(os.path.join(config.ETL_REPORTS_DIR, "etl_run_*.json")), reverse=True):
+        try:
+            with open(path) as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if report.get("success"):
+            return {stage["name"]: stage["wall_time"] for stage in report["stages"]}
+    return {}
+
+
+class EtlProgress:
+    """
+    Turns the stage and batch events of a run into progress snapshots for
+    `callback`: the completed fraction, an ETA, and status and row counts per
+    stage. Stages are weighted by their duration in the last successful run
+    (equally without one); the batch counts of the time entry load advance
+    it within the stage.
+    """
+
+    def __init__(self, stages, callback):
+        self.callback = callback
+        self.started = time.time()
+        previous = _previous_stage_times()
+        self.weights = {s.name: max(previous.get(s.name, 1.0 if not previous else 0.0), 0.1) for s in stages}
+        self.stages = {
+            s.name: {"name": s.name, "kind": s.kind, "status": "pending", "rows_read": 0, "rows_inserted": 0,
+                     "wall_time": None, "done": None, "total": None}
+            for s in stages
+        }
+
+    def stage_event(self, stage, metrics):
+        entry = self.stages[stage.name]
+        if metrics is None:
+            entry["status"] = "running"
+        else:
+            entry.update(status=metrics.status, rows_read=metrics.rows_read, rows_inserted=metrics.rows_inserted,
+                         wall_time=round(metrics.wall_time, 2))
+        self.callback(self.snapshot())
+
+    def batch_event(self, stage_name, done, total):
+        self.stages[stage_name].update(done=done, total=total)
+        self.callback(self.snapshot())
+
+    def snapshot(self):
+        completed = 0.0
+        for name, entry in self.stages.items():
+            if entry["status"] not in ("pending", "running"):
+                completed += self.weights[name]
+            elif entry["status"] == "running" and entry["total"]:
+                completed += self.weights[name] * entry["done"] / entry["total"]
+        fraction = completed / sum(self.weights.values())
+        elapsed = time.time() - self.started
+        return {
+            "fraction": round(fraction, 4),
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": round(elapsed * (1 - fraction) / fraction, 1) if 0 < fraction < 1 else None,
+            "current_stages": [name for name, entry in self.stages.items() if entry["status"] == "running"],
+            "stages": list(self.stages.values()),
+        }
+
+
+def run_full_etl_pipeline(workers=config.ETL_WORKERS, resume=False, progress=None, should_stop=None, mp_context=None):
     """
     Runs the entire ETL process from start to finish in the correct order.
+    Extract and transform stages run on `workers` processes (1 = everything inline).
+    With `resume=True` the time entry load continues from the last checkpoint.
+    A JSON run report with per-stage metrics is written to `config.ETL_REPORTS_DIR`.
+    `progress`, if given, receives EtlProgress snapshots as stages start and finish.
+    `should_stop`, if given, is polled between stages and time entry batches; once
+    it returns True the run stops and is reported as cancelled. `mp_context` is
+    passed to the worker pool (see run_stages).
+    Only one run at a time can hold the ETL lock; a second one returns straight away.
     Returns a tuple: (success_boolean, message_string)
     """
+    with advisory_lock(config.ETL_LOCK_KEY) as acquired:
+        if not acquired:
+            print("--> ERROR: Another data sync is already running.")
+            return (False, "❌ Another data sync is already running. Try again once it has finished.")
+        return _run_pipeline(workers, resume, progress, should_stop, mp_context)
+
+
+def _run_pipeline(workers, resume, progress, should_stop=None, mp_context=None):
     session = get_session()
+    stages = build_pipeline(resume=resume)
+    report = RunReport(started_at=datetime.now(), workers=workers, resume=resume)
+    tracker = EtlProgress(stages, progress) if progress else None
+    listener_token = etl_metrics.progress_listener.set(tracker.batch_event) if tracker else None
+    cancel_token = etl_metrics.cancel_check.set(should_stop) if should_stop else None
     try:
-        print("--- Starting Full Data Sync ---")
+        print(f"--- Starting Full Data Sync ({workers} worker(s)) ---")
         
         # Ensure the database and tables exist
         create_database_and_tables()
         
-        # Populate tables in an order that respects foreign key constraints
-        populate_portfolios_and_projects(session)
-        populate_teams_and_members(session)
-        populate_function_activities(session)
-        
-        # Finally, sync the main data which depends on all previous tables
-        sync_tasks_and_time_entries(session)
-        
-        print("\n--- ETL Sync Complete ---")
-        return (True, "✅ Data synchronization complete! The database is now up to date.")
+        _, metrics = run_stages(
+            stages, session, workers=workers, on_stage=tracker.stage_event if tracker else None,
+            should_stop=should_stop, mp_context=mp_context
+        )
+        report.stages = [metrics[stage.name] for stage in stages if stage.name in metrics]
+        report.critical_path = critical_path(stages, metrics)
+        print_stage_report(stages, metrics)
     
     except Exception as e:
-        error_message = f"An error occurred during the ETL process: {e}"
-        print(f"ERROR: {error_message}")
+        report.error = f"An error occurred during the ETL process: {e}"
+        print(f"ERROR: {report.error}")
         session.rollback()
-        return (False, f"❌ {error_message}")
     finally:
+        if listener_token is not None:
+            etl_metrics.progress_listener.reset(listener_token)
+        if cancel_token is not None:
+            etl_metrics.cancel_check.reset(cancel_token)
         session.close()
+        report.finished_at = datetime.now()
+        report_path = report.write_json(config.ETL_REPORTS_DIR)
+        print(f"--> Run report written to: {report_path}")
+
+    if report.success:
+        print("\n--- ETL Sync Complete ---")
+        return (True, "✅ Data synchronization complete! The database is now up to date.")
+    if report.error:
+        return (False, f"❌ {report.error}")
+    if report.cancelled:
+        print("\n--- ETL Sync Cancelled ---")
+        return (False, "⏹️ Data sync cancelled. Run it again with resume to continue from the last checkpoint.")
+    failed = ", ".join(report.failed_stages)
+    print(f"\n--- ETL Sync Failed ({failed}) ---")
+    return (False, f"❌ ETL stage(s) failed: {failed}. See {report_path} for details.")
+
 
 if __name__ == "__main__":
-    run_full_etl_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Load the Excel workbooks into the database.")
+    parser.add_argument(
+        "--workers", type=int, default=config.ETL_WORKERS,
+        help="Processes used for the extract/transform stages (1 runs everything inline)."
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip the (email, week) groups already committed by an interrupted run."
+    )
+    parser.add_argument(
+        "--compact-tasks", action="store_true",
+        help="Only merge duplicate tasks left by earlier imports and repoint their time entries."
+    )
+    args = parser.parse_args()
+
+    if args.compact_tasks:
+        session = get_session()
+        try:
+            compact_duplicate_tasks(session)
+        except Exception:
+            sys.exit(1)
+        finally:
+            session.close()
+    else:
+        success, _ = run_full_etl_pipeline(workers=max(1, args.workers), resume=args.resume)
+        sys.exit(0 if success else 1)
@@ -20,3 +20,17 @@ MEMBERS_SHEET_NAME = 'Team Members'           # From the main file
 FORM_RESPONSES_SHEET_NAME = 'Form Responses 1'  # From the main file
 
 
+
+# --- Pipeline Settings ---
+# Worker processes used for the independent extract/transform stages
+ETL_WORKERS = min(4, os.cpu_count() or 1)
+
+# Number of (email, week) groups committed together by the time entry load.
+# Each committed batch is checkpointed so `etl.py --resume` can skip it.
+ETL_CHECKPOINT_BATCH_GROUPS = 200
+
+# Directory where every run writes its JSON report (etl_run_<timestamp>.json)
+ETL_REPORTS_DIR = os.path.join(PROJECT_ROOT, 'etl_reports')
+
+# Advisory lock key that keeps two ETL runs (CLI or API) from loading at the same time
+ETL_LOCK_KEY = 0x45544C
@@ -1,20 +1,26 @@
 
 import os
-from sqlalchemy import create_engine
+import threading
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from database import Base  # Import the Base from your existing file
 from dotenv import load_dotenv
 load_dotenv()
 
+# Stand-ins for advisory locks on databases without them (SQLite in tests)
+_local_locks = {}
+_local_locks_guard = threading.Lock()
 
 
 def get_engine():
     """Returns a SQLAlchemy engine for our PostgreSQL database."""
     # Build the connection string from Streamlit's secrets
     db_url = os.environ.get("DATABASE_URL")
-    SYNC_DATABASE_URL = db_url.replace("+asyncpg", "")
-    if SYNC_DATABASE_URL is None:
+    if db_url is None:
         raise ValueError("DATABASE_URL environment variable is not set.")
+    # The API runs on async drivers; use the default sync driver of the same database
+    SYNC_DATABASE_URL = db_url.replace("+asyncpg", "").replace("+aiosqlite", "")
     
     return create_engine(SYNC_DATABASE_URL)
 
@@ -29,3 +35,39 @@ def get_session():
     engine = get_engine()
     Session = sessionmaker(bind=engine)
     return Session()
+
+
+@contextmanager
+def advisory_lock(key: int):
+    """
+    Tries to take a database-wide lock without waiting and yields whether it got it.
+    On PostgreSQL this is a session-level advisory lock held on a dedicated
+    connection, so it also excludes other processes and servers; elsewhere it
+    only excludes this process. The lock is released on exit.
+    """
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        engine.dispose()
+        with _local_locks_guard:
+            lock = _local_locks.setdefault(key, threading.Lock())
+        acquired = lock.acquire(blocking=False)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+        return
+
+    connection = engine.connect()
+    try:
+        acquired = connection.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        connection.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+                connection.commit()
+    finally:
+        connection.close()
+        engine.dispose()
@@ -0,0 +1,73 @@
+# backend/etl_jobs.py
+
+import multiprocessing
+import etl_config as config
+from etl import run_full_etl_pipeline
+from hierarchy import rebuild_team_member_closure
+from jobs import job_handler, JobCancelled
+from rollup import rebuild_weekly_rollup
+from schemas import EtlRunRequest
+from submission_headers import rebuild_submission_headers
+
+# The ETL and the derived-table rebuilds as background jobs of the API. Kept out
+# of etl.py and the table modules so the CLI and the ETL's worker processes,
+# which re-import etl, never load the job runner.
+
+
+@job_handler("etl", params_model=EtlRunRequest)
+def etl_job(ctx, params: EtlRunRequest):
+    """
+    run_full_etl_pipeline as a background job. Progress carries the per-stage
+    snapshot; a cancelled run stops after the batch it is committing and can
+    be continued with `resume`.
+    """
+    last = {}
+
+    def on_progress(snapshot):
+        last.update(snapshot)
+        current = ", ".join(snapshot["current_stages"]) or "Finishing"
+        eta = f" (about {snapshot['eta_seconds']:.0f}s left)" if snapshot["eta_seconds"] is not None else ""
+        try:
+            ctx.progress(snapshot["fraction"], f"{current}{eta}", detail=snapshot)
+        except JobCancelled:
+            pass # The pipeline polls ctx.cancelled and stops at its next checkpoint
+
+    # Worker processes are spawned: forking this multithreaded server process is unsafe
+    success, message = run_full_etl_pipeline(
+        workers=params.workers or config.ETL_WORKERS, resume=params.resume, progress=on_progress,
+        should_stop=lambda: ctx.cancelled, mp_context=multiprocessing.get_context("spawn")
+    )
+    ctx.check_cancelled()
+    if not success:
+        raise RuntimeError(message)
+    return {"message": message, "stages": last.get("stages", [])}
+
+
+@job_handler("rebuild_weekly_rollup")
+def rebuild_weekly_rollup_job(ctx, params):
+    """rebuild_weekly_rollup as a background job."""
+    session = ctx.session()
+    try:
+        return {"rows": rebuild_weekly_rollup(session)}
+    finally:
+        session.close()
+
+
+@job_handler("rebuild_team_member_closure")
+def rebuild_team_member_closure_job(ctx, params):
+    """rebuild_team_member_closure as a background job."""
+    session = ctx.session()
+    try:
+        return {"paths": rebuild_team_member_closure(session)}
+    finally:
+        session.close()
+
+
+@job_handler("rebuild_submission_headers")
+def rebuild_submission_headers_job(ctx, params):
+    """rebuild_submission_headers as a background job."""
+    session = ctx.session()
+    try:
+        return {"headers": rebuild_submission_headers(session)}
+    finally:
+        session.close()
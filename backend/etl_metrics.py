@@ -0,0 +1,191 @@
+# backend/etl_metrics.py
+
+import json
+import os
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import resource
+except ImportError:  # Windows has no `resource`; peak RSS is then left empty
+    resource = None
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+# Counters of the stage currently running in this process/thread (None outside a stage)
+_current_counters: ContextVar[Optional[Dict[str, int]]] = ContextVar("etl_stage_counters", default=None)
+_current_stage: ContextVar[Optional[str]] = ContextVar("etl_stage_name", default=None)
+# Receives (stage_name, done, total) from stages reporting their progress; unset in worker processes
+progress_listener: ContextVar[Optional[Callable[[str, int, int], None]]] = ContextVar("etl_progress_listener", default=None)
+# Returns True once the run should stop; checked by report_progress (main process only)
+cancel_check: ContextVar[Optional[Callable[[], bool]]] = ContextVar("etl_cancel_check", default=None)
+
+
+class StageCancelled(Exception):
+    """Raised inside a stage when the run was cancelled; the stage is recorded as cancelled, not failed."""
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    kind: str
+    status: str = SKIPPED
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    rows_read: int = 0
+    rows_inserted: int = 0
+    rows_skipped: int = 0
+    rows_orphaned: int = 0
+    cpu_time: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    db_round_trips: int = 0
+    error: Optional[str] = None
+
+    @property
+    def wall_time(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    def to_dict(self):
+        data = asdict(self)
+        data["wall_time"] = round(self.wall_time, 4)
+        data["cpu_time"] = round(self.cpu_time, 4)
+        data["rows_per_second"] = round(self.rows_inserted / self.wall_time, 1) if self.wall_time else None
+        return data
+
+
+def record(rows_read=0, rows_inserted=0, rows_skipped=0, rows_orphaned=0):
+    """Adds row counts to the stage that is currently running. A no-op outside a stage."""
+    counters = _current_counters.get()
+    if counters is None:
+        return
+    counters["rows_read"] += rows_read
+    counters["rows_inserted"] += rows_inserted
+    counters["rows_skipped"] += rows_skipped
+    counters["rows_orphaned"] += rows_orphaned
+
+
+def report_progress(done, total):
+    """
+    Tells the progress listener how far the running stage is (e.g. batches
+    committed), then stops the stage with StageCancelled if the run was
+    cancelled meanwhile. A no-op without a listener or cancel check.
+    """
+    listener = progress_listener.get()
+    stage = _current_stage.get()
+    if listener is not None and stage is not None:
+        listener(stage, done, total)
+    check = cancel_check.get()
+    if check is not None and check():
+        raise StageCancelled(f"Cancelled after {done} of {total}.")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_round_trip(conn, cursor, statement, parameters, context, executemany):
+    counters = _current_counters.get()
+    if counters is not None:
+        counters["db_round_trips"] += 1
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def measure_stage(name, kind, func, args):
+    """
+    Runs one stage and returns (result, StageMetrics).
+    Exceptions are caught and reported as a failed stage so that worker
+    processes always send their metrics back.
+    """
+    metrics = StageMetrics(name=name, kind=kind)
+    counters = {"rows_read": 0, "rows_inserted": 0, "rows_skipped": 0, "rows_orphaned": 0, "db_round_trips": 0}
+    token = _current_counters.set(counters)
+    stage_token = _current_stage.set(name)
+    cpu_start = time.process_time()
+    metrics.started = time.time()
+    result = None
+    try:
+        result = func(*args)
+        metrics.status = SUCCEEDED
+    except StageCancelled as e:
+        metrics.status = CANCELLED
+        metrics.error = str(e)
+    except Exception as e:
+        metrics.status = FAILED
+        metrics.error = f"{type(e).__name__}: {e}"
+    finally:
+        metrics.finished = time.time()
+        metrics.cpu_time = time.process_time() - cpu_start
+        metrics.peak_rss_mb = _peak_rss_mb()
+        _current_counters.reset(token)
+        _current_stage.reset(stage_token)
+        for key, value in counters.items():
+            setattr(metrics, key, value)
+    return result, metrics
+
+
+@dataclass
+class RunReport:
+    started_at: datetime
+    workers: int
+    resume: bool = False
+    finished_at: Optional[datetime] = None
+    stages: List[StageMetrics] = field(default_factory=list)
+    critical_path: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def failed_stages(self) -> List[str]:
+        return [s.name for s in self.stages if s.status == FAILED]
+
+    @property
+    def cancelled(self) -> bool:
+        return any(s.status == CANCELLED for s in self.stages)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and all(s.status == SUCCEEDED for s in self.stages)
+
+    def to_dict(self):
+        return {
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "success": self.success,
+            "cancelled": self.cancelled,
+            "workers": self.workers,
+            "resume": self.resume,
+            "error": self.error,
+            "failed_stages": self.failed_stages,
+            "critical_path": self.critical_path,
+            "totals": {
+                "rows_read": sum(s.rows_read for s in self.stages if s.kind == "extract"),
+                "rows_inserted": sum(s.rows_inserted for s in self.stages),
+                "rows_skipped": sum(s.rows_skipped for s in self.stages),
+                "rows_orphaned": sum(s.rows_orphaned for s in self.stages),
+                "db_round_trips": sum(s.db_round_trips for s in self.stages),
+            },
+            "stages": [s.to_dict() for s in self.stages],
+        }
+
+    def write_json(self, directory) -> str:
+        """Writes the report as etl_run_<timestamp>.json into `directory` and returns the path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"etl_run_{self.started_at:%Y%m%d_%H%M%S}.json")
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+        return path
@@ -0,0 +1,210 @@
+# backend/etl_scheduler.py
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from etl_metrics import StageMetrics, measure_stage, SUCCEEDED, SKIPPED, CANCELLED
+
+EXTRACT = "extract"
+TRANSFORM = "transform"
+LOAD = "load"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One node of the ETL graph.
+
+    `inputs` are stages whose results are passed to `func` as positional
+    arguments, in order. `after` are ordering-only dependencies (used to keep
+    loads in foreign-key order). Extract and transform stages must be
+    module-level functions so they can be sent to a worker process; load
+    stages run in the main process and receive the session as first argument.
+    """
+    name: str
+    kind: str
+    func: Callable
+    inputs: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+
+    @property
+    def deps(self) -> List[str]:
+        return self.inputs + self.after
+
+
+def _validate(stages: List[Stage]):
+    names = {s.name for s in stages}
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+    # Kahn's algorithm, only to reject cycles up front
+    remaining = {s.name: set(s.deps) for s in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"ETL stages contain a dependency cycle: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_stages(stages: List[Stage], session, workers: int = 1, on_stage: Optional[Callable] = None,
+               should_stop: Optional[Callable[[], bool]] = None, mp_context=None):
+    """
+    Executes the stage graph.
+
+    Extract/transform stages run in a process pool as soon as their inputs are
+    available. Load stages run one at a time in the main process, in the order
+    they are declared, which is where foreign-key order is expressed.
+    A failed stage does not stop independent stages, but everything that
+    depends on it is skipped.
+    `on_stage(stage, metrics)` is called when a stage starts (metrics is None)
+    and when it has finished, failed or been skipped.
+    `should_stop()` is checked before each scheduling round; once it returns
+    True (or a stage was cancelled) nothing new starts, the stages still
+    running are waited for and everything left is marked cancelled.
+    `mp_context` is the multiprocessing context of the worker pool; pass a
+    "spawn" context when calling from a thread of a multithreaded process.
+    Returns (results_by_stage_name, metrics_by_stage_name).
+    """
+    _validate(stages)
+
+    results: Dict[str, Any] = {}
+    metrics: Dict[str, StageMetrics] = {}
+    pending = list(stages)
+    running = {}
+
+    def _is_ready(stage):
+        return all(d in results for d in stage.deps)
+
+    def _is_blocked(stage):
+        return any(d in metrics and metrics[d].status != SUCCEEDED for d in stage.deps)
+
+    def _notify(stage, stage_metrics=None):
+        if on_stage:
+            on_stage(stage, stage_metrics)
+
+    def _record(stage, result, stage_metrics):
+        metrics[stage.name] = stage_metrics
+        _notify(stage, stage_metrics)
+        if stage_metrics.status == SUCCEEDED:
+            results[stage.name] = result
+        elif stage_metrics.status == CANCELLED:
+            logger.warning("ETL stage %s cancelled: %s", stage.name, stage_metrics.error, extra={"stage": stage.name})
+        else:
+            logger.error("ETL stage %s failed: %s", stage.name, stage_metrics.error, extra={"stage": stage.name})
+
+    def _stopping():
+        return any(m.status == CANCELLED for m in metrics.values()) or bool(should_stop and should_stop())
+
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) if workers > 1 else None
+    try:
+        while pending or running:
+            if _stopping():
+                for future in list(running):
+                    _record(running.pop(future), *future.result())
+                for stage in pending:
+                    metrics[stage.name] = StageMetrics(name=stage.name, kind=stage.kind, status=CANCELLED)
+                    _notify(stage, metrics[stage.name])
+                pending = []
+                break
+
+            # 0. Skip everything downstream of a failure
+            for stage in [s for s in pending if _is_blocked(s)]:
+                pending.remove(stage)
+                metrics[stage.name] = StageMetrics(name=stage.name, kind=stage.kind, status=SKIPPED)
+                _notify(stage, metrics[stage.name])
+
+            # 1. Hand every ready extract/transform to the pool (or run it inline)
+            for stage in [s for s in pending if s.kind != LOAD and _is_ready(s)]:
+                pending.remove(stage)
+                args = (stage.name, stage.kind, stage.func, [results[name] for name in stage.inputs])
+                _notify(stage)
+                if pool:
+                    running[pool.submit(measure_stage, *args)] = stage
+                else:
+                    _record(stage, *measure_stage(*args))
+
+            # 2. Run the first ready load in the main process while the pool keeps working
+            next_load = next((s for s in pending if s.kind == LOAD and _is_ready(s)), None)
+            if next_load:
+                pending.remove(next_load)
+                args = [session] + [results[name] for name in next_load.inputs]
+                _notify(next_load)
+                _record(next_load, *measure_stage(next_load.name, next_load.kind, next_load.func, args))
+
+            # 3. Collect finished workers; block only if there is nothing else to do
+            if running:
+                timeout = 0 if next_load else None
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _record(running.pop(future), *future.result())
+            elif pending and not next_load and not any(_is_ready(s) or _is_blocked(s) for s in pending):
+                raise RuntimeError("ETL scheduler stalled: no runnable stages left.")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    return results, metrics
+
+
+def critical_path(stages: List[Stage], metrics: Dict[str, StageMetrics]) -> List[str]:
+    """Returns the chain of stages with the largest summed wall time through the graph."""
+    by_name = {s.name: s for s in stages}
+    longest: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+
+    def _visit(name):
+        if name in longest:
+            return longest[name]
+        best_dep, best_time = None, 0.0
+        for dep in by_name[name].deps:
+            dep_time = _visit(dep)
+            if dep_time > best_time:
+                best_dep, best_time = dep, dep_time
+        previous[name] = best_dep
+        longest[name] = best_time + (metrics[name].wall_time if name in metrics else 0.0)
+        return longest[name]
+
+    for stage in stages:
+        _visit(stage.name)
+
+    path = []
+    node = max(longest, key=longest.get) if longest else None
+    while node:
+        path.append(node)
+        node = previous[node]
+    return list(reversed(path))
+
+
+def print_stage_report(stages: List[Stage], metrics: Dict[str, StageMetrics]):
+    """Prints per-stage status, timings and row counts, and the critical path of the run."""
+    started = [m.started for m in metrics.values() if m.started is not None]
+    if not started:
+        return
+    run_start = min(started)
+    run_end = max(m.finished for m in metrics.values() if m.finished is not None)
+
+    print("\n--- ETL Stage Report ---")
+    for stage in stages:
+        m = metrics.get(stage.name)
+        if not m:
+            continue
+        offset = f"+{m.started - run_start:7.2f}s" if m.started is not None else " " * 9
+        print(
+            f"--> {stage.name:<32} {m.status:<9} start {offset}  wall {m.wall_time:7.2f}s  cpu {m.cpu_time:7.2f}s  "
+            f"read {m.rows_read:>8}  inserted {m.rows_inserted:>8}  skipped {m.rows_skipped:>6}  "
+            f"orphaned {m.rows_orphaned:>4}  db {m.db_round_trips:>6}"
+        )
+
+    path = critical_path(stages, metrics)
+    path_time = sum(metrics[name].wall_time for name in path if name in metrics)
+    print(f"--> Critical path ({path_time:.2f}s): {' -> '.join(path)}")
+    print(f"--> Total elapsed: {run_end - run_start:.2f}s")
@@ -0,0 +1,40 @@
+# backend/export.py
+import argparse
+import sys
+import time
+from datetime import date
+from dotenv import load_dotenv
+from etl_database_utils import get_engine
+import export_services
+
+load_dotenv()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the denormalized time entries to Parquet or Arrow IPC.")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First date of work (YYYY-MM-DD).")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Last date of work (YYYY-MM-DD).")
+    parser.add_argument("--team-id", type=int, help="Only entries of members of this team.")
+    parser.add_argument("--status", action="append", choices=["draft", "submitted", "approved"],
+                        help="Entry status to include; repeat for several (default: all).")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--batch-size", type=int, default=export_services.COLUMNAR_BATCH_SIZE,
+                        help="Rows per fetch, and per Parquet row group / Arrow record batch.")
+    parser.add_argument("--output", help="Output file (default: time_entries_<start>_<end>.<format>).")
+    args = parser.parse_args()
+
+    output = args.output or f"time_entries_{args.start}_{args.end}.{args.format}"
+    query = export_services.time_entry_export_select(args.start, args.end, team_id=args.team_id, statuses=args.status)
+
+    print(f"--- Exporting time entries {args.start} to {args.end} as {args.format} ---")
+    started = time.time()
+    engine = get_engine()
+    try:
+        with engine.connect() as connection:
+            rows = export_services.write_columnar_export(connection, query, output, args.format, batch_size=args.batch_size)
+    except Exception as e:
+        print(f"--> ERROR: Export failed: {e}")
+        sys.exit(1)
+    finally:
+        engine.dispose()
+    print(f"--> Wrote {rows} rows to {output} in {time.time() - started:.2f}s")
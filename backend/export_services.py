@@ -0,0 +1,220 @@
+# backend/export_services.py
+
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from typing import AsyncIterator, List, Optional
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from sqlalchemy import select, func
+from database import (
+    TimeEntry, TeamMember, Team, Task, GroupActivity, Project, Portfolio, FunctionActivity, get_engine
+)
+import etl_database_utils
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 5000
+# Rows per Parquet row group / Arrow record batch in columnar exports
+COLUMNAR_BATCH_SIZE = 50000
+
+_names = pa.dictionary(pa.int32(), pa.string())
+
+# Arrow schema of time_entry_export_select; repeated names are dictionary-encoded
+EXPORT_SCHEMA = pa.schema([
+    ("entry_id", pa.int64()),
+    ("date_of_work", pa.timestamp("us")),
+    ("week_ending", pa.date32()),
+    ("email", _names),
+    ("full_name", _names),
+    ("team", _names),
+    ("portfolio", _names),
+    ("project", _names),
+    ("group_activity", _names),
+    ("function_activity", _names),
+    ("task_type", _names),
+    ("task_description", pa.string()),
+    ("task_status", _names),
+    ("status", _names),
+    ("hours", pa.float64()),
+    ("daily_mode", pa.bool_()),
+    ("sun", pa.float64()),
+    ("mon", pa.float64()),
+    ("tue", pa.float64()),
+    ("wed", pa.float64()),
+    ("thu", pa.float64()),
+    ("notes", pa.string()),
+    ("submission_id", pa.string()),
+    ("timestamp", pa.timestamp("us")),
+])
+
+
+def time_entry_export_select(
+    start_date: date,
+    end_date: date,
+    team_id: Optional[int] = None,
+    statuses: Optional[List[str]] = None,
+):
+    """
+    The denormalized time entry view: one flat row per entry with the member,
+    team, portfolio, project, group activity, function activity and task
+    names resolved. Entries are filtered on date_of_work between `start_date`
+    and `end_date` (inclusive), the member's team and the entry status
+    (ETL-imported entries without a status count as submitted).
+    """
+    query = (
+        select(
+            TimeEntry.id.label("entry_id"),
+            TimeEntry.date_of_work,
+            TimeEntry.week_ending,
+            TeamMember.email,
+            TeamMember.full_name,
+            Team.name.label("team"),
+            Portfolio.name.label("portfolio"),
+            Project.project_name.label("project"),
+            GroupActivity.name.label("group_activity"),
+            FunctionActivity.name.label("function_activity"),
+            Task.type.label("task_type"),
+            Task.description.label("task_description"),
+            Task.status.label("task_status"),
+            func.coalesce(TimeEntry.status, "submitted").label("status"),
+            TimeEntry.hours,
+            TimeEntry.daily_mode,
+            TimeEntry.sun,
+            TimeEntry.mon,
+            TimeEntry.tue,
+            TimeEntry.wed,
+            TimeEntry.thu,
+            TimeEntry.notes,
+            TimeEntry.submission_id,
+            TimeEntry.timestamp,
+        )
+        .select_from(TimeEntry)
+        .join(TeamMember, TeamMember.id == TimeEntry.team_member_id)
+        .outerjoin(Team, Team.id == TeamMember.team_id)
+        .outerjoin(Task, Task.id == TimeEntry.task_id)
+        .outerjoin(GroupActivity, GroupActivity.id == Task.group_activity_id)
+        .outerjoin(Project, Project.id == GroupActivity.project_id)
+        .outerjoin(Portfolio, Portfolio.id == Project.portfolio_id)
+        .outerjoin(FunctionActivity, FunctionActivity.id == Task.function_activity_id)
+        .where(
+            TimeEntry.date_of_work >= start_date,
+            TimeEntry.date_of_work < end_date + timedelta(days=1)
+        )
+        .order_by(TimeEntry.date_of_work, TimeEntry.id)
+    )
+    if team_id is not None:
+        query = query.where(TeamMember.team_id == team_id)
+    if statuses:
+        query = query.where(func.coalesce(TimeEntry.status, "submitted").in_(statuses))
+    return query
+
+
+async def _stream_rows(query, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yields (column_names, rows) batches from a server-side cursor on a
+    connection of its own, so the rows are never buffered in full and the
+    stream can outlive the request's session.
+    """
+    async with get_engine().connect() as conn:
+        result = await conn.stream(query.execution_options(stream_results=True, yield_per=batch_size))
+        columns = list(result.keys())
+        async for rows in result.partitions(batch_size):
+            yield columns, rows
+
+
+async def stream_ndjson(query) -> AsyncIterator[str]:
+    """One JSON object per line."""
+    async for columns, rows in _stream_rows(query):
+        yield "".join(json.dumps(dict(zip(columns, row)), default=str) + "\n" for row in rows)
+
+
+async def stream_csv(query) -> AsyncIterator[str]:
+    """CSV with a header row; each batch is written to a small buffer and flushed."""
+    header_written = False
+    async for columns, rows in _stream_rows(query):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(columns)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+class _DictionaryEncoder:
+    """
+    Encodes one column against a dictionary that only ever grows, so each
+    batch's dictionary extends the previous one. Arrow IPC files accept that
+    as a delta; independent per-batch dictionaries would be rejected.
+    """
+    def __init__(self):
+        self.positions = {}
+        self.values = []
+
+    def encode(self, column):
+        indices = []
+        for value in column:
+            if value is None:
+                indices.append(None)
+                continue
+            position = self.positions.get(value)
+            if position is None:
+                position = self.positions[value] = len(self.values)
+                self.values.append(value)
+            indices.append(position)
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(self.values, pa.string()))
+
+
+def write_columnar_export(connection, query, path: str, fmt: str, batch_size: int = COLUMNAR_BATCH_SIZE) -> int:
+    """
+    Writes the rows of `query` (a time_entry_export_select) to `path` as
+    Parquet (`fmt="parquet"`, one row group per batch) or an Arrow IPC file
+    (`fmt="arrow"`). Rows are fetched `batch_size` at a time from a
+    server-side cursor on the sync `connection` and converted batch by batch.
+    Returns the number of rows written.
+    """
+    encoders = {f.name: _DictionaryEncoder() for f in EXPORT_SCHEMA if pa.types.is_dictionary(f.type)}
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(path, EXPORT_SCHEMA, compression="zstd")
+    elif fmt == "arrow":
+        writer = ipc.new_file(path, EXPORT_SCHEMA, options=ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+
+    rows_written = 0
+    try:
+        result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+        for rows in result.partitions(batch_size):
+            columns = list(zip(*rows))
+            arrays = [
+                encoders[field.name].encode(values) if field.name in encoders else pa.array(values, field.type)
+                for field, values in zip(EXPORT_SCHEMA, columns)
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=EXPORT_SCHEMA))
+            rows_written += len(rows)
+    finally:
+        writer.close()
+    return rows_written
+
+
+def export_columnar_file(query, fmt: str) -> str:
+    """
+    Runs a columnar export into a temporary file on the sync engine and returns
+    its path; the caller removes the file once it has been sent.
+    """
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}", prefix="time_entries_")
+    os.close(fd)
+    engine = etl_database_utils.get_engine()
+    try:
+        with engine.connect() as connection:
+            write_columnar_export(connection, query, path, fmt)
+        return path
+    except Exception:
+        os.remove(path)
+        raise
+    finally:
+        engine.dispose()
@@ -0,0 +1,77 @@
+# backend/hierarchy.py
+
+import argparse
+import sys
+from sqlalchemy import select, insert, delete, func, literal
+from sqlalchemy.orm import aliased
+from database import TeamMember, TeamMemberClosure
+
+# Guards the rebuild against manager cycles in imported data
+MAX_HIERARCHY_DEPTH = 64
+
+
+def subtree_member_ids(manager_id: int, include_self: bool = False):
+    """Select of the ids of everyone under `manager_id`, at any depth."""
+    return select(TeamMemberClosure.descendant_id).where(
+        TeamMemberClosure.ancestor_id == manager_id,
+        TeamMemberClosure.depth >= (0 if include_self else 1),
+    )
+
+
+def _closure_paths():
+    """Every (ancestor, descendant, depth) path of the manager hierarchy, derived from manager_id."""
+    paths = select(
+        TeamMember.id.label('ancestor_id'),
+        TeamMember.id.label('descendant_id'),
+        literal(0).label('depth'),
+    ).cte('paths', recursive=True)
+    reports = aliased(TeamMember)
+    paths = paths.union_all(
+        select(paths.c.ancestor_id, reports.id, paths.c.depth + 1)
+        .where(reports.manager_id == paths.c.descendant_id, paths.c.depth < MAX_HIERARCHY_DEPTH)
+    )
+    return select(paths.c.ancestor_id, paths.c.descendant_id, func.min(paths.c.depth)).group_by(
+        paths.c.ancestor_id, paths.c.descendant_id
+    )
+
+
+def rebuild_team_member_closure(session):
+    """
+    Recomputes team_member_closure from team_members.manager_id in one
+    transaction. Used after bulk writes that bypass the mapper events (the
+    ETL's manager pass) and to repair drift. Returns the number of paths.
+    """
+    print("\n--- Rebuilding Team Member Closure ---")
+    try:
+        session.execute(delete(TeamMemberClosure))
+        session.execute(
+            insert(TeamMemberClosure).from_select(['ancestor_id', 'descendant_id', 'depth'], _closure_paths())
+        )
+        session.commit()
+        count = session.scalar(select(func.count()).select_from(TeamMemberClosure))
+        print(f"--> Success: {count} hierarchy paths written.")
+        return count
+    except Exception as e:
+        print(f"--> ERROR: An error occurred while rebuilding the closure: {e}")
+        session.rollback()
+        raise
+
+
+if __name__ == "__main__":
+    from etl_database_utils import get_session
+
+    parser = argparse.ArgumentParser(description="Maintain the manager hierarchy closure table.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every path from team_members.manager_id.")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        sys.exit(0)
+
+    session = get_session()
+    try:
+        rebuild_team_member_closure(session)
+    except Exception:
+        sys.exit(1)
+    finally:
+        session.close()
@@ -0,0 +1,380 @@
+# backend/jobs.py
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Type
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+from database import Job
+from schemas import JobStatus
+import etl_database_utils
+
+logger = logging.getLogger(__name__)
+
+# Worker threads shared by all job types
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+# Minimum seconds between two progress writes of the same job
+PROGRESS_FLUSH_INTERVAL = 1.0
+# Seconds between two heartbeats of the jobs a runner owns
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get("JOB_HEARTBEAT_INTERVAL", "15"))
+# Unfinished jobs without a heartbeat for this long are taken as orphaned; keep it well above the interval
+JOB_STALE_AFTER = float(os.environ.get("JOB_STALE_AFTER", "120"))
+
+FINISHED_STATUSES = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value)
+UNFINISHED_STATUSES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once its cancellation has been requested."""
+
+
+class UnknownJobTypeError(ValueError):
+    """No handler is registered for the requested job type."""
+
+
+class JobNotFoundError(ValueError):
+    """No job with the requested id."""
+
+
+@dataclass
+class JobType:
+    name: str
+    func: Callable
+    params_model: Optional[Type[BaseModel]]
+    max_concurrent: int
+
+
+_job_types: Dict[str, JobType] = {}
+
+
+def job_handler(name: str, params_model: Optional[Type[BaseModel]] = None, max_concurrent: int = 1):
+    """
+    Registers `func(ctx, params)` as the handler of job type `name`. `params`
+    is an instance of `params_model` (None without one) and the handler's
+    return value, a JSON-serializable dict, is stored as the job's result.
+    At most `max_concurrent` jobs of the type run at the same time.
+    """
+    def register(func):
+        _job_types[name] = JobType(name, func, params_model, max_concurrent)
+        return func
+    return register
+
+
+def job_types() -> List[JobType]:
+    return sorted(_job_types.values(), key=lambda job_type: job_type.name)
+
+
+def _is_dead_local_process(owner: str) -> bool:
+    """Whether `owner` (hostname:pid) is a process on this host that no longer runs."""
+    hostname, _, pid = owner.rpartition(":")
+    # On Windows os.kill terminates the process instead of probing it; rely on the heartbeat there
+    if hostname != socket.gethostname() or not pid.isdigit() or os.name == "nt":
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+class JobContext:
+    """What a running handler gets: progress reporting, cancellation checks and database access."""
+
+    def __init__(self, runner: "JobRunner", job_id: str, cancel_event: threading.Event):
+        self.job_id = job_id
+        self._runner = runner
+        self._cancel_event = cancel_event
+        self._last_flush = 0.0
+
+    @property
+    def engine(self):
+        """The runner's sync engine."""
+        return self._runner.engine
+
+    def session(self):
+        """A new sync session on the runner's engine; the caller closes it."""
+        return self._runner.session_factory()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raises JobCancelled if the job should stop. Call it between units of work."""
+        if self._cancel_event.is_set():
+            raise JobCancelled("The job was cancelled.")
+
+    def progress(self, fraction: Optional[float] = None, message: Optional[str] = None, detail: Optional[dict] = None):
+        """
+        Records progress (`fraction` of 0..1 when the total is known, plus an
+        optional JSON-serializable `detail`) and checks for cancellation. Writes are throttled to one per PROGRESS_FLUSH_INTERVAL;
+        each write also picks up a cancellation requested from another process.
+        """
+        now = time.monotonic()
+        if now - self._last_flush >= PROGRESS_FLUSH_INTERVAL:
+            self._last_flush = now
+            if self._runner._write_progress(self.job_id, fraction, message, detail):
+                self._cancel_event.set()
+        self.check_cancelled()
+
+
+class JobRunner:
+    """
+    Runs jobs on a bounded thread pool inside the API process, with a
+    concurrency limit per job type. Jobs are persisted in the jobs table;
+    the queue itself is in memory. Several API processes can each run a
+    runner: every job records the process that owns it, and a heartbeat
+    thread keeps the `updated_at` of the owned jobs current. A job still
+    queued or running is marked failed only once its owner is gone: an
+    earlier incarnation of this process, a dead process on this host, or
+    any owner whose heartbeat is older than JOB_STALE_AFTER.
+    """
+
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        self.max_workers = max_workers
+        self.engine = None
+        self.session_factory = None
+        self.owner = None
+        self._executor = None
+        self._heartbeat_thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = defaultdict(deque) # job type -> queued job ids
+        self._running = defaultdict(int) # job type -> jobs running
+        self._cancel_events: Dict[str, threading.Event] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        self.engine = etl_database_utils.get_engine()
+        self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        # Nothing is queued yet, so jobs under our own name are left over from an earlier incarnation
+        self._fail_orphaned_jobs(include_own=True)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._stopping.clear()
+        self._heartbeat_thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+        logger.info("Job runner %s started with %d workers", self.owner, self.max_workers)
+
+    def stop(self):
+        """Cancels queued jobs, asks running ones to stop and waits for them."""
+        if not self.started:
+            return
+        with self._lock:
+            queued = [job_id for ids in self._pending.values() for job_id in ids]
+            self._pending.clear()
+            for event in self._cancel_events.values():
+                event.set()
+        for job_id in queued:
+            self._finish(job_id, JobStatus.CANCELLED)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        self._stopping.set()
+        self._heartbeat_thread.join()
+        self._heartbeat_thread = None
+        self.engine.dispose()
+        logger.info("Job runner stopped")
+
+    def submit(self, job_type: str, params: Optional[dict] = None) -> Job:
+        """
+        Validates `params` against the type's model, stores the job as queued and
+        schedules it. Raises UnknownJobTypeError, or pydantic's ValidationError
+        for bad parameters.
+        """
+        if not self.started:
+            raise RuntimeError("The job runner is not running.")
+        handler = _job_types.get(job_type)
+        if handler is None:
+            raise UnknownJobTypeError(f"Unknown job type: {job_type}")
+        if handler.params_model is not None:
+            params = handler.params_model(**(params or {})).model_dump(mode="json")
+        else:
+            params = {}
+
+        job = Job(
+            id=str(uuid.uuid4()),
+            job_type=job_type,
+            status=JobStatus.QUEUED.value,
+            params=params,
+            cancel_requested=False,
+            owner=self.owner,
+            created_at=datetime.now(),
+            updated_at=datetime.now()
+        )
+        with self.session_factory() as session:
+            session.add(job)
+            session.commit()
+        logger.info("Queued job %s (%s)", job.id, job_type)
+
+        with self._lock:
+            self._cancel_events[job.id] = threading.Event()
+            self._pending[job_type].append(job.id)
+            self._dispatch(job_type)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self.session_factory() as session:
+            job = session.get(Job, job_id)
+        if job is None:
+            raise JobNotFoundError(f"Job {job_id} not found.")
+        return job
+
+    def list_jobs(self, job_type: Optional[str] = None, status: Optional[JobStatus] = None, limit: int = 50) -> List[Job]:
+        query = select(Job).order_by(Job.created_at.desc()).limit(limit)
+        if job_type:
+            query = query.where(Job.job_type == job_type)
+        if status:
+            query = query.where(Job.status == status.value)
+        with self.session_factory() as session:
+            return list(session.scalars(query))
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancels a queued job at once; a running job is flagged and stops at its
+        next progress or cancellation check. Finished jobs are left as they are.
+        """
+        job = self.get(job_id)
+        if job.status in FINISHED_STATUSES:
+            return job
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+            queued = job_id in self._pending[job.job_type]
+            if queued:
+                self._pending[job.job_type].remove(job_id)
+                self._cancel_events.pop(job_id, None)
+        if event:
+            event.set()
+        if queued:
+            self._finish(job_id, JobStatus.CANCELLED)
+        else:
+            with self.session_factory() as session:
+                session.execute(update(Job).where(Job.id == job_id).values(cancel_requested=True))
+                session.commit()
+        logger.info("Cancellation requested for job %s", job_id)
+        return self.get(job_id)
+
+    def _dispatch(self, job_type: str):
+        """Starts queued jobs of `job_type` up to its limit. Called with the lock held."""
+        limit = _job_types[job_type].max_concurrent
+        while self._pending[job_type] and self._running[job_type] < limit:
+            job_id = self._pending[job_type].popleft()
+            self._running[job_type] += 1
+            self._executor.submit(self._run, job_type, job_id)
+
+    def _run(self, job_type: str, job_id: str):
+        handler = _job_types[job_type]
+        try:
+            with self.session_factory() as session:
+                job = session.get(Job, job_id)
+                if job.cancel_requested:
+                    raise JobCancelled()
+                job.status = JobStatus.RUNNING.value
+                job.started_at = job.updated_at = datetime.now()
+                session.commit()
+                params = job.params
+
+            logger.info("Running job %s (%s)", job_id, job_type)
+            ctx = JobContext(self, job_id, self._cancel_events[job_id])
+            ctx.check_cancelled()
+            parsed = handler.params_model.model_validate(params) if handler.params_model else None
+            result = handler.func(ctx, parsed)
+            self._finish(job_id, JobStatus.SUCCEEDED, result=result, progress=1.0)
+            logger.info("Job %s (%s) succeeded", job_id, job_type)
+        except JobCancelled:
+            self._finish(job_id, JobStatus.CANCELLED)
+            logger.info("Job %s (%s) cancelled", job_id, job_type)
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job_id, job_type)
+            self._finish(job_id, JobStatus.FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._running[job_type] -= 1
+                self._cancel_events.pop(job_id, None)
+                if self.started:
+                    self._dispatch(job_type)
+
+    def _write_progress(self, job_id: str, fraction: Optional[float], message: Optional[str], detail: Optional[dict]) -> bool:
+        """Stores a job's progress; returns whether its cancellation was requested meanwhile."""
+        with self.session_factory() as session:
+            session.execute(
+                update(Job).where(Job.id == job_id).values(
+                    progress=fraction, progress_message=message, progress_detail=detail, updated_at=datetime.now()
+                )
+            )
+            cancel_requested = session.scalar(select(Job.cancel_requested).where(Job.id == job_id))
+            session.commit()
+        return bool(cancel_requested)
+
+    def _finish(self, job_id: str, status: JobStatus, **values: Any):
+        with self.session_factory() as session:
+            session.execute(
+                update(Job).where(Job.id == job_id).values(
+                    status=status.value, finished_at=datetime.now(), updated_at=datetime.now(), **values
+                )
+            )
+            session.commit()
+
+    def _heartbeat(self):
+        """Keeps the jobs of this runner fresh and fails those of runners that are gone."""
+        while not self._stopping.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                with self.session_factory() as session:
+                    session.execute(
+                        update(Job)
+                        .where(Job.owner == self.owner, Job.status.in_(UNFINISHED_STATUSES))
+                        .values(updated_at=datetime.now())
+                    )
+                    session.commit()
+                self._fail_orphaned_jobs()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    def _fail_orphaned_jobs(self, include_own: bool = False):
+        """
+        Marks failed the queued or running jobs whose owner is gone. Jobs of
+        this runner count only with `include_own`, which start() uses for the
+        ones an earlier incarnation of this process left behind.
+        """
+        stale_before = datetime.now() - timedelta(seconds=JOB_STALE_AFTER)
+        with self.session_factory() as session:
+            unfinished = session.execute(
+                select(Job.id, Job.owner, Job.updated_at).where(Job.status.in_(UNFINISHED_STATUSES))
+            ).all()
+            orphaned = [
+                job_id for job_id, owner, updated_at in unfinished
+                if (owner == self.owner and include_own)
+                or owner is None
+                or (owner != self.owner and (updated_at is None or updated_at < stale_before or _is_dead_local_process(owner)))
+            ]
+            if not orphaned:
+                return
+            session.execute(
+                update(Job)
+                .where(Job.id.in_(orphaned), Job.status.in_(UNFINISHED_STATUSES))
+                .values(
+                    status=JobStatus.FAILED.value,
+                    error="Interrupted: the process running the job stopped.",
+                    finished_at=datetime.now(),
+                    updated_at=datetime.now()
+                )
+            )
+            session.commit()
+        logger.warning("Marked %d orphaned jobs as failed", len(orphaned))
+
+
+# The runner of this process; started and stopped with the app
+runner = JobRunner()
@@ -4,16 +4,35 @@ from dotenv import load_dotenv
 # Load environment variables from the .env file
 load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Simplified imports
-from api import admin_router, submission_router, auth_router, activity_router
+from api import admin_router, submission_router, auth_router, activity_router, analytics_router, manager_router, export_router, jobs_router, metrics_router
+import jobs
+import slow_query_log
+from logging_config import setup_logging, stop_logging, RequestIdMiddleware
+from metrics import MetricsMiddleware
+from query_inspector import QUERY_DEBUG, QueryInspectorMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Application logs go through a queue to a writer thread; LOG_LEVEL and LOG_FORMAT configure them
+    setup_logging()
+    # Background jobs run in this process for as long as the app is up
+    jobs.runner.start()
+    slow_query_log.recorder.start()
+    yield
+    slow_query_log.recorder.stop()
+    jobs.runner.stop()
+    stop_logging()
 
 app = FastAPI(
     title="Timesheet Backend API",
     description="API service for the timesheet submission application.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # --- Add CORS Middleware ---
@@ -32,6 +51,13 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods (GET, POST, etc.)
     allow_headers=["*"],  # Allows all headers
 )
+# QUERY_DEBUG=1: per-request statement counts in X-Query-Count and N+1 warnings in the log
+if QUERY_DEBUG:
+    app.add_middleware(QueryInspectorMiddleware)
+# Wraps everything added before it, so every log line of a request carries its X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+# Added last, so it is the outermost middleware and times everything else; scraped at /metrics
+app.add_middleware(MetricsMiddleware)
 # --- End of new section ---
 
 
@@ -40,6 +66,11 @@ app.include_router(admin_router.router)
 app.include_router(submission_router.router)
 app.include_router(auth_router.router)
 app.include_router(activity_router.router,)
+app.include_router(analytics_router.router)
+app.include_router(manager_router.router)
+app.include_router(export_router.router)
+app.include_router(jobs_router.router)
+app.include_router(metrics_router.router)
 
 @app.get("/", tags=["Root"])
 async def read_root():
@@ -0,0 +1,166 @@
+# backend/manager_services.py
+
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional
+from sqlalchemy import select, update, func, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import TimeEntry, TeamMember, TeamMemberClosure, Team, Submission
+from schemas import TimeEntryStatus, MemberWeekStatus, MemberWeek, ApprovalOutcomeStatus
+from services import get_user_by_email, member_week_status
+from hierarchy import subtree_member_ids
+
+# ETL-imported entries carry no status and count as submitted
+_is_submitted = or_(TimeEntry.status == TimeEntryStatus.SUBMITTED.value, TimeEntry.status.is_(None))
+_is_approved = TimeEntry.status == TimeEntryStatus.APPROVED.value
+_is_draft = TimeEntry.status == TimeEntryStatus.DRAFT.value
+
+
+async def get_team_status(manager_email: str, week_ending: date, db: AsyncSession, direct_only: bool = False) -> Dict[str, Any]:
+    """
+    The status and hours of every report of a manager for one week, in one query:
+    the hierarchy closure gives the reports, and their entries for the week are
+    left-joined on (team_member_id, week_ending) and grouped per member.
+    A member with anything still submitted shows as submitted until it is approved.
+    """
+    manager = await get_user_by_email(manager_email, db)
+
+    query = (
+        select(
+            TeamMember.id,
+            TeamMember.full_name,
+            TeamMember.email,
+            Team.name.label("team"),
+            TeamMemberClosure.depth,
+            func.count(TimeEntry.id).filter(_is_submitted).label("submitted"),
+            func.count(TimeEntry.id).filter(_is_approved).label("approved"),
+            func.count(TimeEntry.id).filter(_is_draft).label("draft"),
+            func.coalesce(func.sum(TimeEntry.hours).filter(or_(_is_submitted, _is_approved)), 0.0).label("hours"),
+            func.coalesce(func.sum(TimeEntry.hours).filter(_is_draft), 0.0).label("draft_hours"),
+        )
+        .select_from(TeamMemberClosure)
+        .join(TeamMember, TeamMember.id == TeamMemberClosure.descendant_id)
+        .outerjoin(Team, Team.id == TeamMember.team_id)
+        .outerjoin(TimeEntry, and_(TimeEntry.team_member_id == TeamMember.id, TimeEntry.week_ending == week_ending))
+        .where(TeamMemberClosure.ancestor_id == manager.id, TeamMemberClosure.depth > 0)
+        .group_by(TeamMember.id, TeamMember.full_name, TeamMember.email, Team.name, TeamMemberClosure.depth)
+        .order_by(TeamMemberClosure.depth, TeamMember.full_name)
+    )
+    if direct_only:
+        query = query.where(TeamMemberClosure.depth == 1)
+
+    result = await db.execute(query)
+
+    members = []
+    counts = {status: 0 for status in MemberWeekStatus}
+    for row in result:
+        status = member_week_status(row.submitted, row.approved, row.draft)
+        counts[status] += 1
+        members.append({
+            "member_id": row.id,
+            "full_name": row.full_name,
+            "email": row.email,
+            "team": row.team,
+            "depth": row.depth,
+            "status": status,
+            "hours": row.hours,
+            "draft_hours": row.draft_hours,
+            "entry_count": row.submitted + row.approved + row.draft,
+        })
+
+    return {"manager_id": manager.id, "week_ending": week_ending, "counts": counts, "members": members}
+
+
+async def approve_member_weeks(manager_email: str, member_weeks: List[MemberWeek], db: AsyncSession) -> Dict[str, Any]:
+    """
+    Approves the submitted entries of many (member, week) pairs with a single
+    UPDATE ... WHERE (team_member_id, week_ending) IN (...) in one transaction.
+    Pairs whose member does not report to the manager are left untouched.
+    """
+    manager = await get_user_by_email(manager_email, db)
+    pairs = list(dict.fromkeys((mw.member_id, mw.week_ending) for mw in member_weeks))
+    if not pairs:
+        return {"approved_entries": 0, "results": []}
+
+    requested_members = {member_id for member_id, _ in pairs}
+    reports = set((await db.execute(
+        subtree_member_ids(manager.id).where(TeamMemberClosure.descendant_id.in_(requested_members))
+    )).scalars())
+    allowed = [pair for pair in pairs if pair[0] in reports]
+
+    approved = Counter()
+    if allowed:
+        result = await db.execute(
+            update(TimeEntry)
+            .where(tuple_(TimeEntry.team_member_id, TimeEntry.week_ending).in_(allowed), _is_submitted)
+            .values(status=TimeEntryStatus.APPROVED.value)
+            .returning(TimeEntry.team_member_id, TimeEntry.week_ending)
+            .execution_options(synchronize_session=False)
+        )
+        approved.update(tuple(row) for row in result)
+        await db.execute(
+            update(Submission)
+            .where(
+                tuple_(Submission.team_member_id, Submission.week_ending).in_(allowed),
+                Submission.status == TimeEntryStatus.SUBMITTED.value
+            )
+            .values(status=TimeEntryStatus.APPROVED.value, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+
+    results = []
+    for member_id, week_ending in pairs:
+        if member_id not in reports:
+            outcome = ApprovalOutcomeStatus.NOT_A_REPORT
+        elif approved[(member_id, week_ending)]:
+            outcome = ApprovalOutcomeStatus.APPROVED
+        else:
+            outcome = ApprovalOutcomeStatus.NOTHING_TO_APPROVE
+        results.append({
+            "member_id": member_id,
+            "week_ending": week_ending,
+            "outcome": outcome,
+            "entries": approved[(member_id, week_ending)],
+        })
+    return {"approved_entries": sum(approved.values()), "results": results}
+
+
+async def approve_team_week(manager_email: str, week_ending: date, db: AsyncSession, team_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Approves every submitted entry of the manager's reports for one week, or
+    only of those in `team_id`, with one UPDATE. Returns one outcome per
+    member that had something approved.
+    """
+    manager = await get_user_by_email(manager_email, db)
+
+    members = subtree_member_ids(manager.id)
+    if team_id is not None:
+        members = members.join(TeamMember, TeamMember.id == TeamMemberClosure.descendant_id).where(TeamMember.team_id == team_id)
+
+    result = await db.execute(
+        update(TimeEntry)
+        .where(TimeEntry.week_ending == week_ending, TimeEntry.team_member_id.in_(members), _is_submitted)
+        .values(status=TimeEntryStatus.APPROVED.value)
+        .returning(TimeEntry.team_member_id)
+        .execution_options(synchronize_session=False)
+    )
+    approved = Counter(result.scalars())
+    if approved:
+        await db.execute(
+            update(Submission)
+            .where(
+                Submission.week_ending == week_ending,
+                Submission.team_member_id.in_(approved),
+                Submission.status == TimeEntryStatus.SUBMITTED.value
+            )
+            .values(status=TimeEntryStatus.APPROVED.value, updated_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+
+    results = [
+        {"member_id": member_id, "week_ending": week_ending, "outcome": ApprovalOutcomeStatus.APPROVED, "entries": count}
+        for member_id, count in sorted(approved.items())
+    ]
+    return {"approved_entries": sum(approved.values()), "results": results}
@@ -0,0 +1,142 @@
+# backend/query_inspector.py
+
+import logging
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# QUERY_DEBUG=1 counts the statements of every request (see QueryInspectorMiddleware)
+QUERY_DEBUG = os.environ.get("QUERY_DEBUG", "").lower() in ("1", "true", "yes")
+# A statement run this many times with different parameters is reported as a likely N+1
+REPEAT_THRESHOLD = int(os.environ.get("QUERY_DEBUG_REPEAT_THRESHOLD", "3"))
+
+# Counters active in the current context; nested blocks each see every statement
+_active_counters: ContextVar[Tuple["QueryCounter", ...]] = ContextVar("active_query_counters", default=())
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|:\w+|\$\d+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    The shape of a statement: whitespace collapsed and literals and IN lists
+    replaced by placeholders, so runs that differ only in values compare equal.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _IN_LIST.sub("IN (?)", statement)
+
+
+@dataclass
+class QueryCounter:
+    """
+    Records every SQL statement run in its context, on any engine:
+
+        with QueryCounter() as counter:
+            await services.submit_timesheet(data, db)
+        print(counter.count, counter.report())
+
+    `repeated()` lists statements run at least `repeat_threshold` times with
+    only their parameters changing, the usual sign of a query in a loop.
+    """
+    repeat_threshold: int = REPEAT_THRESHOLD
+    statements: List[Tuple[str, object]] = field(default_factory=list)
+    _token: Optional[object] = field(default=None, repr=False)
+
+    def __enter__(self):
+        self._token = _active_counters.set(_active_counters.get() + (self,))
+        return self
+
+    def __exit__(self, *exc):
+        _active_counters.reset(self._token)
+        self._token = None
+        return False
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """(normalized statement, times run) for likely N+1 patterns, most frequent first."""
+        shapes = Counter(normalize_statement(statement) for statement, _ in self.statements)
+        return [(shape, times) for shape, times in shapes.most_common() if times >= self.repeat_threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements"]
+        for shape, times in self.repeated():
+            lines.append(f"  {times}x {shape}")
+        return "\n".join(lines)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_counters.get():
+        counter.statements.append((statement, parameters))
+
+
+@contextmanager
+def assert_max_queries(budget: int, allow_repeats: bool = True):
+    """
+    Fails with AssertionError if the block runs more than `budget` statements
+    (or, with `allow_repeats=False`, any repeated statement):
+
+        with assert_max_queries(6):
+            await services.submit_timesheet(data, db)
+    """
+    with QueryCounter() as counter:
+        yield counter
+    problems = []
+    if counter.count > budget:
+        problems.append(f"{counter.count} statements run, budget is {budget}")
+    if not allow_repeats and counter.repeated():
+        problems.append("repeated statements found")
+    if problems:
+        statements = "\n".join(f"  {i}. {_WHITESPACE.sub(' ', statement)}" for i, (statement, _) in enumerate(counter.statements, 1))
+        raise AssertionError(f"{'; '.join(problems)}\n{counter.report()}\nStatements:\n{statements}")
+
+
+class QueryInspectorMiddleware:
+    """
+    Debug-mode ASGI middleware: counts the statements of every HTTP request,
+    returns the count in an `X-Query-Count` header (and `X-Query-Repeated`
+    with the number of repeated statements) and logs a warning with the
+    statements whenever a request repeats one.
+    Added by main.py when QUERY_DEBUG is set; not meant for production.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                repeated = counter.repeated()
+                headers = list(message.get("headers", []))
+                headers.append((b"x-query-count", str(counter.count).encode()))
+                headers.append((b"x-query-repeated", str(len(repeated)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with counter:
+            await self.app(scope, receive, send_wrapper)
+
+        repeated = counter.repeated()
+        if repeated:
+            logger.warning("Possible N+1 in %s %s: %s", scope["method"], scope["path"], counter.report())
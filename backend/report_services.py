@@ -0,0 +1,166 @@
+# backend/report_services.py
+
+import os
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Optional
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from sqlalchemy import select, func
+from database import TimeEntry, TeamMember, Team, Task, GroupActivity, Project, Portfolio, FunctionActivity
+from rollup import ROLLUP_STATUSES
+from schemas import WorkloadReportRequest
+from jobs import job_handler
+import etl_config as config
+
+# Rows fetched per round trip from the server-side cursor
+REPORT_BATCH_SIZE = 5000
+# Where finished workbooks are kept until they are downloaded or expire
+REPORTS_DIR = os.environ.get("REPORTS_DIR", os.path.join(tempfile.gettempdir(), "workload_reports"))
+# Workbooks older than this are removed when a new report starts
+REPORT_RETENTION = timedelta(hours=24)
+
+# The 'Form Responses 1' columns that etl.py imports, in sheet order
+FORM_RESPONSES_COLUMNS = [
+    'Timestamp', 'Email Address', 'Date', 'Project', 'Group Activity', 'Task',
+    'Team', 'Function Activity', 'Current Status', 'Hours', 'Notes',
+]
+SUMMARY_SHEET_NAME = 'Summary'
+SUMMARY_COLUMNS = ['Week Ending', 'Team', 'Project', 'Hours', 'Entries']
+
+
+def workload_report_select(
+    start_week: date,
+    end_week: date,
+    team_id: Optional[int] = None,
+    portfolio_id: Optional[int] = None,
+):
+    """
+    Submitted and approved time entries of the weeks ending `start_week` to
+    `end_week`, one row per entry in the column order of FORM_RESPONSES_COLUMNS,
+    optionally limited to one team (of the member) or one portfolio (of the project).
+    """
+    query = (
+        select(
+            TimeEntry.timestamp,
+            TeamMember.email,
+            TimeEntry.date_of_work,
+            Project.project_name,
+            GroupActivity.name.label("group_activity"),
+            Task.type,
+            Team.name.label("team"),
+            FunctionActivity.name.label("function_activity"),
+            Task.status,
+            TimeEntry.hours,
+            TimeEntry.notes,
+            TimeEntry.week_ending,
+        )
+        .select_from(TimeEntry)
+        .join(TeamMember, TeamMember.id == TimeEntry.team_member_id)
+        .outerjoin(Team, Team.id == TeamMember.team_id)
+        .outerjoin(Task, Task.id == TimeEntry.task_id)
+        .outerjoin(GroupActivity, GroupActivity.id == Task.group_activity_id)
+        .outerjoin(Project, Project.id == GroupActivity.project_id)
+        .outerjoin(FunctionActivity, FunctionActivity.id == Task.function_activity_id)
+        .where(
+            TimeEntry.week_ending >= start_week,
+            TimeEntry.week_ending <= end_week,
+            func.coalesce(TimeEntry.status, 'submitted').in_(ROLLUP_STATUSES)
+        )
+        .order_by(TimeEntry.week_ending, TeamMember.email, TimeEntry.date_of_work, TimeEntry.id)
+    )
+    if team_id is not None:
+        query = query.where(TeamMember.team_id == team_id)
+    if portfolio_id is not None:
+        query = query.where(Project.portfolio_id == portfolio_id)
+    return query
+
+
+def _header_row(sheet, columns):
+    bold = Font(bold=True)
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(sheet, value=name)
+        cell.font = bold
+        cells.append(cell)
+    return cells
+
+
+def write_workload_report(connection, query, path: str, batch_size: int = REPORT_BATCH_SIZE, progress=None) -> int:
+    """
+    Streams the rows of `query` (a workload_report_select) from a server-side
+    cursor on the sync `connection` into a write-only workbook at `path`:
+    a 'Form Responses 1' sheet in the layout etl.py reads, followed by a
+    summary of hours per week, team and project. Only the summary totals are
+    kept in memory. `progress(rows)` is called after every batch.
+    Returns the number of entry rows written.
+    """
+    workbook = Workbook(write_only=True)
+    responses = workbook.create_sheet(config.FORM_RESPONSES_SHEET_NAME)
+    responses.append(_header_row(responses, FORM_RESPONSES_COLUMNS))
+
+    totals = defaultdict(lambda: [0.0, 0])
+    rows_written = 0
+    result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+    for rows in result.partitions(batch_size):
+        for row in rows:
+            *form_row, week_ending = row
+            responses.append(form_row)
+            total = totals[(week_ending, row.team or 'Unassigned', row.project_name or 'Unassigned')]
+            total[0] += row.hours or 0.0
+            total[1] += 1
+        rows_written += len(rows)
+        if progress:
+            progress(rows_written)
+
+    summary = workbook.create_sheet(SUMMARY_SHEET_NAME)
+    summary.append(_header_row(summary, SUMMARY_COLUMNS))
+    for (week_ending, team, project), (hours, entries) in sorted(totals.items()):
+        summary.append([week_ending, team, project, round(hours, 2), entries])
+
+    workbook.save(path)
+    return rows_written
+
+
+def report_path(job_id: str) -> str:
+    """Where the workbook of a workload_report job is written."""
+    return os.path.join(REPORTS_DIR, f"workload_{job_id}.xlsx")
+
+
+def _purge_expired_reports():
+    """Removes workbooks older than REPORT_RETENTION."""
+    cutoff = time.time() - REPORT_RETENTION.total_seconds()
+    for entry in os.scandir(REPORTS_DIR):
+        if entry.name.endswith(".xlsx") and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+
+
+@job_handler("workload_report", params_model=WorkloadReportRequest, max_concurrent=2)
+def workload_report_job(ctx, params: WorkloadReportRequest):
+    """Builds a workload workbook; progress is reported per batch of rows."""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    _purge_expired_reports()
+    query = workload_report_select(
+        params.start_week, params.end_week, team_id=params.team_id, portfolio_id=params.portfolio_id
+    )
+    path = report_path(ctx.job_id)
+    with ctx.engine.connect() as connection:
+        total = connection.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+        try:
+            rows = write_workload_report(
+                connection, query, path,
+                progress=lambda rows_written: ctx.progress(rows_written / total, f"{rows_written} of {total} rows")
+            )
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+    return {
+        "rows": rows,
+        "filename": f"workload_{params.start_week}_{params.end_week}.xlsx",
+        # Served by GET /export/reports/{job_id}/download
+        "download_url": f"/export/reports/{ctx.job_id}/download",
+    }
@@ -0,0 +1,114 @@
+# backend/rollup.py
+
+import argparse
+import sys
+from datetime import date
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import TimeEntry, TeamMember, Task, GroupActivity, Project, WeeklyWorkloadRollup
+
+# Entry statuses counted as workload. ETL-imported entries have no status and are final.
+ROLLUP_STATUSES = ["submitted", "approved"]
+
+ROLLUP_COLUMNS = [
+    'week_ending', 'team_member_id', 'team_id', 'portfolio_id', 'project_id',
+    'group_activity_id', 'function_activity_id', 'type',
+    'hours', 'sun', 'mon', 'tue', 'wed', 'thu', 'entry_count',
+]
+
+
+def _rollup_select(*conditions):
+    """
+    Aggregates time entries to one row per week, member and activity, in the
+    column order of ROLLUP_COLUMNS. `conditions` narrow the entries aggregated.
+    """
+    dimensions = [
+        TimeEntry.week_ending,
+        TimeEntry.team_member_id,
+        TeamMember.team_id,
+        Project.portfolio_id,
+        GroupActivity.project_id,
+        Task.group_activity_id,
+        Task.function_activity_id,
+        Task.type,
+    ]
+    return (
+        select(
+            *dimensions,
+            func.coalesce(func.sum(TimeEntry.hours), 0.0),
+            func.coalesce(func.sum(TimeEntry.sun), 0.0),
+            func.coalesce(func.sum(TimeEntry.mon), 0.0),
+            func.coalesce(func.sum(TimeEntry.tue), 0.0),
+            func.coalesce(func.sum(TimeEntry.wed), 0.0),
+            func.coalesce(func.sum(TimeEntry.thu), 0.0),
+            func.count(TimeEntry.id),
+        )
+        .select_from(TimeEntry)
+        .join(TeamMember, TeamMember.id == TimeEntry.team_member_id)
+        .outerjoin(Task, Task.id == TimeEntry.task_id)
+        .outerjoin(GroupActivity, GroupActivity.id == Task.group_activity_id)
+        .outerjoin(Project, Project.id == GroupActivity.project_id)
+        .where(func.coalesce(TimeEntry.status, ROLLUP_STATUSES[0]).in_(ROLLUP_STATUSES), *conditions)
+        .group_by(*dimensions)
+    )
+
+
+def _insert_rollup(*conditions):
+    return insert(WeeklyWorkloadRollup).from_select(ROLLUP_COLUMNS, _rollup_select(*conditions))
+
+
+async def refresh_member_week(db: AsyncSession, team_member_id: int, week_ending: date):
+    """
+    Recomputes the rollup rows of one member-week from its time entries.
+    Runs in the caller's transaction and does not commit, so the rollup
+    changes together with the entries it summarises.
+    """
+    await db.execute(
+        delete(WeeklyWorkloadRollup).where(
+            WeeklyWorkloadRollup.team_member_id == team_member_id,
+            WeeklyWorkloadRollup.week_ending == week_ending,
+        )
+    )
+    await db.execute(
+        _insert_rollup(TimeEntry.team_member_id == team_member_id, TimeEntry.week_ending == week_ending)
+    )
+
+
+def rebuild_weekly_rollup(session):
+    """
+    Rebuilds the whole rollup table from time_entries in one transaction.
+    Used after bulk loads (the ETL) and to repair drift.
+    Returns the number of rollup rows written.
+    """
+    print("\n--- Rebuilding Weekly Workload Rollup ---")
+    try:
+        session.execute(delete(WeeklyWorkloadRollup))
+        session.execute(_insert_rollup())
+        session.commit()
+        count = session.scalar(select(func.count(WeeklyWorkloadRollup.id)))
+        print(f"--> Success: {count} rollup rows written.")
+        return count
+    except Exception as e:
+        print(f"--> ERROR: An error occurred while rebuilding the rollup: {e}")
+        session.rollback()
+        raise
+
+
+if __name__ == "__main__":
+    from etl_database_utils import get_session
+
+    parser = argparse.ArgumentParser(description="Maintain the weekly workload rollup table.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every rollup row from time_entries.")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        sys.exit(0)
+
+    session = get_session()
+    try:
+        rebuild_weekly_rollup(session)
+    except Exception:
+        sys.exit(1)
+    finally:
+        session.close()
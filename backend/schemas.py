@@ -1,8 +1,8 @@
 # backend/schemas.py
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import List, Optional
-from datetime import date
+from typing import List, Optional, Dict
+from datetime import date, datetime
 from enum import Enum
 
 # --- Base Schemas for Core Models ---
@@ -126,6 +126,13 @@ class TimeEntryStatus(str, Enum):
     SUBMITTED = "submitted"
     APPROVED = "approved"
     
+class CloneWeekRequest(BaseModel):
+    user_email: str
+    source_week: date
+    target_week: date
+    zero_hours: bool = False
+    overwrite: bool = False # Replace an existing draft of the target week
+
 class SubmissionRequest(BaseModel):
     user_email: str
     user_name: str
@@ -137,3 +144,175 @@ class SubmissionRequest(BaseModel):
     overwrite: bool = False
     status: TimeEntryStatus = TimeEntryStatus.SUBMITTED 
 
+
+# --- Analytics Schemas ---
+
+class WorkloadDimension(str, Enum):
+    """Dimensions the workload analytics can be broken down by."""
+    PORTFOLIO = "portfolio"
+    PROJECT = "project"
+    GROUP_ACTIVITY = "group_activity"
+    FUNCTION_ACTIVITY = "function_activity"
+
+class WorkloadBreakdownRow(BaseModel):
+    id: Optional[int] = None
+    name: str
+    week_ending: Optional[date] = None
+    hours: float
+    member_count: int
+
+class AnalyticsFilterOption(BaseModel):
+    id: int
+    name: str
+
+class AnalyticsFilters(BaseModel):
+    teams: List[AnalyticsFilterOption]
+    managers: List[AnalyticsFilterOption]
+
+# --- Manager Schemas ---
+
+class MemberWeekStatus(str, Enum):
+    """Where a member stands for one week: approved, submitted, draft-only or missing."""
+    APPROVED = "approved"
+    SUBMITTED = "submitted"
+    DRAFT = "draft"
+    MISSING = "missing"
+
+class TeamStatusRow(BaseModel):
+    member_id: int
+    full_name: Optional[str] = None
+    email: str
+    team: Optional[str] = None
+    depth: int
+    status: MemberWeekStatus
+    hours: float
+    draft_hours: float
+    entry_count: int
+
+class TeamStatusGrid(BaseModel):
+    manager_id: int
+    week_ending: date
+    counts: Dict[MemberWeekStatus, int]
+    members: List[TeamStatusRow]
+
+class MemberWeek(BaseModel):
+    member_id: int
+    week_ending: date
+
+class ApprovalRequest(BaseModel):
+    """Either explicit member-weeks, or a whole week of the manager's reports (optionally one team)."""
+    manager_email: str
+    member_weeks: List[MemberWeek] = []
+    week_ending: Optional[date] = None
+    team_id: Optional[int] = None
+
+class ApprovalOutcomeStatus(str, Enum):
+    APPROVED = "approved"
+    NOTHING_TO_APPROVE = "nothing_to_approve"
+    NOT_A_REPORT = "not_a_report"
+
+class ApprovalOutcome(BaseModel):
+    member_id: int
+    week_ending: date
+    outcome: ApprovalOutcomeStatus
+    entries: int = 0
+
+class ApprovalResponse(BaseModel):
+    approved_entries: int
+    results: List[ApprovalOutcome]
+
+# --- Submission Header Schemas ---
+
+class SubmissionHeader(BaseModel):
+    submission_id: str
+    week_ending: date
+    status: TimeEntryStatus
+    total_hours: float
+    meeting_hours: float
+    entry_count: int
+    created_at: datetime
+    updated_at: datetime
+    class Config:
+        from_attributes = True
+
+class SubmissionWeekStatus(BaseModel):
+    week_ending: date
+    status: MemberWeekStatus
+    submissions: List[SubmissionHeader]
+
+class SubmissionHistoryItem(SubmissionHeader):
+    # Only filled outside compact mode
+    tasks: Optional[List[dict]] = None
+    meetings: Optional[List[dict]] = None
+
+class SubmissionHistoryPage(BaseModel):
+    items: List[SubmissionHistoryItem]
+    next_cursor: Optional[str] = None
+
+# --- Export Schemas ---
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+class WorkloadReportRequest(BaseModel):
+    start_week: date
+    end_week: date
+    team_id: Optional[int] = None
+    portfolio_id: Optional[int] = None
+
+# --- Job Schemas ---
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobCreate(BaseModel):
+    job_type: str
+    params: Dict = {}
+
+class Job(BaseModel):
+    id: str
+    job_type: str
+    status: JobStatus
+    params: Dict
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
+    progress_detail: Optional[Dict] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    cancel_requested: bool
+    owner: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    class Config:
+        from_attributes = True
+
+class EtlRunRequest(BaseModel):
+    resume: bool = False
+    workers: Optional[int] = Field(None, ge=1)  # Defaults to ETL_WORKERS
+
+class JobTypeInfo(BaseModel):
+    job_type: str
+    max_concurrent: int
+
+# --- Slow Query Schemas ---
+
+class SlowQuery(BaseModel):
+    id: int
+    captured_at: datetime
+    duration_ms: float
+    route: Optional[str] = None
+    statement: str
+    parameters: Optional[str] = None
+    plan: Optional[str] = None
+    explain_error: Optional[str] = None
+    class Config:
+        from_attributes = True
@@ -1,15 +1,22 @@
 # backend/services.py
 
+import logging
 from datetime import datetime, timedelta
 import uuid
-from sqlalchemy import select, delete, func, desc
+import base64
+from sqlalchemy import select, insert, delete, func, desc, or_, and_, literal
+from sqlalchemy.types import Date, DateTime, Float, String
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
-from database import TimeEntry, TeamMember, Task, GroupActivity, FunctionActivity
-from schemas import SubmissionRequest
+from database import TimeEntry, TeamMember, Task, GroupActivity, FunctionActivity, Submission
+from schemas import SubmissionRequest, CloneWeekRequest, TimeEntryStatus, MemberWeekStatus
+from rollup import refresh_member_week
+from submission_headers import refresh_member_week_headers
 from typing import List, Dict, Any
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
 # ----------------------
 # Database Helper Methods
 # ----------------------
@@ -52,7 +59,7 @@ async def _create_task(task_type: str, description: str, status: str, group_acti
         )
         db.add(new_task)
         await db.flush()
-        print(f"✅ Created new task: '{description}' of type '{task_type}'") # <--- MODIFIED
+        logger.debug("Created new task %r of type %r", description, task_type)
         return new_task.id
 
     except ValueError as e:
@@ -104,12 +111,13 @@ async def delete_existing_entries(email: str, week_date, db: AsyncSession):
 
 def create_time_entry(team_member_id, task_id, date_of_work, hours, notes, submission_id, status: str, daily_mode: bool, daily_hours: dict, timestamp: datetime): # <--- MODIFIED
 
-    print("daily_hours:", daily_hours)
+    logger.debug("Creating time entry for task %s with daily hours %s", task_id, daily_hours)
     return TimeEntry(
         submission_id=submission_id,
         hours=hours,
         notes=notes,
         date_of_work=date_of_work,
+        week_ending=date_of_work, # Submissions are always dated on their week-ending Thursday
         task_id=task_id,
         team_member_id=team_member_id,
         status=status,
@@ -143,7 +151,7 @@ async def build_task_entries(data: SubmissionRequest, user, db: AsyncSession, su
                 entries.append(create_time_entry(user.id, task_id, data.week_date, total_hours, task.notes, submission_id, status, data.daily_mode, daily_hours, timestamp)) 
 
         except ValueError as e:
-            print(f"Skipping task due to error: {e}")
+            logger.warning("Skipping task due to error: %s", e)
             continue
     return entries
 
@@ -196,11 +204,105 @@ async def submit_timesheet(data: SubmissionRequest, db: AsyncSession):
         raise ValueError("No valid time entries to submit.")
 
     db.add_all(task_entries + meeting_entries)
+    await db.flush()
+
+    # Keep the workload rollup and the submission headers in step with this
+    # member-week in the same transaction.
+    # An overwrite also deletes entries dated in the previous week's Friday/Saturday.
+    refreshed_weeks = [data.week_date]
+    if data.overwrite:
+        refreshed_weeks.append(data.week_date - timedelta(days=7))
+    for week_ending in refreshed_weeks:
+        await refresh_member_week(db, user.id, week_ending)
+    await refresh_member_week_headers(db, user.id, refreshed_weeks)
+
     await db.commit()
 
     return {"success": True, "message": "Timesheet submitted successfully."}
 
 
+class WeekNotEmptyError(ValueError):
+    """The target week of a clone already holds entries that must not be replaced."""
+
+
+async def clone_week(data: CloneWeekRequest, db: AsyncSession):
+    """
+    Copies the submitted/approved entries of `source_week` into `target_week` as
+    a new draft with one INSERT ... SELECT, optionally with all hours zeroed.
+    A target week that already has entries is refused, except for a draft when
+    `overwrite` is set, which is replaced.
+    """
+    if data.source_week == data.target_week:
+        raise ValueError("Source and target week must differ.")
+
+    timestamp = datetime.now()
+    submission_id = str(uuid.uuid4())
+    user = await get_user_by_email(data.user_email, db)
+
+    existing = await db.execute(
+        select(func.coalesce(TimeEntry.status, TimeEntryStatus.SUBMITTED.value), func.count(TimeEntry.id))
+        .where(TimeEntry.team_member_id == user.id, TimeEntry.week_ending == data.target_week)
+        .group_by(func.coalesce(TimeEntry.status, TimeEntryStatus.SUBMITTED.value))
+    )
+    existing = dict(existing.all())
+    if set(existing) - {TimeEntryStatus.DRAFT.value}:
+        raise WeekNotEmptyError(f"The week ending {data.target_week} has already been submitted.")
+    if existing and not data.overwrite:
+        raise WeekNotEmptyError(f"The week ending {data.target_week} already has a draft. Set overwrite to replace it.")
+    if existing:
+        await db.execute(
+            delete(TimeEntry).where(
+                TimeEntry.team_member_id == user.id,
+                TimeEntry.week_ending == data.target_week,
+                TimeEntry.status == TimeEntryStatus.DRAFT.value
+            )
+        )
+
+    def hours(column):
+        return literal(0.0, Float) if data.zero_hours else column
+
+    source = select(
+        hours(TimeEntry.hours),
+        TimeEntry.notes,
+        literal(datetime.combine(data.target_week, datetime.min.time()), DateTime),
+        literal(data.target_week, Date),
+        literal(submission_id, String),
+        literal(timestamp, DateTime),
+        literal(TimeEntryStatus.DRAFT.value, String),
+        TimeEntry.daily_mode,
+        hours(TimeEntry.sun), hours(TimeEntry.mon), hours(TimeEntry.tue), hours(TimeEntry.wed), hours(TimeEntry.thu),
+        TimeEntry.task_id,
+        TimeEntry.team_member_id,
+    ).where(
+        TimeEntry.team_member_id == user.id,
+        TimeEntry.week_ending == data.source_week,
+        func.coalesce(TimeEntry.status, TimeEntryStatus.SUBMITTED.value).in_(
+            [TimeEntryStatus.SUBMITTED.value, TimeEntryStatus.APPROVED.value]
+        )
+    )
+    result = await db.execute(
+        insert(TimeEntry).from_select(
+            ['hours', 'notes', 'date_of_work', 'week_ending', 'submission_id', 'timestamp', 'status',
+             'daily_mode', 'sun', 'mon', 'tue', 'wed', 'thu', 'task_id', 'team_member_id'],
+            source
+        )
+    )
+    if not result.rowcount:
+        await db.rollback()
+        raise ValueError(f"No submitted entries found for the week ending {data.source_week}.")
+
+    # Drafts are not part of the workload rollup, so only the headers need refreshing
+    await refresh_member_week_headers(db, user.id, [data.target_week])
+    await db.commit()
+
+    return {
+        "success": True,
+        "message": f"Copied {result.rowcount} entries into a draft for the week ending {data.target_week}.",
+        "submission_id": submission_id,
+        "entry_count": result.rowcount,
+    }
+
+
 async def _get_entries_for_week(
     user_email: str,
     week_date: date,
@@ -237,75 +339,119 @@ async def _get_entries_for_week(
         result = await session.execute(query)
         entries = result.scalars().all()
 
-        # Prepare dictionaries to group entries by unique task/meeting and day
-        # This will allow reconstruction of the DataFrame format expected by the frontend.
-        grouped_tasks = {}
-        grouped_meetings = {}
+        return _shape_week_entries(entries)
+    except Exception as e:
+        logger.exception("Error fetching entries for week")
+        return {"tasks": [], "meetings": []}
 
-        for entry in entries:
-            # Access related data via the 'task' relationship. Handle cases where task might be None.
-            if not entry.task:
-                continue
 
-            task_obj = entry.task
-            group_activity_obj = task_obj.group_activity
-            function_activity_obj = task_obj.function_activity
+def _shape_week_entries(entries: List[TimeEntry]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Groups time entries (with task, group and function activity loaded) into the
+    task and meeting rows of the submission form's DataFrames.
+    """
+    # Prepare dictionaries to group entries by unique task/meeting and day
+    # This will allow reconstruction of the DataFrame format expected by the frontend.
+    grouped_tasks = {}
+    grouped_meetings = {}
+
+    for entry in entries:
+        # Access related data via the 'task' relationship. Handle cases where task might be None.
+        if not entry.task:
+            continue
 
-            # Extract names, defaulting to "N/A" if relationship is missing or name is empty
-            group_activity_name = group_activity_obj.name if group_activity_obj and group_activity_obj.name else "N/A"
-            function_activity_name = function_activity_obj.name if function_activity_obj and function_activity_obj.name else "N/A"
-            task_status = task_obj.status if task_obj.status else "N/A"
+        task_obj = entry.task
+        group_activity_obj = task_obj.group_activity
+        function_activity_obj = task_obj.function_activity
+
+        # Extract names, defaulting to "N/A" if relationship is missing or name is empty
+        group_activity_name = group_activity_obj.name if group_activity_obj and group_activity_obj.name else "N/A"
+        function_activity_name = function_activity_obj.name if function_activity_obj and function_activity_obj.name else "N/A"
+        task_status = task_obj.status if task_obj.status else "N/A"
+
+        task_description = task_obj.description if task_obj.description else "N/A" # <--- MODIFIED
+        task_type = task_obj.type if task_obj.type else "N/A" 
+
+        # Determine if the entry is for a 'meeting' or a regular 'task'
+        # based on the Task.name, as implied by build_meeting_entries.
+        is_meeting = (task_type.lower() == 'meeting') # <--- MODIFIED
+
+        # Create a unique key for grouping. For tasks, include status. For meetings, use descriptive name.
+        if is_meeting:
+            key = (group_activity_name, function_activity_name, task_description, entry.notes) # <--- MODIFIED
+            target_dict = grouped_meetings
+        else:
+            key = (group_activity_name, function_activity_name, task_status, task_description, entry.notes) # <--- MODIFIED
+            target_dict = grouped_tasks
+
+        if key not in target_dict:
+            # Initialize the entry structure for this unique task/meeting
+            new_entry_data = {
+                "Group Activity": group_activity_name,
+                "Function Activity": function_activity_name,
+                "Total Weekly Hours": 0.0,
+                "Notes": entry.notes,
+                "daily_mode": entry.daily_mode,
+                "sun": entry.sun,
+                "mon": entry.mon,
+                "tue": entry.tue,
+                "wed": entry.wed,
+                "thu": entry.thu,
+            }
+            if is_meeting:
+                new_entry_data["Meeting Description"] = task_description # <--- MODIFIED
+            else:
+                new_entry_data["Task Description"] = task_description # <--- MODIFIED
+                new_entry_data["Status"] = task_status
+            target_dict[key] = new_entry_data
+        else:
+            # Add hours to the correct day and update total weekly hours
+            day_name = entry.date_of_work.strftime('%a').lower()  # 'sun', 'mon', 'tue', 'wed', 'thu' etc.
+            if day_name in target_dict[key]:  # Check if the day column exists
+                target_dict[key][day_name] += entry.hours
+        target_dict[key]["Total Weekly Hours"] += entry.hours
 
-            task_description = task_obj.description if task_obj.description else "N/A" # <--- MODIFIED
-            task_type = task_obj.type if task_obj.type else "N/A" 
+    # Convert grouped dictionaries to lists of dictionaries for the frontend DataFrames
+    final_tasks_data = list(grouped_tasks.values())
+    final_meetings_data = list(grouped_meetings.values())
 
-            # Determine if the entry is for a 'meeting' or a regular 'task'
-            # based on the Task.name, as implied by build_meeting_entries.
-            is_meeting = (task_type.lower() == 'meeting') # <--- MODIFIED
+    return {"tasks": final_tasks_data, "meetings": final_meetings_data}
 
-            # Create a unique key for grouping. For tasks, include status. For meetings, use descriptive name.
-            if is_meeting:
-                key = (group_activity_name, function_activity_name, task_description, entry.notes) # <--- MODIFIED
-                target_dict = grouped_meetings
-            else:
-                key = (group_activity_name, function_activity_name, task_status, task_description, entry.notes) # <--- MODIFIED
-                target_dict = grouped_tasks
-
-            if key not in target_dict:
-                # Initialize the entry structure for this unique task/meeting
-                new_entry_data = {
-                    "Group Activity": group_activity_name,
-                    "Function Activity": function_activity_name,
-                    "Total Weekly Hours": 0.0,
-                    "Notes": entry.notes,
-                    "daily_mode": entry.daily_mode,
-                    "sun": entry.sun,
-                    "mon": entry.mon,
-                    "tue": entry.tue,
-                    "wed": entry.wed,
-                    "thu": entry.thu,
-                }
-                if is_meeting:
-                    new_entry_data["Meeting Description"] = task_description # <--- MODIFIED
-                else:
-                    new_entry_data["Task Description"] = task_description # <--- MODIFIED
-                    new_entry_data["Status"] = task_status
-                target_dict[key] = new_entry_data
-            else:
-                # Add hours to the correct day and update total weekly hours
-                day_name = entry.date_of_work.strftime('%a').lower()  # 'sun', 'mon', 'tue', 'wed', 'thu' etc.
-                if day_name in target_dict[key]:  # Check if the day column exists
-                    target_dict[key][day_name] += entry.hours
-            target_dict[key]["Total Weekly Hours"] += entry.hours
 
-        # Convert grouped dictionaries to lists of dictionaries for the frontend DataFrames
-        final_tasks_data = list(grouped_tasks.values())
-        final_meetings_data = list(grouped_meetings.values())
+async def get_submissions_for_range(
+    user_email: str,
+    start_week: date,
+    end_week: date,
+    statuses: List[str],
+    session: AsyncSession
+) -> Dict[date, Dict[str, List[Dict[str, Any]]]]:
+    """
+    Loads every week ending between `start_week` and `end_week` (inclusive) with
+    one query on the (team_member_id, week_ending) index, and returns each
+    week shaped like `load-week`, keyed by week_ending. Weeks without entries are omitted.
+    """
+    user = await get_user_by_email(user_email, session)
+
+    result = await session.execute(
+        select(TimeEntry)
+        .where(
+            TimeEntry.team_member_id == user.id,
+            TimeEntry.week_ending >= start_week,
+            TimeEntry.week_ending <= end_week,
+            TimeEntry.status.in_(statuses)
+        )
+        .options(
+            joinedload(TimeEntry.task).joinedload(Task.group_activity),
+            joinedload(TimeEntry.task).joinedload(Task.function_activity)
+        )
+        .order_by(TimeEntry.week_ending, TimeEntry.id)
+    )
+
+    entries_by_week = {}
+    for entry in result.scalars().all():
+        entries_by_week.setdefault(entry.week_ending, []).append(entry)
+    return {week: _shape_week_entries(entries) for week, entries in entries_by_week.items()}
 
-        return {"tasks": final_tasks_data, "meetings": final_meetings_data}
-    except Exception as e:
-        print(f"Error fetching entries for week: {e}")
-        return {"tasks": [], "meetings": []}
 
 async def get_submission_for_week(user_email: str, week_date: date, session: AsyncSession):
     """
@@ -347,3 +493,116 @@ async def get_draft_submission_for_week(user_email: str, session: AsyncSession)
     # Step 4: Add the week_date to the response so the frontend knows which date to set.
     submission_data["week_date"] = week_ending_date.strftime('%Y-%m-%d')
     return submission_data
+
+
+# ----------------------
+# Submission Headers
+# ----------------------
+
+def member_week_status(submitted: int, approved: int, draft: int) -> MemberWeekStatus:
+    """Overall status of a member-week from how much of it is submitted, approved or draft."""
+    if submitted:
+        return MemberWeekStatus.SUBMITTED
+    if approved:
+        return MemberWeekStatus.APPROVED
+    if draft:
+        return MemberWeekStatus.DRAFT
+    return MemberWeekStatus.MISSING
+
+
+class InvalidCursorError(ValueError):
+    """A history cursor that was not produced by get_submission_history."""
+
+
+def _encode_history_cursor(header: Submission) -> str:
+    """Opaque cursor pointing just past `header` in (week_ending, id) order."""
+    return base64.urlsafe_b64encode(f"{header.week_ending.isoformat()}|{header.id}".encode()).decode()
+
+
+def _decode_history_cursor(cursor: str):
+    try:
+        week_ending, header_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        week_ending, header_id = date.fromisoformat(week_ending), int(header_id)
+    except Exception:
+        raise InvalidCursorError("Invalid history cursor.")
+    # Submission.id is a 32-bit integer; anything else would fail in the database instead
+    if not 0 < header_id < 2 ** 31:
+        raise InvalidCursorError("Invalid history cursor.")
+    return week_ending, header_id
+
+
+async def get_submission_history(
+    user_email: str,
+    session: AsyncSession,
+    limit: int = 20,
+    cursor: str = None,
+    compact: bool = False
+) -> Dict[str, Any]:
+    """
+    A page of a user's submissions, newest week first, using keyset pagination
+    on (week_ending, id) so every page is one index range scan.
+    Compact pages hold only the header totals; full pages also carry each
+    submission's tasks and meetings, shaped like `load-week`, fetched with one
+    query for the whole page.
+    """
+    user = await get_user_by_email(user_email, session)
+
+    query = (
+        select(Submission)
+        .where(Submission.team_member_id == user.id)
+        .order_by(desc(Submission.week_ending), desc(Submission.id))
+        .limit(limit + 1)
+    )
+    if cursor:
+        week_ending, header_id = _decode_history_cursor(cursor)
+        query = query.where(or_(
+            Submission.week_ending < week_ending,
+            and_(Submission.week_ending == week_ending, Submission.id < header_id)
+        ))
+
+    headers = (await session.execute(query)).scalars().all()
+    next_cursor = _encode_history_cursor(headers[limit - 1]) if len(headers) > limit else None
+    headers = headers[:limit]
+
+    items = [
+        {c: getattr(h, c) for c in ("submission_id", "week_ending", "status", "total_hours",
+                                    "meeting_hours", "entry_count", "created_at", "updated_at")}
+        for h in headers
+    ]
+    if not compact and headers:
+        result = await session.execute(
+            select(TimeEntry)
+            .where(TimeEntry.submission_id.in_([h.submission_id for h in headers]))
+            .options(
+                joinedload(TimeEntry.task).joinedload(Task.group_activity),
+                joinedload(TimeEntry.task).joinedload(Task.function_activity)
+            )
+        )
+        entries_by_submission = {}
+        for entry in result.scalars().all():
+            entries_by_submission.setdefault(entry.submission_id, []).append(entry)
+        for item in items:
+            item.update(_shape_week_entries(entries_by_submission.get(item["submission_id"], [])))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def get_submission_status(user_email: str, week_date: date, session: AsyncSession) -> Dict[str, Any]:
+    """The status of a user's week and the submission headers behind it."""
+    user = await get_user_by_email(user_email, session)
+    result = await session.execute(
+        select(Submission)
+        .where(Submission.team_member_id == user.id, Submission.week_ending == week_date)
+        .order_by(desc(Submission.updated_at))
+    )
+    headers = result.scalars().all()
+    statuses = [h.status for h in headers]
+    return {
+        "week_ending": week_date,
+        "status": member_week_status(
+            statuses.count(TimeEntryStatus.SUBMITTED.value),
+            statuses.count(TimeEntryStatus.APPROVED.value),
+            statuses.count(TimeEntryStatus.DRAFT.value),
+        ),
+        "submissions": headers,
+    }
@@ -0,0 +1,177 @@
+# backend/slow_query_log.py
+
+import logging
+import os
+import queue
+import random
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy import text
+from database import SlowQuery
+import etl_database_utils
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Statements of a request slower than this are logged and stored
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("SLOW_QUERY_THRESHOLD_MS", "500"))
+# Share of slow plain SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS); 0 disables plan capture
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1"))
+# EXPLAIN ANALYZE runs the query again, so it gets a hard time limit
+EXPLAIN_TIMEOUT_MS = int(os.environ.get("SLOW_QUERY_EXPLAIN_TIMEOUT_MS", "10000"))
+# Slow queries waiting to be recorded; more than this are logged but not stored
+QUEUE_SIZE = 100
+MAX_PARAMETERS_LENGTH = 2000
+
+_ASYNCPG_PARAM = re.compile(r"\$(\d+)")
+
+
+@dataclass
+class _SlowStatement:
+    captured_at: datetime
+    duration_ms: float
+    route: str
+    statement: str
+    parameters: object
+    explain: bool
+
+
+def _format_parameters(parameters) -> str:
+    formatted = repr(parameters)
+    if len(formatted) > MAX_PARAMETERS_LENGTH:
+        formatted = formatted[:MAX_PARAMETERS_LENGTH] + "..."
+    return formatted
+
+
+def _should_explain(statement: str) -> bool:
+    # Plain SELECTs only: a WITH may hold an INSERT/UPDATE/DELETE, which
+    # EXPLAIN ANALYZE would really run a second time
+    head = statement.lstrip().upper()
+    return (
+        random.random() < SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        and head.startswith("SELECT")
+        and "FOR UPDATE" not in head
+    )
+
+
+def _to_pyformat(statement: str, parameters):
+    """
+    Rewrites an asyncpg statement ($1, $2, ...) for psycopg2 (%s) so it can be
+    explained on a sync connection. Statements without $n markers (pyformat,
+    or positional %s) pass through unchanged.
+    """
+    order = [int(n) - 1 for n in _ASYNCPG_PARAM.findall(statement)]
+    if not order or not isinstance(parameters, (list, tuple)):
+        return statement, parameters
+    statement = _ASYNCPG_PARAM.sub("%s", statement.replace("%", "%%"))
+    return statement, tuple(parameters[i] for i in order)
+
+
+def _on_statement(statement, parameters, executemany, seconds):
+    duration_ms = seconds * 1000
+    if duration_ms < SLOW_QUERY_THRESHOLD_MS:
+        return
+    # Only service queries of a request; the ETL and jobs have their own metrics,
+    # and this keeps the recorder from logging its own EXPLAIN runs
+    route = metrics.current_route()
+    if route is None:
+        return
+
+    logger.warning("Slow query (%.0f ms) in %s: %s; parameters: %s", duration_ms, route, statement, _format_parameters(parameters))
+    recorder.record(_SlowStatement(
+        captured_at=datetime.now(),
+        duration_ms=duration_ms,
+        route=route,
+        statement=statement,
+        parameters=parameters,
+        explain=not executemany and _should_explain(statement),
+    ))
+
+
+# Uses the statement timing of the metrics module rather than timing every statement twice
+metrics.add_statement_listener(_on_statement)
+
+
+class SlowQueryRecorder:
+    """
+    Stores slow queries in the slow_queries table from a background thread,
+    so requests never wait on it. For a sample of plain SELECTs it also captures
+    `EXPLAIN (ANALYZE, BUFFERS)` on its own connection (PostgreSQL only);
+    the plans can be browsed at GET /admin/slow-queries.
+    """
+
+    def __init__(self):
+        self.engine = None
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = None
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        self.engine = etl_database_utils.get_engine()
+        self._thread = threading.Thread(target=self._work, name="slow-query-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.started:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.engine.dispose()
+
+    def record(self, slow: _SlowStatement):
+        if not self.started:
+            return
+        try:
+            self._queue.put_nowait(slow)
+        except queue.Full:
+            logger.warning("Slow query queue is full; not storing the query")
+
+    def _work(self):
+        while True:
+            slow = self._queue.get()
+            if slow is None:
+                return
+            try:
+                self._store(slow)
+            except Exception:
+                logger.exception("Could not store a slow query")
+
+    def _store(self, slow: _SlowStatement):
+        plan = explain_error = None
+        if slow.explain and self.engine.dialect.name == "postgresql":
+            try:
+                plan = self._explain(slow.statement, slow.parameters)
+            except Exception as e:
+                explain_error = str(e)
+
+        with self.engine.begin() as connection:
+            connection.execute(SlowQuery.__table__.insert().values(
+                captured_at=slow.captured_at,
+                duration_ms=slow.duration_ms,
+                route=slow.route,
+                statement=slow.statement,
+                parameters=_format_parameters(slow.parameters),
+                plan=plan,
+                explain_error=explain_error,
+            ))
+
+    def _explain(self, statement: str, parameters) -> str:
+        statement, parameters = _to_pyformat(statement, parameters)
+        with self.engine.connect() as connection:
+            try:
+                connection.execute(text(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}"))
+                rows = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                return "\n".join(row[0] for row in rows)
+            finally:
+                # ANALYZE really runs the statement; never keep anything it did
+                connection.rollback()
+
+
+# The recorder of this process; started and stopped with the app
+recorder = SlowQueryRecorder()
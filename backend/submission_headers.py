@@ -0,0 +1,107 @@
+# backend/submission_headers.py
+
+import argparse
+import sys
+from datetime import date
+from typing import Iterable
+from sqlalchemy import select, insert, delete, func, case, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import TimeEntry, Task, Submission
+from schemas import TimeEntryStatus
+
+HEADER_COLUMNS = [
+    'submission_id', 'team_member_id', 'week_ending', 'status',
+    'total_hours', 'meeting_hours', 'entry_count', 'created_at', 'updated_at',
+]
+
+# Rank of an entry's status for the header; the highest rank in a submission wins,
+# in the precedence of services.member_week_status. ETL-imported entries have no
+# status and count as submitted.
+_STATUS_RANK = case(
+    (or_(TimeEntry.status == TimeEntryStatus.SUBMITTED.value, TimeEntry.status.is_(None)), 3),
+    (TimeEntry.status == TimeEntryStatus.APPROVED.value, 2),
+    else_=1,
+)
+
+
+def _header_select(*conditions):
+    """
+    One header row per submission_id, in the column order of HEADER_COLUMNS.
+    A submission shows as submitted while any of its entries still awaits
+    approval, as approved once none does, and as draft if it only has drafts.
+    """
+    rank = func.max(_STATUS_RANK)
+    return (
+        select(
+            TimeEntry.submission_id,
+            TimeEntry.team_member_id,
+            TimeEntry.week_ending,
+            case(
+                (rank == 3, TimeEntryStatus.SUBMITTED.value),
+                (rank == 2, TimeEntryStatus.APPROVED.value),
+                else_=TimeEntryStatus.DRAFT.value,
+            ),
+            func.coalesce(func.sum(TimeEntry.hours), 0.0),
+            func.coalesce(func.sum(case((Task.type == 'Meeting', TimeEntry.hours), else_=0.0)), 0.0),
+            func.count(TimeEntry.id),
+            func.coalesce(func.min(TimeEntry.timestamp), func.now()),
+            func.coalesce(func.max(TimeEntry.timestamp), func.now()),
+        )
+        .select_from(TimeEntry)
+        .outerjoin(Task, Task.id == TimeEntry.task_id)
+        .where(TimeEntry.team_member_id.is_not(None), *conditions)
+        .group_by(TimeEntry.submission_id, TimeEntry.team_member_id, TimeEntry.week_ending)
+    )
+
+
+def insert_headers(*conditions):
+    """INSERT ... SELECT of the headers of the entries matching `conditions`."""
+    return insert(Submission).from_select(HEADER_COLUMNS, _header_select(*conditions))
+
+
+async def refresh_member_week_headers(db: AsyncSession, team_member_id: int, weeks: Iterable[date]):
+    """
+    Rewrites the headers of a member's submissions in `weeks` from their time
+    entries. Runs in the caller's transaction and does not commit.
+    """
+    weeks = list(weeks)
+    await db.execute(
+        delete(Submission).where(Submission.team_member_id == team_member_id, Submission.week_ending.in_(weeks))
+    )
+    await db.execute(insert_headers(TimeEntry.team_member_id == team_member_id, TimeEntry.week_ending.in_(weeks)))
+
+
+def rebuild_submission_headers(session):
+    """Recomputes every submission header from time_entries in one transaction. Returns the header count."""
+    print("\n--- Rebuilding Submission Headers ---")
+    try:
+        session.execute(delete(Submission))
+        session.execute(insert_headers())
+        session.commit()
+        count = session.scalar(select(func.count(Submission.id)))
+        print(f"--> Success: {count} submission headers written.")
+        return count
+    except Exception as e:
+        print(f"--> ERROR: An error occurred while rebuilding submission headers: {e}")
+        session.rollback()
+        raise
+
+
+if __name__ == "__main__":
+    from etl_database_utils import get_session
+
+    parser = argparse.ArgumentParser(description="Maintain the submissions header table.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every header from time_entries.")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        sys.exit(0)
+
+    session = get_session()
+    try:
+        rebuild_submission_headers(session)
+    except Exception:
+        sys.exit(1)
+    finally:
+        session.close()
@@ -0,0 +1,34 @@
+# backend/tests/conftest.py
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from database import Base
+from query_inspector import QueryCounter
+
+
+@pytest.fixture
+def query_counter():
+    """A QueryCounter active for the whole test; assert on `query_counter.count` or `query_counter.repeated()`."""
+    with QueryCounter() as counter:
+        yield counter
+
+
+@pytest.fixture
+def session_factory():
+    """Async sessions on a fresh in-memory SQLite database with every table created."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def _create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(_create_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
@@ -0,0 +1,155 @@
+# backend/tests/test_approvals.py
+
+import asyncio
+from datetime import date
+
+from sqlalchemy import select
+
+import manager_services
+import rollup
+import services
+from database import Team, TeamMember, GroupActivity, FunctionActivity, TimeEntry, Submission, WeeklyWorkloadRollup
+from schemas import ApprovalOutcomeStatus, MemberWeek, SubmissionRequest, TaskEntry, TimeEntryStatus
+
+WEEK = date(2025, 1, 16)
+DRAFT_WEEK = date(2025, 1, 23)
+
+
+def _submission(email: str, team: str, week: date, status=TimeEntryStatus.SUBMITTED) -> SubmissionRequest:
+    return SubmissionRequest(
+        user_email=email,
+        user_name=email,
+        user_team=team,
+        week_date=week,
+        daily_mode=False,
+        tasks=[TaskEntry(**{
+            "Task Description": f"Work of {email}",
+            "Group Activity": "Activity",
+            "Function Activity": "Function",
+            "Status": "In Progress",
+            "Total Weekly Hours": 8,
+        })],
+        meetings=[],
+        status=status,
+    )
+
+
+async def _seed(db):
+    """
+    manager <- lead <- dev, plus an outsider with no manager. Lead and dev are
+    in different teams. Lead, dev and the outsider submit WEEK; dev also has
+    only a draft in DRAFT_WEEK. Returns the members by name.
+    """
+    teams = [Team(name="Platform"), Team(name="Apps")]
+    db.add_all(teams)
+    await db.flush()
+    db.add_all([GroupActivity(name="Activity")] + [FunctionActivity(name="Function", team_id=team.id) for team in teams])
+    members = {}
+    for name, team, manager in [("manager", teams[0], None), ("lead", teams[0], "manager"),
+                                ("dev", teams[1], "lead"), ("outsider", teams[1], None)]:
+        member = TeamMember(
+            email=f"{name}@example.com", full_name=name, team_id=team.id,
+            manager_id=members[manager].id if manager else None,
+        )
+        db.add(member)
+        await db.flush()
+        members[name] = member
+    await db.commit()
+
+    for name, team in [("lead", "Platform"), ("dev", "Apps"), ("outsider", "Apps")]:
+        await services.submit_timesheet(_submission(f"{name}@example.com", team, WEEK), db)
+    await services.submit_timesheet(_submission("dev@example.com", "Apps", DRAFT_WEEK, TimeEntryStatus.DRAFT), db)
+    return members
+
+
+async def _entry_statuses(db, member_id, week):
+    return set(await db.scalars(
+        select(TimeEntry.status).where(TimeEntry.team_member_id == member_id, TimeEntry.week_ending == week)
+    ))
+
+
+async def _header_statuses(db, member_id, week):
+    return set(await db.scalars(
+        select(Submission.status).where(Submission.team_member_id == member_id, Submission.week_ending == week)
+    ))
+
+
+async def _rollup_rows(db):
+    rows = await db.execute(select(*[getattr(WeeklyWorkloadRollup, column) for column in rollup.ROLLUP_COLUMNS]))
+    return sorted(rows.all())
+
+
+async def _assert_rollup_is_current(db, members):
+    """Approved hours still count as workload: the rollup equals a fresh recomputation."""
+    before = await _rollup_rows(db)
+    for member in members.values():
+        for week in (WEEK, DRAFT_WEEK):
+            await rollup.refresh_member_week(db, member.id, week)
+    assert await _rollup_rows(db) == before
+
+
+def test_approve_member_weeks_outcomes(session_factory):
+    async def _run():
+        async with session_factory() as db:
+            m = await _seed(db)
+            rollup_before = await _rollup_rows(db)
+
+            response = await manager_services.approve_member_weeks("manager@example.com", [
+                MemberWeek(member_id=m["dev"].id, week_ending=WEEK),
+                MemberWeek(member_id=m["dev"].id, week_ending=DRAFT_WEEK),
+                MemberWeek(member_id=m["outsider"].id, week_ending=WEEK),
+                MemberWeek(member_id=m["manager"].id, week_ending=WEEK),
+            ], db)
+
+            outcomes = {(r["member_id"], r["week_ending"]): (r["outcome"], r["entries"]) for r in response["results"]}
+            assert outcomes == {
+                # A report of a report is in the manager's subtree
+                (m["dev"].id, WEEK): (ApprovalOutcomeStatus.APPROVED, 1),
+                (m["dev"].id, DRAFT_WEEK): (ApprovalOutcomeStatus.NOTHING_TO_APPROVE, 0),
+                (m["outsider"].id, WEEK): (ApprovalOutcomeStatus.NOT_A_REPORT, 0),
+                # Managers cannot approve themselves
+                (m["manager"].id, WEEK): (ApprovalOutcomeStatus.NOT_A_REPORT, 0),
+            }
+            assert response["approved_entries"] == 1
+
+            assert await _entry_statuses(db, m["dev"].id, WEEK) == {TimeEntryStatus.APPROVED.value}
+            assert await _header_statuses(db, m["dev"].id, WEEK) == {TimeEntryStatus.APPROVED.value}
+            # Drafts and weeks outside the subtree are left as they were
+            assert await _entry_statuses(db, m["dev"].id, DRAFT_WEEK) == {TimeEntryStatus.DRAFT.value}
+            assert await _header_statuses(db, m["dev"].id, DRAFT_WEEK) == {TimeEntryStatus.DRAFT.value}
+            assert await _entry_statuses(db, m["outsider"].id, WEEK) == {TimeEntryStatus.SUBMITTED.value}
+            assert await _header_statuses(db, m["outsider"].id, WEEK) == {TimeEntryStatus.SUBMITTED.value}
+            assert await _entry_statuses(db, m["lead"].id, WEEK) == {TimeEntryStatus.SUBMITTED.value}
+
+            assert await _rollup_rows(db) == rollup_before
+            await _assert_rollup_is_current(db, m)
+
+    asyncio.run(_run())
+
+
+def test_approve_team_week_stays_in_the_subtree(session_factory):
+    async def _run():
+        async with session_factory() as db:
+            m = await _seed(db)
+
+            # Only the Apps team: dev, but not the outsider who is not a report
+            apps = await db.scalar(select(Team.id).where(Team.name == "Apps"))
+            response = await manager_services.approve_team_week("manager@example.com", WEEK, db, team_id=apps)
+            assert [(r["member_id"], r["entries"]) for r in response["results"]] == [(m["dev"].id, 1)]
+            assert await _entry_statuses(db, m["lead"].id, WEEK) == {TimeEntryStatus.SUBMITTED.value}
+
+            # The whole subtree: the lead is left
+            response = await manager_services.approve_team_week("manager@example.com", WEEK, db)
+            assert [(r["member_id"], r["outcome"]) for r in response["results"]] == [(m["lead"].id, ApprovalOutcomeStatus.APPROVED)]
+            for name in ("lead", "dev"):
+                assert await _entry_statuses(db, m[name].id, WEEK) == {TimeEntryStatus.APPROVED.value}
+                assert await _header_statuses(db, m[name].id, WEEK) == {TimeEntryStatus.APPROVED.value}
+            assert await _entry_statuses(db, m["outsider"].id, WEEK) == {TimeEntryStatus.SUBMITTED.value}
+            assert await _header_statuses(db, m["outsider"].id, WEEK) == {TimeEntryStatus.SUBMITTED.value}
+
+            # A lead approves only below themselves, and nothing is left to approve
+            response = await manager_services.approve_team_week("lead@example.com", WEEK, db)
+            assert response == {"approved_entries": 0, "results": []}
+            await _assert_rollup_is_current(db, m)
+
+    asyncio.run(_run())
@@ -0,0 +1,131 @@
+# backend/tests/test_etl.py
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import select, text
+
+import etl
+import etl_config
+from database import (
+    Team, TeamMember, Project, GroupActivity, FunctionActivity, Task, TimeEntry, Submission, EtlCheckpoint
+)
+
+EMAILS = ["ana@example.com", "ben@example.com", "cy@example.com"]
+FIRST_SUNDAY = date(2025, 1, 5)
+WEEKS = 4
+
+
+def _form_responses() -> pd.DataFrame:
+    """Two rows (Sunday and Monday) per member and week: len(EMAILS) * WEEKS (email, week) groups."""
+    rows = []
+    for week in range(WEEKS):
+        for email in EMAILS:
+            for day in range(2):
+                worked = FIRST_SUNDAY + timedelta(weeks=week, days=day)
+                rows.append({
+                    "Email Address": email,
+                    "Date": pd.Timestamp(worked),
+                    "Timestamp": pd.Timestamp(worked),
+                    "Task": "Development",
+                    "Project": "Project",
+                    "Group Activity": "Activity",
+                    "Team": "Team",
+                    "Function Activity": "Function",
+                    "Current Status": "Done",
+                    "Hours": 4.0,
+                    "Notes": None,
+                })
+    return etl.transform_form_responses(pd.DataFrame(rows))
+
+
+async def _seed_reference_data(db):
+    team = Team(name="Team")
+    project = Project(project_name="Project")
+    db.add_all([team, project])
+    await db.flush()
+    db.add_all([GroupActivity(name="Activity", project_id=project.id), FunctionActivity(name="Function", team_id=team.id)])
+    db.add_all([TeamMember(email=email, full_name=email, team_id=team.id) for email in EMAILS])
+    await db.commit()
+
+
+def test_resume_loads_every_group_exactly_once(session_factory, monkeypatch):
+    monkeypatch.setattr(etl_config, "ETL_CHECKPOINT_BATCH_GROUPS", 1)
+    failing_batch = 4
+    batches = []
+    insert_headers = etl.insert_headers
+
+    def _failing_insert_headers(*conditions):
+        batches.append(conditions)
+        if len(batches) == failing_batch:
+            raise RuntimeError("Connection lost")
+        return insert_headers(*conditions)
+
+    async def _run():
+        async with session_factory() as db:
+            await _seed_reference_data(db)
+
+            monkeypatch.setattr(etl, "insert_headers", _failing_insert_headers)
+            with pytest.raises(RuntimeError, match="Connection lost"):
+                await db.run_sync(lambda session: etl.sync_tasks_and_time_entries(session, df=_form_responses()))
+            committed = failing_batch - 1
+            assert len(set(await db.scalars(select(TimeEntry.submission_id)))) == committed
+            assert len((await db.scalars(select(EtlCheckpoint.id))).all()) == committed
+
+            monkeypatch.setattr(etl, "insert_headers", insert_headers)
+            await db.run_sync(lambda session: etl.sync_tasks_and_time_entries(session, df=_form_responses(), resume=True))
+
+            rows = (await db.execute(select(
+                TeamMember.email, TimeEntry.week_ending, TimeEntry.submission_id
+            ).join(TeamMember, TeamMember.id == TimeEntry.team_member_id))).all()
+            groups = pd.DataFrame(rows, columns=["email", "week_ending", "submission_id"]).groupby(["email", "week_ending"])
+            # Nothing skipped: every group is there with both of its rows
+            assert len(groups) == len(EMAILS) * WEEKS
+            assert set(groups.size()) == {2}
+            # Nothing loaded twice: one submission per group, matching its checkpoint and header
+            assert set(groups["submission_id"].nunique()) == {1}
+            checkpoints = {
+                (c.email, c.week_ending): c.submission_id for c in (await db.execute(select(EtlCheckpoint))).scalars()
+            }
+            assert checkpoints == groups["submission_id"].first().to_dict()
+            assert set(await db.scalars(select(Submission.submission_id))) == set(checkpoints.values())
+            # The task was created by the first run and reused by the resumed one
+            assert len((await db.scalars(select(Task.id))).all()) == len(EMAILS)
+
+    asyncio.run(_run())
+
+
+def test_compact_duplicate_tasks_repoints_entries_before_deleting(session_factory):
+    async def _run():
+        async with session_factory() as db:
+            # Deleting a task that entries still point at must fail, as it would on PostgreSQL
+            await db.execute(text("PRAGMA foreign_keys = ON"))
+            await _seed_reference_data(db)
+            owner = await db.scalar(select(TeamMember.id).where(TeamMember.email == EMAILS[0]))
+
+            def task(status="Done"):
+                # No description or function activity: NULLs must still compare as equal
+                return Task(type="Development", status=status, owner_id=owner)
+
+            tasks = [task(), task(), task(), task(status="In Progress")]
+            db.add_all(tasks)
+            await db.flush()
+            keeper, duplicates, distinct = tasks[0], tasks[1:3], tasks[3]
+            week = FIRST_SUNDAY + timedelta(days=4)
+            db.add_all([
+                TimeEntry(task_id=t.id, team_member_id=owner, hours=1.0, date_of_work=FIRST_SUNDAY,
+                          week_ending=week, submission_id="s", timestamp=datetime(2025, 1, 5))
+                for t in tasks for _ in range(2)
+            ])
+            await db.commit()
+
+            removed = await db.run_sync(etl.compact_duplicate_tasks)
+
+            assert removed == len(duplicates)
+            assert set(await db.scalars(select(Task.id))) == {keeper.id, distinct.id}
+            entries_by_task = pd.Series((await db.scalars(select(TimeEntry.task_id))).all()).value_counts().to_dict()
+            assert entries_by_task == {keeper.id: 6, distinct.id: 2}
+
+    asyncio.run(_run())
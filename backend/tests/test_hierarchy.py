@@ -0,0 +1,106 @@
+# backend/tests/test_hierarchy.py
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from database import TeamMember, TeamMemberClosure
+from hierarchy import rebuild_team_member_closure, subtree_member_ids
+
+
+async def _closure(db):
+    """Every (ancestor, descendant, depth) row of team_member_closure."""
+    rows = await db.execute(
+        select(TeamMemberClosure.ancestor_id, TeamMemberClosure.descendant_id, TeamMemberClosure.depth)
+    )
+    return set(rows.all())
+
+
+async def _assert_closure_matches_rebuild(db):
+    """The closure kept by the mapper events must equal a full rebuild from manager_id."""
+    maintained = await _closure(db)
+    await db.run_sync(rebuild_team_member_closure)
+    assert maintained == await _closure(db)
+
+
+async def _add_chain(db, *names):
+    """Adds members each reporting to the one before; returns them by name."""
+    members = {}
+    manager_id = None
+    for name in names:
+        member = TeamMember(email=f"{name}@example.com", full_name=name, manager_id=manager_id)
+        db.add(member)
+        await db.flush()
+        members[name] = member
+        manager_id = member.id
+    await db.commit()
+    return members
+
+
+def test_insert_reparent_and_delete_keep_closure_in_sync(session_factory):
+    async def _run():
+        async with session_factory() as db:
+            m = await _add_chain(db, "ceo", "vp", "lead", "dev")
+            m.update(await _add_chain(db, "cto", "architect"))
+            await _assert_closure_matches_rebuild(db)
+            assert (m["ceo"].id, m["dev"].id, 3) in await _closure(db)
+
+            # Move a subtree with depth: lead and dev go under the architect
+            m["lead"].manager_id = m["architect"].id
+            await db.commit()
+            await _assert_closure_matches_rebuild(db)
+            closure = await _closure(db)
+            assert (m["cto"].id, m["dev"].id, 3) in closure
+            assert not {(m["ceo"].id, m["lead"].id), (m["vp"].id, m["dev"].id)} & {row[:2] for row in closure}
+
+            # Make a manager top-level
+            m["architect"].manager_id = None
+            await db.commit()
+            await _assert_closure_matches_rebuild(db)
+
+            # Delete a manager once its reports have moved up, then a leaf
+            m["lead"].manager_id = m["cto"].id
+            await db.commit()
+            await db.delete(m["architect"])
+            await db.commit()
+            await _assert_closure_matches_rebuild(db)
+            await db.delete(m["dev"])
+            await db.commit()
+            await _assert_closure_matches_rebuild(db)
+
+    asyncio.run(_run())
+
+
+@pytest.mark.parametrize("new_manager", ["report_of_report", "self"])
+def test_manager_change_creating_a_cycle_is_rejected(session_factory, new_manager):
+    async def _run():
+        async with session_factory() as db:
+            m = await _add_chain(db, "ceo", "vp", "lead")
+            before = await _closure(db)
+            m["vp"].manager_id = m["lead"].id if new_manager == "report_of_report" else m["vp"].id
+            with pytest.raises(ValueError, match="cannot be its manager"):
+                await db.commit()
+            await db.rollback()
+            assert await _closure(db) == before
+            await _assert_closure_matches_rebuild(db)
+
+    asyncio.run(_run())
+
+
+def test_subtree_member_ids_reaches_every_depth(session_factory):
+    async def _run():
+        async with session_factory() as db:
+            m = await _add_chain(db, "ceo", "vp", "lead", "dev")
+            other = await _add_chain(db, "outsider")
+
+            async def subtree(name, include_self=False):
+                return set(await db.scalars(subtree_member_ids(m[name].id, include_self=include_self)))
+
+            assert await subtree("ceo") == {m["vp"].id, m["lead"].id, m["dev"].id}
+            assert await subtree("ceo", include_self=True) == {m["ceo"].id, m["vp"].id, m["lead"].id, m["dev"].id}
+            assert await subtree("vp") == {m["lead"].id, m["dev"].id}
+            assert await subtree("dev") == set()
+            assert other["outsider"].id not in await subtree("ceo")
+
+    asyncio.run(_run())
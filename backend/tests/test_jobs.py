@@ -0,0 +1,63 @@
+# backend/tests/test_jobs.py
+
+import os
+import socket
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import jobs
+from database import Base, Job
+from schemas import JobStatus
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    """A fresh SQLite file database, set as DATABASE_URL for the job runner."""
+    url = f"sqlite:///{tmp_path / 'jobs.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    yield url
+    engine.dispose()
+
+
+def _exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_start_fails_only_orphaned_jobs(database_url):
+    hostname = socket.gethostname()
+    now = datetime.now()
+    owners = {
+        "earlier_incarnation": (f"{hostname}:{os.getpid()}", now),
+        "live_sibling": ("other-host:1", now),
+        "stale_sibling": ("other-host:2", now - timedelta(seconds=jobs.JOB_STALE_AFTER + 1)),
+        "dead_local_process": (f"{hostname}:{_exited_pid()}", now),
+        "no_owner": (None, None),
+    }
+    with Session(create_engine(database_url)) as session:
+        for job_id, (owner, updated_at) in owners.items():
+            session.add(Job(
+                id=job_id, job_type="etl", status=JobStatus.RUNNING.value, params={},
+                cancel_requested=False, owner=owner, created_at=now, updated_at=updated_at,
+            ))
+        session.commit()
+
+    runner = jobs.JobRunner(max_workers=1)
+    runner.start()
+    try:
+        statuses = {job_id: runner.get(job_id).status for job_id in owners}
+    finally:
+        runner.stop()
+
+    if os.name == "nt":
+        statuses.pop("dead_local_process")
+    assert statuses.pop("live_sibling") == JobStatus.RUNNING.value
+    assert set(statuses.values()) == {JobStatus.FAILED.value}
@@ -0,0 +1,71 @@
+# backend/tests/test_query_budget.py
+
+import asyncio
+from datetime import date
+
+import pytest
+
+import services
+from database import Team, TeamMember, GroupActivity, FunctionActivity
+from query_inspector import assert_max_queries
+from schemas import SubmissionRequest, TaskEntry
+
+WEEK = date(2025, 1, 16)
+
+# What a one-task resubmission costs today: member lookup (twice), delete of the
+# old entries, three lookups per task, the insert, two rollup refreshes (this
+# week and the previous one on overwrite) and the header refresh.
+SUBMISSION_BUDGET = 13
+
+
+def _submission(tasks: int) -> SubmissionRequest:
+    return SubmissionRequest(
+        user_email="member@example.com",
+        user_name="Member",
+        user_team="Team",
+        week_date=WEEK,
+        daily_mode=False,
+        tasks=[
+            TaskEntry(**{
+                "Task Description": f"Task {n}",
+                "Group Activity": "Activity",
+                "Function Activity": "Function",
+                "Status": "In Progress",
+                "Total Weekly Hours": 8,
+            })
+            for n in range(tasks)
+        ],
+        meetings=[],
+        overwrite=True,
+    )
+
+
+def _submit_twice(session_factory, tasks: int, budget: int):
+    """Seeds one member, submits once to create the tasks, then submits again under the budget."""
+    async def _run():
+        async with session_factory() as db:
+            team = Team(name="Team")
+            db.add(team)
+            await db.flush()
+            db.add_all([
+                TeamMember(email="member@example.com", full_name="Member", team_id=team.id),
+                GroupActivity(name="Activity"),
+                FunctionActivity(name="Function", team_id=team.id),
+            ])
+            await db.commit()
+        async with session_factory() as db:
+            await services.submit_timesheet(_submission(tasks), db)
+        async with session_factory() as db:
+            with assert_max_queries(budget):
+                await services.submit_timesheet(_submission(tasks), db)
+
+    asyncio.run(_run())
+
+
+def test_resubmission_stays_within_query_budget(session_factory):
+    _submit_twice(session_factory, tasks=1, budget=SUBMISSION_BUDGET)
+
+
+@pytest.mark.xfail(strict=True, reason="get_task_id still runs three lookups per task; the target is 6 statements per submission")
+def test_submission_target_budget(session_factory):
+    _submit_twice(session_factory, tasks=3, budget=6)
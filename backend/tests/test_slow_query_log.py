@@ -0,0 +1,23 @@
+# backend/tests/test_slow_query_log.py
+
+import pytest
+
+from slow_query_log import _to_pyformat
+
+
+def test_asyncpg_parameters_are_rewritten_in_marker_order():
+    statement = "SELECT * FROM t WHERE b = $2 AND a = $1 AND c LIKE 'x%' AND d = $2"
+    assert _to_pyformat(statement, ("a", "b")) == (
+        "SELECT * FROM t WHERE b = %s AND a = %s AND c LIKE 'x%%' AND d = %s",
+        ("b", "a", "b"),
+    )
+
+
+@pytest.mark.parametrize("statement, parameters", [
+    ("SELECT * FROM t WHERE a = %(a)s AND c LIKE 'x%%'", {"a": 1}),
+    ("SELECT * FROM t WHERE a = %s AND c LIKE 'x%%'", (1,)),
+    ("SELECT * FROM t WHERE a = %s", [1]),
+    ("SELECT 1", ()),
+])
+def test_statements_without_asyncpg_markers_pass_through(statement, parameters):
+    assert _to_pyformat(statement, parameters) == (statement, parameters)
@@ -0,0 +1,137 @@
+# backend/tests/test_submission_history.py
+
+import asyncio
+import base64
+from datetime import date, datetime
+
+import httpx
+import pytest
+
+import main
+import services
+from database import Team, TeamMember, GroupActivity, FunctionActivity, Submission, get_session
+from schemas import SubmissionRequest, TaskEntry
+
+EMAIL = "member@example.com"
+# Three headers share the newest week and two the next, so page boundaries fall inside equal weeks
+HEADER_WEEKS = [date(2025, 1, 30)] * 3 + [date(2025, 1, 23)] * 2 + [date(2025, 1, 9)]
+SUBMITTED_WEEK = date(2025, 1, 16)
+
+
+async def _seed(db):
+    """Header-only submissions in HEADER_WEEKS plus one real submission (with a task) in SUBMITTED_WEEK."""
+    team = Team(name="Team")
+    db.add(team)
+    await db.flush()
+    member = TeamMember(email=EMAIL, full_name="Member", team_id=team.id)
+    db.add_all([member, GroupActivity(name="Activity"), FunctionActivity(name="Function", team_id=team.id)])
+    await db.flush()
+    db.add_all([
+        Submission(
+            submission_id=f"header-{n}", team_member_id=member.id, week_ending=week, status="submitted",
+            total_hours=1.0, meeting_hours=0.0, entry_count=1, created_at=datetime(2025, 2, 1), updated_at=datetime(2025, 2, 1),
+        )
+        for n, week in enumerate(HEADER_WEEKS)
+    ])
+    await db.commit()
+    await services.submit_timesheet(SubmissionRequest(
+        user_email=EMAIL, user_name="Member", user_team="Team", week_date=SUBMITTED_WEEK, daily_mode=False,
+        tasks=[TaskEntry(**{
+            "Task Description": "Task", "Group Activity": "Activity", "Function Activity": "Function",
+            "Status": "In Progress", "Total Weekly Hours": 8,
+        })],
+        meetings=[],
+    ), db)
+
+
+def _history(session_factory, requests):
+    """Seeds the database, then runs `requests(client)` against the API with it."""
+    async def _session():
+        async with session_factory() as session:
+            yield session
+
+    async def _run():
+        async with session_factory() as db:
+            await _seed(db)
+        main.app.dependency_overrides[get_session] = _session
+        try:
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await requests(client)
+        finally:
+            main.app.dependency_overrides.pop(get_session)
+
+    return asyncio.run(_run())
+
+
+async def _all_pages(client, limit, compact=True):
+    pages, cursor = [], None
+    # Bounded, so a cursor that does not advance fails instead of looping forever
+    for _ in range(len(HEADER_WEEKS) + 2):
+        params = {"user_email": EMAIL, "limit": limit, "compact": compact}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/submissions/history", params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json()["items"])
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return pages
+    pytest.fail("The history cursor never reached the last page.")
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4, 7, 50])
+def test_pages_cover_every_submission_once_in_order(session_factory, limit):
+    async def requests(client):
+        return await _all_pages(client, limit), (await _all_pages(client, 200))[0]
+
+    pages, single_page = _history(session_factory, requests)
+
+    items = [item for page in pages for item in page]
+    assert [len(page) for page in pages[:-1]] == [limit] * (len(pages) - 1)
+    assert 0 < len(pages[-1]) <= limit
+    assert items == single_page
+    assert len({item["submission_id"] for item in items}) == len(HEADER_WEEKS) + 1
+    weeks = [date.fromisoformat(item["week_ending"]) for item in items]
+    assert weeks == sorted(weeks, reverse=True)
+    # Within a week, newest header first
+    same_week = [item["submission_id"] for item in items if item["submission_id"].startswith("header-")][:3]
+    assert same_week == ["header-2", "header-1", "header-0"]
+
+
+def test_compact_mode_leaves_out_tasks_and_meetings(session_factory):
+    async def requests(client):
+        return await _all_pages(client, 200, compact=True), await _all_pages(client, 200, compact=False)
+
+    (compact,), (full,) = _history(session_factory, requests)
+
+    assert all(item["tasks"] is None and item["meetings"] is None for item in compact)
+    submitted = next(item for item in full if item["week_ending"] == SUBMITTED_WEEK.isoformat())
+    assert [task["Task Description"] for task in submitted["tasks"]] == ["Task"]
+    assert submitted["meetings"] == []
+    # Headers without entries still get (empty) lists outside compact mode
+    assert all(item["tasks"] == [] for item in full if item["submission_id"].startswith("header-"))
+    assert [{k: v for k, v in item.items() if k not in ("tasks", "meetings")} for item in full] == \
+        [{k: v for k, v in item.items() if k not in ("tasks", "meetings")} for item in compact]
+
+
+def _cursor(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    _cursor("2025-01-30"),
+    _cursor("yesterday|3"),
+    _cursor("2025-01-30|three"),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+    _cursor(f"2025-01-30|{10 ** 30}"),
+])
+def test_malformed_cursor_is_a_bad_request(session_factory, cursor):
+    async def requests(client):
+        return await client.get("/submissions/history", params={"user_email": EMAIL, "cursor": cursor})
+
+    response = _history(session_factory, requests)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid history cursor."
@@ -4,6 +4,8 @@ import streamlit as st
 from src.edit_projects import show_edit_projects_page
 from src.edit_team_members import show_edit_team_members_page
 from src.edit_function_activities import show_edit_function_activities_page
+from src.workload_analytics import show_workload_analytics_page
+from src.data_sync import show_data_sync_page
 
 def admin_main():
     """
@@ -17,6 +19,8 @@ def admin_main():
         "Edit Projects & Activities": show_edit_projects_page,
         "Edit Team Members": show_edit_team_members_page,
         "Edit Function Activities": show_edit_function_activities_page,
+        "Workload Analytics": show_workload_analytics_page,
+        "Data Sync": show_data_sync_page,
         # We will add Reports and Static Views here later
     }
     
@@ -27,6 +27,17 @@ async def load_week_submission(user_email: str, week_date: str) -> Dict[str, Any
         return response.json()
     
 
+async def load_week_range(user_email: str, start_week: str, end_week: str, statuses: List[str] = None) -> Dict[str, Any]:
+    """Fetches several weeks of submissions in one call, keyed by week_ending."""
+    params = {"user_email": user_email, "start_week": start_week, "end_week": end_week}
+    if statuses:
+        params["statuses"] = statuses
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{API_BASE_URL}/submissions/load-range/", params=params, timeout=30.0)
+        response.raise_for_status()
+        return response.json()["weeks"]
+    
+
 async def load_draft_submission(user_email: str) -> Dict[str, Any]:
     """Fetches IN-PROGRESS DRAFT entries for the current week from the backend."""
     async with httpx.AsyncClient() as client:
@@ -34,6 +45,31 @@ async def load_draft_submission(user_email: str) -> Dict[str, Any]:
         response.raise_for_status()
         return response.json()
 
+async def clone_week(user_email: str, source_week: str, target_week: str, zero_hours: bool = False, overwrite: bool = False) -> Dict[str, Any]:
+    """Copies a previous week into the target week as a draft, entirely on the backend."""
+    payload = {
+        "user_email": user_email,
+        "source_week": source_week,
+        "target_week": target_week,
+        "zero_hours": zero_hours,
+        "overwrite": overwrite,
+    }
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{API_BASE_URL}/submissions/clone-week", json=payload, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+
+async def get_submission_history(user_email: str, limit: int = 20, cursor: str = None, compact: bool = True) -> Dict[str, Any]:
+    """Fetches one page of a user's past submissions; pass the returned `next_cursor` to get the next page."""
+    params = {"user_email": user_email, "limit": limit, "compact": compact}
+    if cursor:
+        params["cursor"] = cursor
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{API_BASE_URL}/submissions/history", params=params)
+        response.raise_for_status()
+        return response.json()
+
 async def get_user_details(email: str) -> dict:
     async with httpx.AsyncClient() as client:
         response = await client.get(f"{API_BASE_URL}/auth/user", params={"email": email})
@@ -126,3 +162,47 @@ async def delete_group_activity(activity_id: int):
         response = await client.delete(f"{API_BASE_URL}/admin/group_activities/{activity_id}")
         response.raise_for_status()
         return response.json()
+
+
+
+# Analytics API calls
+async def get_analytics_filters() -> Dict[str, List[Dict]]:
+    """Fetches the teams and managers the workload analytics can be filtered by."""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{API_BASE_URL}/analytics/filters")
+        response.raise_for_status()
+        return response.json()
+
+async def get_hours_breakdown(dimension: str, start_week: str, end_week: str, team_id: int = None, manager_id: int = None, by_week: bool = False) -> List[Dict]:
+    """Fetches hours per portfolio/project/group_activity/function_activity for a week range."""
+    params = {"start_week": start_week, "end_week": end_week, "by_week": by_week}
+    if team_id is not None:
+        params["team_id"] = team_id
+    if manager_id is not None:
+        params["manager_id"] = manager_id
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{API_BASE_URL}/analytics/hours/{dimension}", params=params, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+
+# Data sync (ETL) and background job API calls
+async def start_etl_run(resume: bool = False) -> Dict:
+    """Starts a data sync job. Raises httpx.HTTPStatusError with 409 if one is already running."""
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{API_BASE_URL}/admin/etl", json={"resume": resume})
+        response.raise_for_status()
+        return response.json()
+
+async def get_etl_runs(limit: int = 10) -> List[Dict]:
+    """Fetches the most recent data sync jobs, newest first."""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(f"{API_BASE_URL}/admin/etl/runs", params={"limit": limit})
+        response.raise_for_status()
+        return response.json()
+
+async def cancel_job(job_id: str) -> Dict:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{API_BASE_URL}/jobs/{job_id}/cancel")
+        response.raise_for_status()
+        return response.json()
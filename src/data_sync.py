@@ -0,0 +1,91 @@
+# src/data_sync.py
+
+import streamlit as st
+import pandas as pd
+import asyncio
+import time
+import httpx
+
+from .api_client import start_etl_run, get_etl_runs, cancel_job
+
+# Seconds between refreshes while a sync is running
+POLL_INTERVAL = 2
+
+STAGE_COLUMNS = {
+    "name": "Stage",
+    "status": "Status",
+    "rows_read": "Rows read",
+    "rows_inserted": "Rows inserted",
+    "wall_time": "Seconds",
+}
+
+
+def _format_seconds(seconds) -> str:
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def _show_stages(stages):
+    if not stages:
+        return
+    df = pd.DataFrame(stages)
+    batches = df["total"].notna()
+    df.loc[batches, "status"] = df.loc[batches, "status"] + " (" + df.loc[batches, "done"].astype(int).astype(str) + "/" + df.loc[batches, "total"].astype(int).astype(str) + " batches)"
+    st.dataframe(df[list(STAGE_COLUMNS)].rename(columns=STAGE_COLUMNS), hide_index=True, use_container_width=True)
+
+
+def show_data_sync_page():
+    """Starts a data sync from the Excel workbooks and follows its progress."""
+    st.header("Data Sync")
+
+    try:
+        runs = asyncio.run(get_etl_runs())
+    except Exception as e:
+        st.error(f"Failed to load data sync runs: {e}")
+        return
+
+    latest = runs[0] if runs else None
+    running = latest is not None and latest["status"] in ("queued", "running")
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        resume = st.checkbox("Resume the last interrupted sync", help="Skips the weeks an interrupted sync already loaded.")
+    with col2:
+        if st.button("Start Data Sync", type="primary", disabled=running):
+            try:
+                asyncio.run(start_etl_run(resume=resume))
+                st.rerun()
+            except httpx.HTTPStatusError as e:
+                st.error(e.response.json().get("detail", str(e)))
+
+    if latest is None:
+        st.info("No data sync has been run from the dashboard yet.")
+        return
+
+    detail = latest.get("progress_detail") or {}
+    st.subheader(f"Latest sync: {latest['status']}")
+    if running:
+        st.progress(latest.get("progress") or 0.0, text=latest.get("progress_message") or "Waiting to start...")
+        st.caption(f"Elapsed {_format_seconds(detail.get('elapsed_seconds'))}, about {_format_seconds(detail.get('eta_seconds'))} left")
+        if st.button("Cancel Sync"):
+            asyncio.run(cancel_job(latest["id"]))
+            st.rerun()
+    elif latest["status"] == "succeeded":
+        st.success(latest["result"]["message"])
+    elif latest["status"] == "cancelled":
+        st.warning("The sync was cancelled. Start it again with 'Resume' ticked to continue where it stopped.")
+    else:
+        st.error(latest.get("error") or "The sync failed.")
+
+    _show_stages((latest.get("result") or {}).get("stages") or detail.get("stages"))
+
+    if len(runs) > 1:
+        with st.expander("Previous syncs"):
+            history = pd.DataFrame(runs[1:])[["created_at", "status", "finished_at", "error"]]
+            st.dataframe(history, hide_index=True, use_container_width=True)
+
+    if running:
+        time.sleep(POLL_INTERVAL)
+        st.rerun()
@@ -1,5 +1,6 @@
 # src/edit_projects.py
 
+import logging
 import streamlit as st
 import pandas as pd
 import asyncio
@@ -11,6 +12,8 @@ from .api_client import (
     add_group_activity, update_group_activity, delete_group_activity
 )
 
+logger = logging.getLogger(__name__)
+
 def enrich_activity_df(df, project_name_to_id, project_id_to_portfolio, project_names):
     df = df.copy()  # Avoid modifying the original dataframe
 
@@ -214,7 +217,7 @@ def render_confirmation_dialog():
                     asyncio.run(actions[item_info['type']](item_info['id']))
                 st.toast(f"Deleted '{item_info['name']}'", icon="🗑️")
             except Exception as e:
-                print(f"Error deleting {item_info['type']}: {e}")
+                logger.exception("Error deleting %s", item_info['type'])
                 st.error(f"Deletion failed: {e}")
 
             del st.session_state['confirm_delete']
@@ -274,13 +277,8 @@ async def process_generic_changes(original_df, edited_df, item_type):
     original_df_copy = original_df.copy()
     edited_df_copy = edited_df.copy()
 
-
-    print("****"*20)
-    print(original_df_copy)
-    print("------"*20)
-    print(edited_df_copy)
-    print("****"*20)
-
+    # %-style arguments, so the DataFrames are only rendered when DEBUG is on
+    logger.debug("Saving %s changes\noriginal:\n%s\nedited:\n%s", item_type, original_df_copy, edited_df_copy)
 
     # Normalize ID columns
     original_df_copy['id'] = pd.to_numeric(original_df_copy['id'], errors='coerce').astype('Int64')
@@ -303,7 +301,7 @@ async def process_generic_changes(original_df, edited_df, item_type):
     edited_ids = set(edited_df_copy['id'].dropna().tolist())
 
     deleted_ids = original_ids - edited_ids
-    print(f"Deleted IDs: {deleted_ids}")
+    logger.debug("Deleted %s ids: %s", item_type, deleted_ids)
 
     if deleted_ids:
         # Pick first deleted row and send to confirmation
@@ -326,7 +324,7 @@ async def process_generic_changes(original_df, edited_df, item_type):
 
     # Define keys to identify rows — update this if needed
     added_rows = edited_df_copy[~edited_df_copy['id'].isin(original_df_copy['id'])]
-    print(f"Added Rows: {added_rows}")
+    logger.debug("Added %s rows:\n%s", item_type, added_rows)
     for _, row in added_rows.iterrows():
         payload = {
             'name': row[config[item_type]['name_col']]
@@ -362,7 +360,7 @@ async def process_generic_changes(original_df, edited_df, item_type):
             elif item_type == 'activity':
                 payload['project_id'] = int(edited_row['project_id'])
 
-            print("Updated id:", id_val)
+            logger.debug("Updated %s id: %s", item_type, id_val)
             tasks.append(config[item_type]['update'](**payload))
             st.toast(f"Updated '{payload['name']}'", icon="🔄")
 
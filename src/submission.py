@@ -5,9 +5,11 @@ import pandas as pd
 import plotly.graph_objects as go
 from datetime import date, timedelta, datetime
 import asyncio
+import httpx
 from typing import List, Dict, Any
 from streamlit import column_config
 import time 
+import logging
 
 from .submission_utils import (
     initialize_or_clear_session_state, 
@@ -28,8 +30,11 @@ from .api_client import (
     get_function_activities,
     load_week_submission,
     get_user_details,
+    clone_week,
 
 )
+logger = logging.getLogger(__name__)
+
 AUTOSAVE_INTERVAL_SECONDS = 10
 
 @st.dialog("⚠️ Overwrite existing submission?")
@@ -63,6 +68,41 @@ def confirm_final_dialog():
             st.session_state.submit_pressed = False
             st.rerun()
 
+
+def _error_detail(error: httpx.HTTPStatusError) -> str:
+    """The API's `detail` message of a client error, or the error itself."""
+    if error.response.status_code < 500:
+        try:
+            return error.response.json().get("detail", str(error))
+        except ValueError:
+            pass
+    return str(error)
+
+
+def copy_week(overwrite: bool = False, **clone_args):
+    """Copies a week as a draft and reloads the page with it. Raises httpx.HTTPStatusError, e.g. 409 for a week that is not empty."""
+    with st.spinner("Copying week..."):
+        result = asyncio.run(clone_week(overwrite=overwrite, **clone_args))
+    st.toast(result["message"], icon="📄")
+    # Reload the new draft through the normal start-up path
+    st.session_state.pop("initialized", None)
+    st.rerun()
+
+
+@st.dialog("⚠️ Overwrite existing draft?")
+def confirm_clone_overwrite_dialog(clone_args: Dict[str, Any]):
+    st.write(f"The week ending {clone_args['target_week']} already has a saved draft. Do you want to replace it with the copy?")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("Yes, Replace It"):
+            try:
+                copy_week(overwrite=True, **clone_args)
+            except httpx.HTTPStatusError as e:
+                st.error(f"Could not copy the week: {_error_detail(e)}")
+    with col2:
+        if st.button("Cancel"):
+            st.rerun()
+
 def clean_empty_rows(df):
     """Remove rows where 'Total Weekly Hours' is missing or zero."""
     if "Total Weekly Hours" in df.columns:
@@ -167,7 +207,7 @@ def handle_periodic_autosave():
         return
 
     time_since_last_save = time.time() - st.session_state.get('last_autosave_time', 0)
-    print(f"Time since last autosave: {time_since_last_save} seconds")
+    logger.debug("Time since last autosave: %.1f seconds", time_since_last_save)
     if time_since_last_save > AUTOSAVE_INTERVAL_SECONDS:
         autosave_success = handle_save_or_submit("draft")
         if autosave_success:
@@ -224,6 +264,30 @@ def render_sidebar():
                     
                     st.success("Data loaded!")
 
+        zero_hours = st.checkbox("Copy without hours", value=False)
+        if st.button("Copy to Selected Week as Draft", use_container_width=True):
+            user_email = st.session_state.get("user_email")
+            selected = st.session_state.selected_date
+            target_week = selected - timedelta(days=(selected.weekday() - 3 + 7) % 7)
+            if user_email:
+                clone_args = {
+                    "user_email": user_email,
+                    "source_week": week_to_load.isoformat(),
+                    "target_week": target_week.isoformat(),
+                    "zero_hours": zero_hours,
+                }
+                try:
+                    # Never replace anything without asking: a draft in the target week is answered with 409
+                    copy_week(**clone_args)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 409 and not asyncio.run(check_existing_submission(user_email, target_week)):
+                        # Not submitted, so the target week holds a draft; ask before replacing it
+                        confirm_clone_overwrite_dialog(clone_args)
+                    else:
+                        st.error(f"Could not copy the week: {_error_detail(e)}")
+                except Exception as e:
+                    st.error(f"Could not copy the week: {e}")
+
         st.header("⚙️ Actions")
         if st.button("🧹 Clear All Entries"):
             initialize_or_clear_session_state()
@@ -0,0 +1,83 @@
+# src/workload_analytics.py
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import asyncio
+from datetime import date, timedelta
+
+from .api_client import get_analytics_filters, get_hours_breakdown
+
+DIMENSION_LABELS = {
+    "portfolio": "Portfolio",
+    "project": "Project",
+    "group_activity": "Group Activity",
+    "function_activity": "Function Activity",
+}
+
+
+def _last_thursday(today: date) -> date:
+    """The week-ending Thursday of the current Sunday-Thursday week."""
+    return today - timedelta(days=(today.weekday() - 3) % 7)
+
+
+def show_workload_analytics_page():
+    """Renders hours by portfolio, project and activity for a range of weeks."""
+    st.header("Workload Analytics")
+
+    try:
+        filters = asyncio.run(get_analytics_filters())
+    except Exception as e:
+        st.error(f"Failed to load analytics filters: {e}")
+        return
+
+    end_default = _last_thursday(date.today())
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        start_week = st.date_input("From week ending", end_default - timedelta(weeks=12))
+    with col2:
+        end_week = st.date_input("To week ending", end_default)
+    with col3:
+        dimension = st.selectbox("Break down by", list(DIMENSION_LABELS), format_func=DIMENSION_LABELS.get)
+
+    scope = st.radio("Scope", ["Whole organisation", "Team", "Manager"], horizontal=True)
+    team_id = manager_id = None
+    if scope == "Team" and filters["teams"]:
+        team = st.selectbox("Team", filters["teams"], format_func=lambda t: t["name"])
+        team_id = team["id"]
+    elif scope == "Manager" and filters["managers"]:
+        manager = st.selectbox("Manager", filters["managers"], format_func=lambda m: m["name"])
+        manager_id = manager["id"]
+
+    if end_week < start_week:
+        st.warning("The end week must not be before the start week.")
+        return
+
+    label = DIMENSION_LABELS[dimension]
+    try:
+        with st.spinner("Loading workload..."):
+            totals = pd.DataFrame(asyncio.run(get_hours_breakdown(
+                dimension, start_week.isoformat(), end_week.isoformat(), team_id=team_id, manager_id=manager_id
+            )))
+            weekly = pd.DataFrame(asyncio.run(get_hours_breakdown(
+                dimension, start_week.isoformat(), end_week.isoformat(), team_id=team_id, manager_id=manager_id, by_week=True
+            )))
+    except Exception as e:
+        st.error(f"Failed to load workload analytics: {e}")
+        return
+
+    if totals.empty:
+        st.info("No submitted hours in this range.")
+        return
+
+    st.metric("Total hours", f"{totals['hours'].sum():,.1f}")
+
+    fig = px.bar(totals, x="hours", y="name", orientation="h", labels={"hours": "Hours", "name": label})
+    fig.update_layout(yaxis={"categoryorder": "total ascending"}, height=max(300, 28 * len(totals)))
+    st.plotly_chart(fig, use_container_width=True)
+
+    trend = px.area(weekly, x="week_ending", y="hours", color="name", labels={"week_ending": "Week ending", "hours": "Hours", "name": label})
+    st.plotly_chart(trend, use_container_width=True)
+
+    with st.expander("Data"):
+        st.dataframe(totals.rename(columns={"name": label, "hours": "Hours", "member_count": "Members"}).drop(columns=["id", "week_ending"]), use_container_width=True)